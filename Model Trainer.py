@@ -3,6 +3,13 @@ import numpy as np
 from PIL import Image #pillow package
 import os
 
+from face_index import FaceIndex
+
+try:
+    from config import RECOGNIZED_NAMES
+except ImportError:
+    RECOGNIZED_NAMES = []
+
 path = 'samples' # Path for samples already taken
 
 recognizer = cv2.face.LBPHFaceRecognizer_create() # Local Binary Patterns Histograms
@@ -37,4 +44,10 @@ recognizer.train(faces, np.array(ids))
 
 recognizer.write('trainer/trainer.yml')  # Save the trained model as trainer.yml
 
+# Same samples as a vectorized enrollment index, which detect() prefers.
+# A running Friday reloads it within FACE_MODEL_POLL_SECONDS.
+index = FaceIndex.build(faces, ids, names={i: name for i, name in enumerate(RECOGNIZED_NAMES) if name})
+index.save('trainer/faces.fidx')
+print(f"Enrollment index saved: {index.identities} identities, {len(index)} samples.")
+
 print("Model trained, Now we can recognize your face.")
\ No newline at end of file
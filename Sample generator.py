@@ -1,5 +1,11 @@
+import time
+
 import cv2
 
+from enrollment import QualityGate, SampleWriter
+
+SAMPLES = 20 # Number of samples to keep (More samples --> More accuracy)
+
 cam = cv2.VideoCapture(0, cv2.CAP_DSHOW) #create a video capture object which is helpful to capture videos through webcam
 cam.set(3, 640) # set video FrameWidth
 cam.set(4, 480) # set video FrameHeight
@@ -11,32 +17,45 @@ detector = cv2.CascadeClassifier(cv2.data.haarcascades+'haarcascade_frontalface_
 face_id = input("Enter a Numeric user ID  here:  ")
 #Use integer ID for every new face (0,1,2,3,4,5,6,7,8,9........)
 
-print("Taking samples, look at camera ....... ")
-count = 0 # Initializing sampling face count
+gate = QualityGate() # rejects small, dark, blurry and near-duplicate crops, see enrollment.py
+writer = SampleWriter() # saves the accepted crops on a background thread
+
+print("Taking samples, look at camera and turn your head slowly ....... ")
+started = time.perf_counter()
+frames = 0
 
 while True:
 
     ret, img = cam.read() #read the frames using the above created object
+    if not ret:
+        break
+    frames += 1
     converted_image = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) #The function converts an input image from one color space to another
     faces = detector.detectMultiScale(converted_image, 1.3, 5)
 
-    for (x,y,w,h) in faces:
+    if len(faces):
+        (x,y,w,h) = max(faces, key=lambda f: f[2] * f[3]) # only the largest face is the one being enrolled
+        accepted, reason = gate.check(converted_image[y:y+h,x:x+w])
 
-        cv2.rectangle(img, (x,y), (x+w,y+h), (255,0,0), 2) #used to draw a rectangle on any image
-        count += 1
+        if accepted:
+            writer.write("samples/face." + str(face_id) + '.' + str(gate.accepted) + ".jpg", converted_image[y:y+h,x:x+w])
+            # To capture & Save images into the datasets folder
 
-        
-        cv2.imwrite("samples/face." + str(face_id) + '.' + str(count) + ".jpg", converted_image[y:y+h,x:x+w])
-        # To capture & Save images into the datasets folder
+        colour = (0,255,0) if accepted else (0,0,255)
+        cv2.rectangle(img, (x,y), (x+w,y+h), colour, 2) #used to draw a rectangle on any image
+        cv2.putText(img, reason or "ok", (x+5,y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.7, colour, 2)
 
-        cv2.imshow('image', img) #Used to display an image in a window
+    cv2.putText(img, f"{gate.accepted}/{SAMPLES}", (10,30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255,255,255), 2)
+    cv2.imshow('image', img) #Used to display an image in a window
 
-    k = cv2.waitKey(100) & 0xff # Waits for a pressed key
+    k = cv2.waitKey(1) & 0xff # Waits for a pressed key
     if k == 27: # Press 'ESC' to stop
         break
-    elif count >= 20: # Take 50 sample (More sample --> More accuracy)
+    elif gate.accepted >= SAMPLES:
          break
 
+writer.close() # wait for the last samples to reach the disk
+print(f"{writer.written} samples in {time.perf_counter() - started:.1f} s from {frames} frames, rejected: {dict(gate.rejected)}")
 print("Samples taken now closing the program....")
 cam.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+cv2.destroyAllWindows()
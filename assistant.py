@@ -0,0 +1,1457 @@
+"""Friday's command pipeline: listening, routing, handlers and speech.
+
+Nothing in here depends on PyQt5, so the same pipeline can be driven by the
+Qt front end in main.py or by the benchmark harness in benchmarks/.
+"""
+import os
+import datetime
+import functools
+import random
+import re
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import psutil
+import requests
+import speech_recognition as sr
+import webbrowser
+
+import calculator
+from flight_recorder import FlightRecorder
+from llm_scheduler import LLMScheduler, QuotaExceeded
+from model_router import ModelRouter
+from resource_monitor import ResourceMonitor
+from skills import SkillRegistry, command, skill
+import splitter
+# Everything else (cv2, fitz, pint, pyttsx3, wikipedia, Gemini, ...) is
+# imported inside the function that uses it. Together they take seconds to
+# import, and pywhatkit and pyautogui also need a display, which headless
+# runs do not have. Python caches modules, so only the first call pays.
+
+import config  
+
+WEATHER_API_URL = getattr(config, 'WEATHER_API_URL', 'http://api.openweathermap.org/data/2.5/weather')
+NEWS_API_URL = getattr(config, 'NEWS_API_URL', 'https://newsapi.org/v2/top-headlines')
+
+# Successful weather/news lookups are reused for this long, across all sessions.
+API_CACHE_SECONDS = getattr(config, 'API_CACHE_SECONDS', 300)
+API_CACHE_SIZE = 256
+API_TIMEOUT = 10
+
+# Written by Model Trainer.py next to trainer.yml; see face_index.py.
+FACE_INDEX_PATH = getattr(config, 'FACE_INDEX_PATH', os.path.join('trainer', 'faces.fidx'))
+# The face model stays loaded (face_model.py) and its file is checked this
+# often, in seconds, so retraining takes effect without a restart; 0 loads it once.
+FACE_MODEL_POLL_SECONDS = getattr(config, 'FACE_MODEL_POLL_SECONDS', 2.0)
+# Largest chi-square distance (0..2) the index accepts as the enrolled user.
+# Set it from `python -m benchmarks.face_index_bench --dataset samples`; until
+# then the index is not used and faces are checked against trainer.yml.
+FACE_MATCH_THRESHOLD = getattr(config, 'FACE_MATCH_THRESHOLD', None)
+# FaceTracker settings (scale, padding, rescan_every, scale_factor); see
+# face_tracker.py and benchmarks/face_detect_bench.py, which tunes them.
+FACE_TRACKER = getattr(config, 'FACE_TRACKER', {})
+
+# With VOICE_UNLOCK, once "enroll my voice" has stored a voiceprint
+# (voiceprint.py), Friday unlocks at startup when she hears it say "Friday"
+# and only falls back to the camera when the voice does not match. It is
+# weaker than the face check (a recording of the user's voice passes), so it
+# is off until VOICEPRINT_THRESHOLD, the largest distance still accepted, has
+# been chosen with benchmarks/voiceprint_bench.py on your own recordings.
+# Enrollment takes VOICE_ENROLL_SAMPLES utterances; replacing a voiceprint
+# takes utterances that match it.
+VOICE_UNLOCK = getattr(config, 'VOICE_UNLOCK', False)
+VOICEPRINT_PATH = getattr(config, 'VOICEPRINT_PATH', os.path.join('trainer', 'voiceprints.npz'))
+VOICEPRINT_THRESHOLD = getattr(config, 'VOICEPRINT_THRESHOLD', 1.8)
+VOICE_ENROLL_SAMPLES = getattr(config, 'VOICE_ENROLL_SAMPLES', 5)
+
+# Gemini models from fastest to slowest, as (tier, model name). Each query
+# goes to one of them; MODEL_ROUTING holds the ModelRouter settings
+# (short_words, long_words, budget, hedge), see model_router.py.
+GEMINI_MODELS = getattr(config, 'GEMINI_MODELS', [
+    ("flash-lite", "gemini-2.5-flash-lite"),
+    ("flash", "gemini-2.5-flash"),
+    ("pro", "gemini-2.5-pro"),
+])
+MODEL_ROUTING = getattr(config, 'MODEL_ROUTING', {})
+
+# After a face verification at startup, a background monitor (presence.py)
+# keeps checking the user is still there, sampling the camera PRESENCE_FPS
+# times a second within PRESENCE_CPU_BUDGET of one core. Commands are
+# refused once no verified face has been seen for PRESENCE_ABSENT_SECONDS.
+PRESENCE_CHECK = getattr(config, 'PRESENCE_CHECK', True)
+PRESENCE_FPS = getattr(config, 'PRESENCE_FPS', 2.0)
+PRESENCE_CPU_BUDGET = getattr(config, 'PRESENCE_CPU_BUDGET', 0.02)
+PRESENCE_ABSENT_SECONDS = getattr(config, 'PRESENCE_ABSENT_SECONDS', 15.0)
+PRESENCE_RECHECK_SECONDS = getattr(config, 'PRESENCE_RECHECK_SECONDS', 30.0)
+
+# Listen, recognize, think and speak on overlapping threads (pipeline.py)
+# instead of one after the other.
+PIPELINED = getattr(config, 'PIPELINED', True)
+
+# Barge-in (pipeline only): talking over Friday stops her and cancels the
+# command in progress. While she speaks, the microphone needs ECHO_FACTOR
+# times the usual energy, and BARGE_IN_SECONDS of it, so her own voice
+# coming back through the speakers does not count.
+BARGE_IN = getattr(config, 'BARGE_IN', True)
+ECHO_FACTOR = getattr(config, 'ECHO_FACTOR', 3.0)
+BARGE_IN_SECONDS = getattr(config, 'BARGE_IN_SECONDS', 0.2)
+
+# Upper bound on Gemini function-call round trips for a single query.
+MAX_TOOL_ROUNDS = 4
+
+# Queries the offline intent classifier (intents.py) is confident about go
+# straight to function_map instead of costing a Gemini call.
+USE_INTENT_CLASSIFIER = getattr(config, 'USE_INTENT_CLASSIFIER', True)
+
+# "friday what's the time, the weather in mumbai and my battery" is split
+# into its commands (splitter.py); when all of them can run locally, up to
+# MULTI_INTENT_WORKERS run at once and the replies are joined in order.
+MULTI_INTENT = getattr(config, 'MULTI_INTENT', True)
+MULTI_INTENT_WORKERS = getattr(config, 'MULTI_INTENT_WORKERS', 4)
+
+# Each Gemini request carries only the declarations of the
+# GEMINI_TOOLS_PER_REQUEST tools most relevant to the query (skills.py);
+# 0 sends all of them.
+GEMINI_TOOLS_PER_REQUEST = getattr(config, 'GEMINI_TOOLS_PER_REQUEST', 8)
+
+# Gemini quota (2 requests a minute on the free tier) and how long a spoken
+# query may wait for it before Friday says the quota is used up.
+GEMINI_REQUESTS_PER_MINUTE = getattr(config, 'GEMINI_REQUESTS_PER_MINUTE', 2)
+GEMINI_MAX_WAIT = getattr(config, 'GEMINI_MAX_WAIT', 30)
+
+# The flight recorder keeps the last FLIGHT_RECORDER_SIZE commands (with the
+# captured audio if FLIGHT_RECORDER_AUDIO) and saves them to
+# FLIGHT_RECORDER_DIR when a command fails or on "friday report a problem".
+FLIGHT_RECORDER_SIZE = getattr(config, 'FLIGHT_RECORDER_SIZE', 50)
+FLIGHT_RECORDER_AUDIO = getattr(config, 'FLIGHT_RECORDER_AUDIO', False)
+FLIGHT_RECORDER_DIR = getattr(config, 'FLIGHT_RECORDER_DIR', 'flight_records')
+
+# While run() is going, the resource monitor (resource_monitor.py) samples
+# memory, open files and threads every RESOURCE_MONITOR_INTERVAL seconds and
+# warns about the ones that keep growing over the last RESOURCE_MONITOR_WINDOW
+# samples. Python allocations are traced (tracemalloc, which slows them
+# down) once memory is seen growing, or from the start with
+# RESOURCE_MONITOR_TRACE, to show where the memory goes.
+RESOURCE_MONITOR = getattr(config, 'RESOURCE_MONITOR', True)
+RESOURCE_MONITOR_INTERVAL = getattr(config, 'RESOURCE_MONITOR_INTERVAL', 60.0)
+RESOURCE_MONITOR_WINDOW = getattr(config, 'RESOURCE_MONITOR_WINDOW', 60)
+RESOURCE_MONITOR_TRACE = getattr(config, 'RESOURCE_MONITOR_TRACE', False)
+
+_models = {}
+_model_lock = threading.Lock()
+_face_model = None
+_face_model_lock = threading.Lock()
+# Runs the commands of a multi-intent query, shared by every Assistant.
+_handler_pool = None
+_handler_pool_lock = threading.Lock()
+
+# Assistant states reported through Assistant.on_event("state", ...).
+IDLE = "idle"
+LISTENING = "listening"
+THINKING = "thinking"
+SPEAKING = "speaking"
+
+class Pyttsx3Speaker:
+    """Speaks text through the local pyttsx3 engine."""
+
+    def __init__(self):
+        import pyttsx3
+
+        try:
+            self.engine = pyttsx3.init('sapi5')
+            voices = self.engine.getProperty('voices')
+            self.engine.setProperty('voice', voices[1].id)
+        except Exception as e:
+            print(f"Error initializing text-to-speech engine: {e}")
+            self.engine = pyttsx3.init()
+
+    def say(self, text):
+        # A sentence at a time, so stop() takes effect even where engine.stop() cannot cut runAndWait short.
+        self.stopped = False
+        for sentence in re.split(r'(?<=[.!?])\s+', text):
+            if self.stopped:
+                return
+            self.engine.say(sentence)
+            self.engine.runAndWait()
+
+    def stop(self):
+        self.stopped = True
+        self.engine.stop()
+
+_speaker = None
+# The pipeline speaks from more than one thread; pyttsx3 must finish one line before the next.
+_speak_lock = threading.Lock()
+
+def set_speaker(speaker):
+    """Replaces the text-to-speech backend (anything with a say(text) method)."""
+    global _speaker
+    _speaker = speaker
+
+def speak(audio):
+    """Speaks the given text."""
+    global _speaker
+    try:
+        with _speak_lock:
+            if _speaker is None:
+                _speaker = Pyttsx3Speaker()
+            _speaker.say(audio)
+    except Exception as e:
+        print(f"Error during speech: {e}")
+
+def is_speaking():
+    return _speak_lock.locked()
+
+def stop_speaking():
+    """Cuts off the line being spoken, if the speaker supports it (anything with a stop() method)."""
+    stop = getattr(_speaker, "stop", None)
+    if stop is not None:
+        try:
+            stop()
+        except Exception as e:
+            print(f"Error stopping speech: {e}")
+
+class EchoGuardRecognizer(sr.Recognizer):
+    """A Recognizer that needs louder speech while Friday is talking.
+
+    Her own voice reaches the microphone through the speakers. While she
+    speaks, energy_threshold is a separate playback threshold, at least
+    ECHO_FACTOR times the quiet one, that the dynamic adjustment in
+    listen() raises to the level of the echo it hears.
+    """
+
+    def __init__(self, echo_factor=None):
+        self.echo_factor = ECHO_FACTOR if echo_factor is None else echo_factor
+        self.quiet_threshold = 300
+        self.playback_threshold = None
+        super().__init__()
+
+    @property
+    def energy_threshold(self):
+        if not is_speaking():
+            self.playback_threshold = None
+            return self.quiet_threshold
+        floor = self.quiet_threshold * self.echo_factor
+        if self.playback_threshold is None or self.playback_threshold < floor:
+            self.playback_threshold = floor
+        return self.playback_threshold
+
+    @energy_threshold.setter
+    def energy_threshold(self, value):
+        if is_speaking():
+            self.playback_threshold = value
+        else:
+            self.quiet_threshold = value
+
+def open_camera():
+    """Opens the default webcam at 640x480."""
+    import cv2
+
+    cam = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+    cam.set(3, 640)
+    cam.set(4, 480)
+    return cam
+
+def recognize_google(recognizer, audio):
+    """Transcribes captured audio with Google Speech Recognition."""
+    return recognizer.recognize_google(audio, language='en-in')
+
+def wishme():
+    """Greets the user based on the time of day."""
+    hour = int(datetime.datetime.now().hour)
+    if 0 <= hour < 12:
+        speak("good morning sir i am friday how may i help you ")
+    elif 12 <= hour < 18:
+        speak("good afternoon sir i am friday how may i help you")
+    else:
+        speak("Hello sir I am friday how may i help you")
+
+def translate_text(text, target_language='en'):
+    """Translates text to a target language."""
+    from googletrans import Translator
+
+    try:
+        translator = Translator()
+        translated_text = translator.translate(text, dest=target_language)
+        return translated_text.text
+    except Exception as e:
+        print(f"Translation Error: {e}")
+        return "Sorry, I couldn't translate that."
+
+# One connection pool and one response cache for every Assistant in the process.
+http = requests.Session()
+_api_cache = {}
+_api_cache_lock = threading.Lock()
+
+# Every Gemini request in the process spends the same quota; see llm_scheduler.py.
+gemini_scheduler = LLMScheduler(GEMINI_REQUESTS_PER_MINUTE, max_wait=GEMINI_MAX_WAIT)
+
+def fetch_json(url, params):
+    """GETs a JSON API through the shared pool. Returns (status_code, data).
+
+    200 responses are cached for API_CACHE_SECONDS.
+    """
+    key = (url, tuple(sorted(params.items())))
+    now = time.monotonic()
+    with _api_cache_lock:
+        hit = _api_cache.get(key)
+        if hit and now - hit[0] < API_CACHE_SECONDS:
+            return 200, hit[1]
+
+    response = http.get(url, params=params, timeout=API_TIMEOUT)
+    data = response.json()
+
+    if response.status_code == 200:
+        with _api_cache_lock:
+            if len(_api_cache) >= API_CACHE_SIZE:
+                _api_cache.pop(next(iter(_api_cache)))
+            _api_cache[key] = (now, data)
+    return response.status_code, data
+
+def get_weather(city):
+    """Fetches weather information for a city. Returns a string."""
+    base_url = WEATHER_API_URL
+    params = {
+        'q': city,
+        'appid': config.WEATHER_API_KEY,  
+        'units': 'metric'  
+    }
+
+    try:
+        status_code, data = fetch_json(base_url, params)
+
+        if status_code == 200:
+            weather_description = data['weather'][0]['description']
+            temperature = data['main']['temp']
+            humidity = data['main']['humidity']
+            return f"The weather in {city} is {weather_description}. The temperature is {temperature} degrees Celsius, with {humidity} percent humidity."
+        else:
+            return f"Error: {data.get('message', 'Unknown error')}"
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Weather API Request Error: {e}")
+        return "An error occurred: Could not connect to the weather service."
+
+def get_news(country='in', category='general', num_articles=3):
+    """Fetches top news headlines. Returns a single formatted string."""
+    base_url = NEWS_API_URL
+    params = {
+        'apiKey': config.NEWS_API_KEY,  
+        'country': country,
+        'category': category,
+        'pageSize': num_articles,
+    }
+
+    try:
+        status_code, data = fetch_json(base_url, params)
+
+        if status_code == 200:
+            articles = data.get('articles', [])
+            if not articles:
+                return "No news articles found."
+
+            news_info = ["Here are the top headlines: "]
+            for i, article in enumerate(articles):
+                title = article.get('title', 'No Title')
+                news_info.append(f"Headline {i+1}: {title}.")
+            return " ".join(news_info)
+        else:
+            return f"Error: {data.get('message', 'Unknown error')}"
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"News API Request Error: {e}")
+        return "An error occurred: Could not connect to the news service."
+
+@functools.lru_cache(maxsize=1)
+def unit_registry():
+    """The pint unit registry, built once: each new one takes about a second and leaves the process bigger."""
+    import pint
+
+    return pint.UnitRegistry()
+
+def convert_units(conversion_query):
+    """Performs unit conversions (e.g., '10 meters to feet', 'feet in a mile'). Returns a string."""
+    try:
+        ureg = unit_registry()
+        parts = conversion_query.split(' to ')
+        if len(parts) == 2:
+            from_part, to_unit = parts
+        elif ' in ' in conversion_query:
+            # "how many feet in a mile" asks for the unit first, "100 fahrenheit in celsius" last.
+            first, second = conversion_query.rsplit(' in ', 1)
+            from_part, to_unit = (first, second) if re.match(r'\s*[\d.]', first) else (second, first)
+        else:
+            return "Error: Please format your query as 'value unit to other_unit'."
+
+        from_part = re.sub(r'^\s*(?:a|an|one)\b', '1', from_part)
+        to_unit = to_unit.strip()
+
+        quantity = ureg(from_part)
+        converted_quantity = quantity.to(to_unit)
+
+        return str(converted_quantity)
+
+    except Exception as e:
+        print(f"Unit Conversion Error: {e}")
+        return "Error: Unable to perform unit conversion. Please check your input."
+
+def read_pdf(file_path):
+    """Reads text from the first page of a PDF file. Returns a string."""
+    import fitz
+
+    try:
+        pdf_document = fitz.open(file_path)
+        num_pages = pdf_document.page_count
+
+        if num_pages == 0:
+            return "The PDF is empty and has no pages."
+
+        page = pdf_document[0] 
+        text = page.get_text()
+
+        if not text:
+            return f"The PDF has {num_pages} pages, but the first page has no readable text."
+
+        return f"The PDF has {num_pages} pages. Here is the text from the first page: {text}"
+
+    except Exception as e:
+        return f"An error occurred while reading the PDF: {e}"
+
+def load_face_matcher():
+    """Returns match(crops) -> [(verified, name, score_text), ...] for one frame's face crops.
+
+    Uses the enrollment index written by Model Trainer.py when it exists and
+    FACE_MATCH_THRESHOLD is set, which classifies all crops in one vectorized
+    call; otherwise falls back to the OpenCV LBPH model, one predict() per
+    crop. Either is loaded once per process and reloaded when its file
+    changes (face_model()).
+    """
+    model = face_model()
+    return lambda crops: model.get()(crops)
+
+def face_model():
+    """The process-wide face_model.ResidentModel; the first call loads it and raises if it cannot."""
+    global _face_model
+    with _face_model_lock:
+        if _face_model is None:
+            from face_model import ResidentModel
+
+            if os.path.exists(FACE_INDEX_PATH) and FACE_MATCH_THRESHOLD is not None:
+                model = ResidentModel(FACE_INDEX_PATH, index_matcher, FACE_MODEL_POLL_SECONDS)
+            else:
+                if os.path.exists(FACE_INDEX_PATH):
+                    print(f"Not using {FACE_INDEX_PATH} until FACE_MATCH_THRESHOLD is set in config.py, "
+                          f"see benchmarks/face_index_bench.py --dataset samples")
+                model = ResidentModel(config.TRAINER_PATH, lbph_matcher, FACE_MODEL_POLL_SECONDS)
+            model.get()
+            model.start()
+            _face_model = model
+        return _face_model
+
+def index_matcher(path):
+    """match(crops) for the enrollment index at path."""
+    from face_index import FaceIndex
+
+    index = FaceIndex.load(path)
+
+    def match(crops):
+        return [(label is not None, name, "  {0:.2f}".format(distance))
+                for label, name, distance in index.classify(crops, FACE_MATCH_THRESHOLD)]
+    return match
+
+def lbph_matcher(path):
+    """match(crops) for the OpenCV LBPH model (trainer.yml) at path."""
+    import cv2
+
+    recognizer = cv2.face.LBPHFaceRecognizer_create()
+    recognizer.read(path)
+    names = config.RECOGNIZED_NAMES
+
+    def match(crops):
+        results = []
+        for crop in crops:
+            id_index, accuracy = recognizer.predict(crop)
+            if (accuracy < 60):
+                id_name = names[id_index] if id_index < len(names) else "Known"
+                results.append((True, id_name, "  {0}%".format(round(100 - accuracy))))
+            else:
+                results.append((False, "unknown", "  {0}%".format(round(100 - accuracy))))
+        return results
+    return match
+
+def load_voiceprints():
+    """The enrolled voiceprints (voiceprint.VoiceprintStore); empty if nobody enrolled their voice yet."""
+    from voiceprint import VoiceprintStore
+
+    if not os.path.exists(VOICEPRINT_PATH):
+        return VoiceprintStore()
+    return VoiceprintStore.load(VOICEPRINT_PATH)
+
+def detect(camera=None, show=True):
+    """Performs face recognition to verify the user.
+
+    camera defaults to the webcam; any object with the cv2.VideoCapture
+    read/get/isOpened/release methods can be passed instead.
+    """
+    import cv2
+
+    from face_tracker import FaceTracker
+
+    try:
+        match = load_face_matcher()
+        faceCascade = cv2.CascadeClassifier(config.CASCADE_PATH)
+    except (cv2.error, OSError, ValueError) as e:
+        print(f"OpenCV Error: {e}")
+        speak("Error loading face detection models. Please check config file paths.")
+        return False
+
+    font = cv2.FONT_HERSHEY_SIMPLEX
+
+    try:
+        cam = camera if camera is not None else open_camera()
+        if not cam.isOpened():
+            cam.release()
+            speak("Error: Cannot open camera.")
+            return False
+
+        minW = 0.1 * cam.get(3)
+        minH = 0.1 * cam.get(4)
+    except Exception as e:
+        print(f"Camera Error: {e}")
+        speak("Error initializing camera.")
+        return False
+
+    tracker = FaceTracker(faceCascade, (int(minW), int(minH)), **FACE_TRACKER)
+
+    flag = True
+    verified = False
+
+    try:
+        while flag:
+            ret, img = cam.read()
+            if not ret:
+                speak("Error reading frame from camera.")
+                break
+
+            converted_image = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            faces = tracker.detect(converted_image)
+
+            crops = [converted_image[y:y + h, x:x + w] for (x, y, w, h) in faces]
+            try:
+                matches = match(crops) if crops else []
+            except cv2.error as e:
+                print(f"Face prediction error: {e}")
+                matches = [None] * len(crops)
+
+            for (x, y, w, h), result in zip(faces, matches):
+                cv2.rectangle(img, (x, y), (x + w, y + h), (255, 0, 0), 2)
+                if result is None:
+                    cv2.putText(img, "Error", (x + 5, y - 5), font, 1, (0, 0, 255), 2)
+                    continue
+
+                matched, id_name, accuracy_str = result
+                if matched:
+                    speak("verification successful")
+                    verified = True
+                    flag = False  
+                else:
+                    speak("cannot verify")
+
+                cv2.putText(img, str(id_name), (x + 5, y - 5), font, 1, (255, 255, 255), 2)
+                cv2.putText(img, str(accuracy_str), (x + 5, y + h - 5), font, 1, (255, 255, 0), 1)
+
+            if show:
+                cv2.imshow('camera', img)
+                if (cv2.waitKey(1) == ord('q')):
+                    break
+    finally:
+        cam.release()
+        if show:
+            cv2.destroyAllWindows()
+
+    if not verified:
+        speak("Verification failed.")
+        return False
+
+    return True
+
+class Assistant:
+    """The listen -> route -> act -> speak loop behind Friday.
+
+    Every device and service can be swapped: audio_source is a zero-argument
+    callable returning a speech_recognition source (defaults to the
+    microphone), transcriber turns captured audio into text, chat replaces
+    the Gemini chat session (a list of (tier, chat) pairs, fastest first,
+    replaces the GEMINI_MODELS tiers) and camera replaces the webcam used by
+    detect(). With connect_llm=False the Gemini sessions are only created
+    (and the google.generativeai package only imported) on the first query
+    that needs it. memory_path is the file behind "remember that" and recall.
+
+    on_event, if set, is called from the assistant's thread as
+    on_event(kind, value) with kind "state" (IDLE, LISTENING, THINKING or
+    SPEAKING), "transcript" (what the user said), "response" (the reply)
+    or "presence" (whether the verified user is in front of the camera).
+    It must return quickly; the Qt front end forwards it as signals.
+
+    pipelined overrides PIPELINED: whether run() overlaps the stages of
+    consecutive commands (pipeline.Pipeline) or runs them one at a time.
+    """
+
+    def __init__(self, audio_source=None, transcriber=None, chat=None, camera=None, verify=True,
+                 connect_llm=True, memory_path='data.txt', pipelined=None):
+        self.running = True
+        self.pipelined = PIPELINED if pipelined is None else pipelined
+        self.pipeline = None
+        self.presence = None
+        # Set by interrupt(); Gemini calls in progress give up with CancelledError.
+        self.interrupted = threading.Event()
+        self.audio_source = audio_source or sr.Microphone
+        self.transcriber = transcriber or recognize_google
+        self.camera = camera
+        self.verify = verify
+        self.memory_path = memory_path
+        self.on_event = None
+        # Embeddings collected since "enroll my voice"; None when no enrollment is in progress.
+        self.voice_samples = None
+        self.recorder = FlightRecorder(FLIGHT_RECORDER_SIZE, keep_audio=FLIGHT_RECORDER_AUDIO,
+                                       directory=FLIGHT_RECORDER_DIR)
+        self.resources = ResourceMonitor(RESOURCE_MONITOR_INTERVAL, RESOURCE_MONITOR_WINDOW,
+                                         trace=RESOURCE_MONITOR_TRACE)
+        self.resources.watch("chat_messages", self.chat_messages)
+
+        self.skills = SkillRegistry(self)
+        self.local_command_map = self.skills.local_commands()
+
+        try:
+            self.tools = self.skills.tools()
+            self.function_map = self.skills.function_map()
+
+            self.intents = None
+            if USE_INTENT_CLASSIFIER:
+                import intents
+                self.intents = intents.get_classifier(self.tools)
+            # Like the classifier, the tool relevance index is built now rather than on the first query.
+            if GEMINI_TOOLS_PER_REQUEST:
+                self.skills.index()
+
+            self.router = None
+            if chat is not None:
+                self.router = self.start_router(chat if isinstance(chat, list) else [("chat", chat)])
+            elif connect_llm:
+                self.router = self.start_router()
+
+        except Exception as e:
+            print(f"Error initializing Gemini Model: {e}")
+            speak("Error initializing my AI brain. Please check the API key and internet connection.")
+            self.running = False
+
+    def start_router(self, chats=None):
+        """Routes queries over chats, (tier, chat) pairs; by default one fresh chat per GEMINI_MODELS tier."""
+        if chats is None:
+            chats = [(tier, self.start_chat(model_name)) for tier, model_name in GEMINI_MODELS]
+        return ModelRouter(chats, send=self.send_to_chat, can_hedge=gemini_scheduler.can_send_now, **MODEL_ROUTING)
+
+    def chat_messages(self):
+        """Messages kept in the history of every Gemini chat, which grows for as long as Friday runs."""
+        if self.router is None:
+            return 0
+        return sum(len(getattr(chat, "history", ())) for chat in self.router.chats.values())
+
+    def start_chat(self, model_name):
+        """Starts a fresh chat session on a Gemini model shared by every Assistant."""
+        with _model_lock:
+            model = _models.get(model_name)
+            if model is None:
+                model = _models[model_name] = self.create_model(model_name)
+        return model.start_chat(enable_automatic_function_calling=True)
+
+    def create_model(self, model_name):
+        """Creates the Gemini model with all tools attached."""
+        import google.generativeai as genai
+        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+
+        genai.configure(api_key=config.GEMINI_API_KEY)
+
+        safety_settings = {
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_ONLY_HIGH,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_ONLY_HIGH,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_ONLY_HIGH,
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_ONLY_HIGH,
+        }
+
+        system_instruction = "You are Friday, a helpful and professional personal assistant. You were created by Tushar, Tanishka, and Vishakha. Your responses should be concise and helpful."
+
+        return genai.GenerativeModel(
+            model_name=model_name,
+            safety_settings=safety_settings,
+            tools=self.tools,
+            system_instruction=system_instruction
+        )
+
+    def run(self):
+        """The main execution loop for the assistant."""
+        unlocked_by = self.unlock() if self.verify else None
+        if self.verify and unlocked_by is None:
+            speak("Verification failed. Shutting down.")
+            return  
+        # After a voice unlock too: the user still has to be seen at the camera to stay unlocked.
+        if unlocked_by is not None and PRESENCE_CHECK:
+            self.presence = self.start_presence()
+        if RESOURCE_MONITOR:
+            self.resources.start()
+
+        self.notify("state", SPEAKING)
+        wishme()
+
+        try:
+            if self.pipelined:
+                from pipeline import Pipeline
+                self.pipeline = Pipeline(self)
+                self.pipeline.run()
+            else:
+                self.run_sequential()
+        finally:
+            if self.presence is not None:
+                self.presence.stop()
+            self.resources.stop()
+
+        self.notify("state", IDLE)
+
+    def unlock(self):
+        """Verifies the user at startup: by voice if a voiceprint is enrolled, otherwise or failing that by face.
+
+        Returns "voice" or "face", whichever verified the user, or None.
+        """
+        if VOICE_UNLOCK:
+            import voiceprint
+
+            try:
+                store = load_voiceprints()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Could not load the voiceprints from {VOICEPRINT_PATH}: {e}")
+                store = voiceprint.VoiceprintStore()
+            if len(store):
+                speak("Say Friday to unlock.")
+                audio = self.listen()
+                if audio is not None:
+                    started = time.perf_counter()
+                    embedding = voiceprint.embed(voiceprint.samples_from_audio(audio))
+                    name, distance = store.verify(embedding, VOICEPRINT_THRESHOLD)
+                    print(f"Voiceprint distance {distance:.2f} ({(time.perf_counter() - started) * 1000:.1f} ms)")
+                    if name is not None:
+                        print(f"Verified {name} by voice")
+                        return "voice"
+                print("Voice not verified, trying the camera")
+        return "face" if detect(self.camera) else None
+
+    def start_presence(self):
+        """Starts the background check that the verified user is still there; None if it cannot run."""
+        import cv2
+        from presence import PresenceMonitor
+
+        try:
+            match = load_face_matcher()
+            cascade = cv2.CascadeClassifier(config.CASCADE_PATH)
+        except (cv2.error, OSError, ValueError) as e:
+            print(f"Presence monitor disabled: {e}")
+            return None
+        monitor = PresenceMonitor(lambda: self.camera if self.camera is not None else open_camera(), match, cascade,
+                                  fps=PRESENCE_FPS, recheck=PRESENCE_RECHECK_SECONDS,
+                                  absent_after=PRESENCE_ABSENT_SECONDS, cpu_budget=PRESENCE_CPU_BUDGET,
+                                  on_change=self.presence_changed, tracker_options=FACE_TRACKER)
+        monitor.start()
+        return monitor
+
+    def presence_changed(self, present):
+        print("Verified user is back" if present else "Verified user left, locking")
+        self.notify("presence", present)
+
+    def run_sequential(self):
+        """Listens, routes and speaks one command at a time until running is cleared."""
+        while self.running:
+            try:
+                self.notify("state", LISTENING)
+                started = time.perf_counter()
+                audio = self.listen()
+                if audio is None:
+                    continue
+                heard = time.perf_counter()
+                query = self.recognize(audio).lower()
+                if query == "none":
+                    continue
+                timings = {"listen_ms": round((heard - started) * 1000, 2),
+                           "recognize_ms": round((time.perf_counter() - heard) * 1000, 2)}
+
+                if not self.running:  
+                    break
+
+                self.notify("transcript", query)
+                self.notify("state", THINKING)
+                result = self.dispatch(query, audio, timings)
+                if result["route"] == "ignored":
+                    print(f"Ignored query (no trigger): {query}")
+                else:
+                    self.notify("response", result["response"])
+                    self.notify("state", SPEAKING)
+                    speak(result["response"])
+
+            except Exception as e:
+                print(f"An error occurred in the main loop: {e}")
+                speak("Sorry, something went wrong. Please try again.")
+
+    def interrupt(self):
+        """Abandons the reply in progress: stops speaking and stops waiting for Gemini.
+
+        A request already sent still completes in the background; its answer
+        is dropped. Cleared by whoever starts the next command.
+        """
+        self.interrupted.set()
+        stop_speaking()
+
+    def stop(self, drain=True):
+        """Stops listening for new commands.
+
+        With drain, commands already heard are still answered; otherwise
+        they are dropped and run() returns once the current step is done.
+        """
+        if self.pipeline is not None:
+            self.pipeline.stop(drain)
+        if not drain or self.pipeline is None:
+            self.running = False
+
+    def notify(self, kind, value):
+        """Reports progress to on_event without letting a listener break the loop."""
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(kind, value)
+        except Exception as e:
+            print(f"Error in event listener: {e}")
+
+    def dispatch(self, query, audio=None, timings=None):
+        """Routes one recognized query and returns the reply and the route taken.
+
+        The result is a dict with "route" ("local", "intent", "gemini",
+        "multi" for several local commands in one query, "enroll" for an
+        utterance of a voice enrollment, "ignored" or "locked", while the
+        verified user is away), "trigger" (the local command or the handler
+        the intent classifier picked, comma-separated for "multi") and
+        "response", the text to speak.
+
+        The query goes into the flight recorder, with the audio it was
+        recognized from and the timings of the steps before, if given.
+        """
+        with self.recorder.record(query, audio, timings) as entry:
+            enrolling = self.voice_samples is not None and (self.presence is None or self.presence.present)
+            if enrolling and audio is not None and "friday" in query:
+                result = self.enroll_voice(query, audio)
+            else:
+                result = self.route(query)
+            entry.update(route=result["route"], trigger=result["trigger"], response=result["response"])
+        return result
+
+    def route(self, query):
+        """dispatch() without the flight recorder."""
+        if "friday" not in query:
+            return {"route": "ignored", "trigger": None, "response": None}
+
+        if self.presence is not None and not self.presence.present:
+            print(f"Locked, the verified user is away: {query}")
+            return {"route": "locked", "trigger": None,
+                    "response": "I can't see you. Please look at the camera so I can verify you."}
+
+        clean_query = query.replace("friday", "").strip()
+
+        plans = splitter.split(clean_query, self.plan) if MULTI_INTENT else []
+        if len(plans) > 1:
+            return self.run_plans(plans)
+
+        plan = self.plan(clean_query)
+        if plan is not None:
+            print(plan.message)
+            return {"route": plan.route, "trigger": plan.trigger, "response": plan.action()}
+
+        quota = gemini_scheduler.metrics()
+        print(f"Sending to Gemini ({quota['tokens_available']} requests available, "
+              f"{quota['queued']} queued): {query}")
+        try:
+            final_response = self.ask_gemini(query)
+        except QuotaExceeded as e:
+            print(f"Gemini quota exceeded: {gemini_scheduler.metrics()}")
+            final_response = f"I've used up my Gemini quota for now. Please ask me again in {e.retry_after:.0f} seconds."
+        print(f"LLM Response: {final_response}")
+        return {"route": "gemini", "trigger": None, "response": final_response}
+
+    @property
+    def expects_reply(self):
+        """True while Friday waits for the user to say something she asked for (a voice enrollment)."""
+        return self.voice_samples is not None
+
+    def enroll_voice(self, query, audio):
+        """Takes one utterance of the voice enrollment "enroll my voice" started; saves the voiceprint after the last."""
+        import voiceprint
+
+        result = {"route": "enroll", "trigger": "handle_enroll_voice"}
+        if "cancel" in query:
+            self.voice_samples = None
+            return dict(result, response="Voice enrollment cancelled.")
+        embedding = voiceprint.embed(voiceprint.samples_from_audio(audio))
+        if embedding is None:
+            return dict(result, response="I didn't hear enough of your voice. Please say it again.")
+        self.voice_samples.append(embedding)
+        left = VOICE_ENROLL_SAMPLES - len(self.voice_samples)
+        if left > 0:
+            return dict(result, response=f"Got it, {left} more.")
+
+        samples, self.voice_samples = self.voice_samples, None
+        name = next((name for name in getattr(config, 'RECOGNIZED_NAMES', []) if name), "user")
+        try:
+            store = load_voiceprints()
+            if name in store.names:
+                # Somebody else saying "enroll my voice" must not replace the user's voiceprint.
+                distance = store.distance(name, samples)
+                if distance > VOICEPRINT_THRESHOLD:
+                    print(f"Voice enrollment refused: distance {distance:.2f} from the voiceprint of {name}")
+                    return dict(result, response="That doesn't sound like the voice I know, "
+                                                 "so I kept the voiceprint I have.")
+            store.enroll(name, samples)
+            os.makedirs(os.path.dirname(VOICEPRINT_PATH) or ".", exist_ok=True)
+            store.save(VOICEPRINT_PATH)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not save the voiceprint to {VOICEPRINT_PATH}: {e}")
+            return dict(result, response="Sorry, I couldn't save your voiceprint.")
+        print(f"Saved the voiceprint of {name} to {VOICEPRINT_PATH}")
+        if not VOICE_UNLOCK:
+            return dict(result, response="Your voice is enrolled. Turn on VOICE_UNLOCK in the config "
+                                         "to unlock me with it.")
+        return dict(result, response="Your voice is enrolled. Saying Friday will unlock me from now on.")
+
+    def plan(self, clean_query):
+        """How to answer a query without Gemini: a local command, arithmetic or a confident intent; else None."""
+        for trigger, function in self.local_command_map.items():
+            if clean_query.startswith(trigger):
+                # Local commands get the whole query: any words after the trigger are their argument.
+                return splitter.Plan("local", trigger, lambda: function(clean_query),
+                                     f"Handling local command: {trigger}", 1.0, clean_query != trigger)
+
+        # Plain arithmetic is answered here; anything else raises inside the calculator.
+        result = calculator.try_calculate(clean_query)
+        if result is not None:
+            return splitter.Plan("local", "calculate", lambda: f"The result is {result}",
+                                 f"Handling local calculation: {clean_query}", 1.0, False)
+
+        intent = self.intents.predict(clean_query) if self.intents else None
+        if intent is not None:
+            # The margin for the whole text, before slot values are cut out: splitter compares it.
+            _, _, score = self.intents.classify(clean_query)
+            return splitter.Plan("intent", intent.name, lambda: self.call_handler(intent.name, intent.args),
+                                 f"Handling intent locally: {intent.name}({intent.args}), "
+                                 f"confidence {intent.confidence}", score, intent.name in splitter.FREE_TEXT)
+        return None
+
+    def run_plans(self, plans):
+        """Runs the commands of a multi-intent query at the same time; one reply, in the order they were asked."""
+        global _handler_pool
+        with _handler_pool_lock:
+            if _handler_pool is None:
+                _handler_pool = ThreadPoolExecutor(max_workers=MULTI_INTENT_WORKERS, thread_name_prefix="intent")
+        for plan in plans:
+            print(plan.message)
+        entry = self.recorder.current()
+        futures = [_handler_pool.submit(self._run_plan, plan, entry) for plan in plans]
+        replies = []
+        for plan, future in zip(plans, futures):
+            try:
+                reply = str(future.result()).strip()
+            except Exception as e:
+                print(f"Error in {plan.trigger}: {e}")
+                reply = f"Sorry, {plan.trigger.replace('handle_', '')} failed"
+            replies.append(reply if reply[-1:] in ".!?" else reply + ".")
+        return {"route": "multi", "trigger": ", ".join(plan.trigger for plan in plans), "response": " ".join(replies)}
+
+    def _run_plan(self, plan, entry):
+        # Handler calls made on this worker go into the flight recorder entry of the query.
+        with self.recorder.attach(entry):
+            return plan.action()
+
+    def ask_gemini(self, query):
+        """Sends a query to the chat and runs any handlers it asks for."""
+        if self.router is None:
+            self.router = self.start_router()
+        return self._ask_gemini(query)
+
+    def send_to_chat(self, chat, content, tools=None, cancel=None):
+        """Sends one message to a chat once the quota allows it.
+
+        tools, if given, replaces the model's tool declarations for this
+        message. Raises CancelledError if interrupt() is called while waiting,
+        or if the cancel event is set before the message has been sent.
+        """
+        options = {} if tools is None else {"tools": tools}
+        future = gemini_scheduler.submit(lambda: chat.send_message(content, **options))
+        while True:
+            try:
+                return future.result(timeout=0.05)
+            except FutureTimeoutError:
+                if self.interrupted.is_set():
+                    future.cancel()
+                    raise CancelledError()
+                if cancel is not None and cancel.is_set() and future.cancel():
+                    # Still queued, so no quota is spent; once sent, the router waits for the reply.
+                    raise CancelledError()
+
+    def relevant_tools(self, query):
+        """The tool declarations to send with query: the most relevant ones, or None for all."""
+        if not GEMINI_TOOLS_PER_REQUEST:
+            return None
+        names = self.skills.relevant(query.replace("friday", ""), GEMINI_TOOLS_PER_REQUEST)
+        self.recorder.note(offered=names)
+        return self.skills.tools(names)
+
+    def _ask_gemini(self, query):
+        tools = self.relevant_tools(query)
+        tier, chat, response = self.router.send(query, tools=tools)
+        print(f"Answered by {tier}")
+        self.recorder.note(tier=tier)
+
+        for _ in range(MAX_TOOL_ROUNDS):
+            calls = [part.function_call for part in response.parts
+                     if getattr(part, "function_call", None) and part.function_call.name]
+            if not calls:
+                break
+
+            results = []
+            for call in calls:
+                print(f"Gemini requested {call.name}({dict(call.args)})")
+                result = self.call_handler(call.name, dict(call.args))
+                results.append({"function_response": {"name": call.name, "response": {"result": result}}})
+            response = self.send_to_chat(chat, results, tools=tools)
+
+        return response.text
+
+    def call_handler(self, name, args):
+        """Runs a function_map handler and adds the call to the flight recorder."""
+        handler = self.function_map.get(name)
+        if handler is None:
+            return f"Unknown function {name}."
+        started = time.perf_counter()
+        try:
+            result = handler(**args)
+        except Exception as e:
+            self.recorder.tool_call(name, args, None, time.perf_counter() - started, error=repr(e))
+            raise
+        self.recorder.tool_call(name, args, result, time.perf_counter() - started)
+        return result
+
+    def takeCommand(self):
+        """Listens for user voice command and returns it as text."""
+        audio = self.listen()
+        if audio is None:
+            return "none"
+        return self.recognize(audio)
+
+    def listen(self, on_speech=None):
+        """Captures one utterance; None if nobody spoke before the timeout.
+
+        on_speech, if given, is called as soon as BARGE_IN_SECONDS of speech
+        have been heard, before the utterance is over.
+        """
+        r = EchoGuardRecognizer()
+
+        with self.audio_source() as source:
+            print("Listening...")
+            if isinstance(source, sr.Microphone):
+                r.adjust_for_ambient_noise(source)
+            r.pause_threshold = 1
+            try:
+                if on_speech is None:
+                    return r.listen(source, timeout=5, phrase_time_limit=5)
+                return self._listen_for_onset(r, source, on_speech)
+            except sr.WaitTimeoutError:
+                print("Listen timed out, listening again...")
+                return None
+
+    def _listen_for_onset(self, r, source, on_speech):
+        import audioop  # the energy measure Recognizer.listen uses; speech_recognition imports it anyway
+
+        # Speech is counted in 20 ms windows: a chunk can be long and start with the silence before the phrase.
+        window = source.SAMPLE_WIDTH * source.SAMPLE_RATE // 50
+        chunks, loud = [], 0
+        for chunk in r.listen(source, timeout=5, phrase_time_limit=5, stream=True):
+            chunks.append(chunk.frame_data)
+            if on_speech is None:
+                continue
+            data = chunk.frame_data
+            loud += sum(audioop.rms(data[i:i + window], source.SAMPLE_WIDTH) > r.energy_threshold
+                        for i in range(0, len(data) - window + 1, window))
+            if loud * 0.02 >= BARGE_IN_SECONDS:
+                on_speech()
+                on_speech = None
+        return sr.AudioData(b"".join(chunks), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def recognize(self, audio):
+        """Turns a captured utterance into text, or "none"."""
+        try:
+            print("Recognizing...")    
+            query = self.transcriber(sr.Recognizer(), audio)
+            print(f"User said: {query}\n")
+            return query
+        except sr.UnknownValueError:
+            print("Google Speech Recognition could not understand audio")
+            return "none"
+        except sr.RequestError as e:
+            print(f"Could not request results from Google Speech Recognition service; {e}")
+            speak("Unable to reach Google services. Please check your internet connection.")
+            return "none"
+        except Exception as e:
+            print(f"Unknown error in takeCommand: {e}")    
+            speak("Unable to Recognize your voice.")  
+            return "none"
+
+    @command("youtube")
+    def handle_youtube_local(self, query: str):
+        """
+        Parses a local query to search YouTube.
+        Query example: "youtube lofi beats"
+        """
+        try:
+
+            search_query = query.replace("youtube", "").strip()
+            if not search_query:
+                return "Sorry, I didn't catch what to search for on YouTube."
+
+            print(f"Locally searching YouTube for: {search_query}")
+            import pywhatkit
+            web = "https://www.youtube.com/results?search_query=" + search_query
+            webbrowser.open(web)
+            pywhatkit.playonyt(search_query)
+            return f"Done, I've opened YouTube and am playing {search_query}."
+        except Exception as e:
+            return f"I've opened the search results for {search_query}, but couldn't auto-play. {e}"
+
+    @command("google", "search")
+    def handle_google_local(self, query: str):
+        """
+        Parses a local query to search Google.
+        Query example: "google the weather"
+        """
+        try:
+
+            search_query = query.replace("google", "").replace("search", "").strip()
+            if not search_query:
+                return "Sorry, I didn't catch what to search for on Google."
+
+            print(f"Locally searching Google for: {search_query}")
+            import pywhatkit
+            pywhatkit.search(search_query)
+            return f"Opening Google search results for {search_query}."
+        except Exception as e:
+            return f"Sorry, I couldn't perform the Google search. {e}"
+
+    @command("wikipedia")
+    def handle_wikipedia_local(self, query: str):
+        """
+        Parses a local query to search Wikipedia.
+        Query example: "wikipedia albert einstein"
+        """
+        try:
+            search_topic = query.replace("wikipedia", "").strip()
+            if not search_topic:
+                return "Sorry, I didn't catch what to search for on Wikipedia."
+
+            print(f"Locally searching Wikipedia for: {search_topic}")
+
+            return self.handle_wikipedia(search_topic)
+        except Exception as e:
+            return f"Sorry, I couldn't search Wikipedia. {e}"
+
+    @command("wikihow", "how to")
+    def handle_wikihow_local(self, query: str):
+        """
+        Parses a local query to search WikiHow.
+        Query example: "how to tie a tie"
+        """
+        try:
+            task = query.replace("wikihow", "").replace("how to", "").strip()
+            if not task:
+                return "Sorry, I didn't catch what you want to know how to do."
+
+            print(f"Locally searching WikiHow for: {task}")
+
+            return self.handle_wikihow(task)
+        except Exception as e:
+            return f"Sorry, I couldn't search WikiHow. {e}"
+
+    @skill("Get a brief summary of a topic from Wikipedia.", topic="The topic to search for")
+    def handle_wikipedia(self, topic: str):
+        import wikipedia
+
+        try:
+            print(f"Searching Wikipedia for: {topic}")
+            results = wikipedia.summary(topic, sentences=2)
+            return f"According to Wikipedia, {results}"
+        except wikipedia.exceptions.DisambiguationError as e:
+            return f"That topic is ambiguous. It could mean: {e.options[0]}, or {e.options[1]}."
+        except wikipedia.exceptions.PageError:
+            return f"Sorry, I could not find any Wikipedia page for {topic}."
+        except Exception as e:
+            return f"Sorry, I couldn't find that on Wikipedia. {e}"
+
+    @skill("Open YouTube and search for a video. Can also play the first result.",
+           search_query="The search term for the video")
+    def handle_youtube(self, search_query: str):
+
+        try:
+            print(f"AI searching YouTube for: {search_query}")
+            import pywhatkit
+            web = "https://www.youtube.com/results?search_query=" + search_query
+            webbrowser.open(web)
+            pywhatkit.playonyt(search_query)
+            return f"Done, I've opened YouTube and am playing {search_query}."
+        except Exception as e:
+            return f"I've opened the search results for {search_query}, but couldn't auto-play. {e}"
+
+    @skill("Perform a Google search in the browser for a given query.", search_query="The term to search on Google")
+    def handle_google(self, search_query: str):
+
+        try:
+            print(f"AI searching Google for: {search_query}")
+            import pywhatkit
+            pywhatkit.search(search_query)
+            return f"Opening Google search results for {search_query}."
+        except Exception as e:
+            return f"Sorry, I couldn't perform the Google search. {e}"
+
+    @skill("Open a specific website in the browser.", site_name="The name of the site (e.g., 'google', 'gmail')")
+    def handle_open_web(self, site_name: str):
+        site_name = site_name.lower()
+        url_map = {
+            'gmail': "https://gmail.com",
+            'google': "https://google.com",
+            'instagram': "https://instagram.com",
+            'facebook': "https://facebook.com",
+            'chat': "https://chat.openai.com", 
+            'wikipedia': "https://wikipedia.com",
+        }
+        if site_name in url_map:
+            webbrowser.open(url_map[site_name])
+            return f"Opening {site_name}."
+        else:
+            return f"Sorry, I don't have a URL for {site_name}."
+
+    @skill("Opens a local application like VS Code or Notepad.",
+           ("open code", {"app_name": "code"}), ("open notepad", {"app_name": "notepad"}),
+           app_name="The name of the app (e.g., 'code', 'notepad')")
+    def handle_open_app(self, app_name: str):
+        app_name = app_name.lower()
+        if 'code' in app_name:
+            try:
+                os.startfile(config.CODE_PATH)
+                return "Opening VS Code."
+            except Exception as e:
+                return f"Error opening VS Code. Check config path. {e}"
+        elif 'notepad' in app_name:
+            try:
+                os.startfile(config.NOTEPAD_PATH)
+                return "Opening Notepad."
+            except Exception as e:
+                return f"Error opening Notepad. Check config path. {e}"
+        else:
+            return f"Sorry, I can't open the app '{app_name}'."
+
+    @skill("Open the computer's webcam.")
+    def handle_open_camera(self, query=None): 
+        import cv2
+
+        # The presence monitor keeps the camera open; a second capture could not read from it.
+        frame = self.presence.latest_frame() if self.presence is not None else None
+        cap = None
+        try:
+            if frame is None:
+                cap = cv2.VideoCapture(0)
+                ret, frame = cap.read()
+                if not ret:
+                    return "Sorry, I couldn't read from the camera."
+            cv2.imshow('Camera', frame)
+            cv2.waitKey(5000)
+            return "Opening camera."
+        except Exception as e:
+            return f"Sorry, I couldn't open the camera. {e}"
+        finally:
+            if cap is not None:
+                cap.release()
+            cv2.destroyAllWindows()
+
+    @skill("Get the current battery percentage of the laptop.", "battery", "power left")
+    def handle_battery(self, query=None): 
+        try:
+            battery = psutil.sensors_battery()
+            percentage = battery.percent
+            return f"Sir our system has {percentage} percent battery"
+        except Exception as e:
+            return f"Sorry, I can't retrieve battery information. {e}"
+
+    @skill("Test the current internet download and upload speed.", "internet speed")
+    def handle_internet_speed(self, query=None): 
+        try:
+            import speedtest
+            st = speedtest.Speedtest()
+            dl_mbps = round(st.download() / 1_000_000, 2)
+            up_mbps = round(st.upload() / 1_000_000, 2)
+            return f"sir we have {dl_mbps} megabits per second downloading speed and {up_mbps} megabits per second uploading speed"
+        except Exception as e:
+            return f"Sorry, I couldn't test the internet speed. {e}"
+
+    @skill("Take a screenshot of the entire screen and save it.", "screenshot")
+    def handle_screenshot(self, query=None): 
+        try:
+            import pyscreenshot
+            a = datetime.datetime.now()
+            filename = f"screenshot_{a.strftime('%Y-%m-%d_%H-%M-%S')}.png"
+            if not os.path.exists("screenshot"):
+                os.mkdir("screenshot")
+            image_path = os.path.join("screenshot", filename)
+            image = pyscreenshot.grab()
+            image.save(image_path)
+            image.show()
+            return f"Screenshot saved as {filename}"
+        except Exception as e:
+            return f"Sorry, I was unable to take a screenshot. {e}"
+
+    @skill("Adjust the system volume.",
+           ("volume up", {"direction": "up"}), ("volume down", {"direction": "down"}),
+           ("mute", {"direction": "mute"}), ("volume mute", {"direction": "mute"}),
+           direction="e.g., 'up', 'down', or 'mute'")
+    def handle_volume(self, direction: str):
+        import pyautogui
+
+        direction = direction.lower()
+        if 'up' in direction:
+            pyautogui.press("volumeup")
+            return "Volume up."
+        elif 'down' in direction:
+            pyautogui.press("volumedown")
+            return "Volume down."
+        elif 'mute' in direction:
+            pyautogui.press("volumemute")
+            return "Volume muted."
+        else:
+            return "Sorry, I didn't understand that volume command."
+
+    @skill("Stop the assistant and put it in sleep mode.", "sleep")
+    def handle_sleep(self, query=None): 
+        self.running = False  
+        return "Thanks for using me sir, have a good day. Bye."
+
+    @command("system status", "resource usage", "memory usage")
+    def handle_status(self, query=None):
+        return self.resources.status()
+
+    @command("enroll my voice", "enrol my voice", "learn my voice")
+    def handle_enroll_voice(self, query=None):
+        self.voice_samples = []
+        return (f"Say Friday and then anything you like, {VOICE_ENROLL_SAMPLES} times, and I'll learn your voice. "
+                "Say Friday cancel to stop.")
+
+    @command("report a problem")
+    def handle_report_problem(self, query=None):
+        try:
+            path = self.recorder.dump(reason="reported by the user")
+        except OSError as e:
+            print(f"Could not save the flight recorder: {e}")
+            return "Sorry, I couldn't save my recent history."
+        print(f"Flight recorder saved to {path}")
+        return f"I've saved my last {len(self.recorder.entries)} commands for troubleshooting."
+
+    @skill("Get the current time.", "time")
+    def handle_time(self, query=None): 
+        strTime = datetime.datetime.now().strftime("%I:%M %p")
+        return f"sir the time is {strTime}"
+
+    @skill("Calculate a simple arithmetic expression (e.g., '5 plus 2').",
+           expression="The expression to calculate, e.g., '12.5 percent of 240' or 'square root of 81 plus 3'")
+    def handle_calculate(self, expression: str):
+        try:
+            result = calculator.format_number(calculator.evaluate(expression))
+        except calculator.CalculationError as e:
+            print(f"Could not calculate {expression!r}: {e}")
+            return "Sorry, I was unable to calculate that."
+        return f"The result is {result}"
+
+    @skill("Perform a unit conversion.", conversion_query="The conversion to perform, e.g., '10 meters to feet'")
+    def handle_convert(self, conversion_query: str):
+        return convert_units(conversion_query) 
+
+    @skill("Translate text from English to another language.",
+           text="The text to translate", target_language="The target language (e.g., 'hindi', 'french')")
+    def handle_translate(self, text: str, target_language: str):
+        translated_phrase = translate_text(text, target_language)
+        return f"The translation is: {translated_phrase}"
+
+    @skill("Remember a short piece of information.", text_to_remember="The information to save")
+    def handle_remember(self, text_to_remember: str):
+        try:
+            with open(self.memory_path, 'w') as remember:
+                remember.write(text_to_remember)
+            return f"Okay, I will remember that: {text_to_remember}"
+        except Exception as e:
+            return f"Sorry, I had trouble writing that to my memory. {e}"
+
+    @skill("Retrieve the information that was saved.")
+    def handle_recall(self, query=None): 
+        try:
+            with open(self.memory_path, 'r') as remember:
+                return "You said me to remember that: " + remember.read()
+        except FileNotFoundError:
+            return "Sorry, I don't remember anything."
+        except Exception as e:
+            return f"Sorry, I had trouble recalling that. {e}"
+
+    @skill("Read the first page of a PDF file from the local PDF directory.",
+           pdf_name="The name of the PDF file (without .pdf)")
+    def handle_read_pdf(self, pdf_name: str):
+        pdf_path = os.path.join(config.PDF_DIR, f"{pdf_name.lower()}.pdf")
+
+        if os.path.isfile(pdf_path):
+            return read_pdf(pdf_path) 
+        else:
+            return "No valid PDF found with that name. Please try again."
+
+    @skill("Get the current weather for a specific city.", city="The city name")
+    def handle_weather(self, city: str):
+        return get_weather(city) 
+
+    @skill("Get the top news headlines.",
+           category="e.g., 'general', 'business', 'technology'", country="e.g., 'in' (India), 'us' (USA)")
+    def handle_news(self, category: str = 'general', country: str = 'in'):
+        return get_news(country, category) 
+
+    @skill("Play a random song from the user's music directory.", "play music")
+    def handle_play_music(self, query=None): 
+        try:
+            music_dir = config.MUSIC_DIR
+            songs = os.listdir(music_dir)
+            if songs:
+                song_to_play = os.path.join(music_dir, random.choice(songs))
+                os.startfile(song_to_play)
+                return f"Playing {song_to_play.split('.')[0]}"
+            else:
+                return "Sorry, I couldn't find any songs in your music directory."
+        except Exception as e:
+            return f"Sorry, I couldn't play music. {e}"
+
+    @skill("Tell a random programming joke.")
+    def handle_joke(self):
+        import pyjokes
+
+        return pyjokes.get_joke()
+
+    @skill("Find a 'how-to' guide from WikiHow.", task="The task to learn, e.g., 'tie a tie'")
+    def handle_wikihow(self, task: str):
+        try:
+            from pywikihow import search_wikihow
+            how_to = search_wikihow(task, max_results=1)
+            if how_to:
+                return f"Here is a summary for {task}: {how_to[0].summary}"
+            else:
+                return f"Sorry, I couldn't find a how-to guide for {task}."
+        except Exception as e:
+            return f"Sorry sir, I am not able to find this. {e}"
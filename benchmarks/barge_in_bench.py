@@ -0,0 +1,146 @@
+"""Barge-in benchmark: how fast Friday stops talking when interrupted, and whether her echo interrupts her.
+
+Each session runs the real pipelined Assistant on real-time WAV input:
+
+1. "friday tell me about mars", answered with a long scripted reply that
+   takes several seconds to play,
+2. while it plays, the microphone hears her voice coming back at --echo
+   amplitude, and (unless echo-only) the user starts a new command,
+   "friday time", --onset seconds into that recording,
+3. "friday sleep", once Friday has finished talking.
+
+Per echo level and echo guard setting (ECHO_FACTOR, 1 turns it off) it
+reports, for sessions with speech: the delay from the user starting to
+talk to the barge-in being detected, to Friday falling silent, and to the
+listening state; whether the new command was answered. For echo-only
+sessions: whether the echo alone cut the reply short (a false barge-in).
+The detection delay is at least BARGE_IN_SECONDS, rounded up to the 256 ms
+chunks sr.AudioFile is read in (a microphone delivers 64 ms chunks).
+
+    python -m benchmarks.barge_in_bench
+    python -m benchmarks.barge_in_bench --echo 0 800 2000
+"""
+import argparse
+import contextlib
+import io
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+from benchmarks import bench_config
+
+sys.modules['config'] = bench_config
+
+from benchmarks.fakes import RecordingSpeaker, ScriptedChat, TranscriptLookup, WavFileAudio, write_utterance_wav
+
+RATE = 16000
+LONG_REPLY = ("Mars is the fourth planet from the Sun. It is a cold desert world with a thin atmosphere. "
+              "Its red colour comes from iron oxide in the dust. It has two small moons, Phobos and Deimos, "
+              "and the tallest volcano in the solar system, Olympus Mons.")
+SECONDS_PER_WORD = 0.15
+
+
+def write_barge_in_wav(path, echo, echo_from, onset, speech=0.8, tail=1.2):
+    """Silence, then echo at amplitude `echo` from echo_from, then a loud utterance at onset (None: echo only)."""
+    end = (onset if onset is not None else echo_from + 2.0) + speech + tail
+    samples = []
+    for i in range(int(end * RATE)):
+        t = i / RATE
+        value = echo * math.sin(2 * math.pi * 180 * t) if t >= echo_from else 0.0
+        if onset is not None and onset <= t < onset + speech:
+            value += 9000 * math.sin(2 * math.pi * 320 * t)
+        samples.append(int(max(-32768, min(32767, value))))
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+def run_session(workdir, echo, factor, onset, args):
+    import assistant
+
+    assistant.ECHO_FACTOR = factor
+    paths = [os.path.join(workdir, "mars.wav"), os.path.join(workdir, f"barge_{echo}_{onset}.wav"),
+             os.path.join(workdir, "sleep.wav")]
+    write_utterance_wav(paths[0], seed=1)
+    write_barge_in_wav(paths[1], echo, args.echo_from, onset)
+    write_utterance_wav(paths[2], seed=2)
+    transcripts = {paths[0]: "friday tell me about mars", paths[2]: "friday sleep"}
+    if onset is not None:
+        transcripts[paths[1]] = "friday time"
+
+    speaker = RecordingSpeaker(delay=lambda text: len(text.split()) * SECONDS_PER_WORD)
+    greeted = []
+
+    def wait(i):
+        # "sleep" waits for the replies before it: the long one, and "time" if it was asked.
+        if i == 0:
+            greeted.append(speaker.finished)
+        elif i == 2:
+            while speaker.finished < greeted[0] + (2 if onset is not None else 1):
+                time.sleep(0.01)
+
+    audio = WavFileAudio(paths, realtime=True, wait=wait)
+    assistant.set_speaker(speaker)
+    bot = assistant.Assistant(audio_source=audio, transcriber=TranscriptLookup(audio, transcripts, delay=0.05),
+                              chat=ScriptedChat({"friday tell me about mars": LONG_REPLY}, latency=0.1),
+                              verify=False, pipelined=True)
+    audio.on_exhausted = bot.stop
+    events = []
+    bot.on_event = lambda kind, value: events.append((time.perf_counter(), kind, value))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        bot.run()
+
+    pipeline = bot.pipeline
+    result = {"cut": bool(speaker.stopped_at), "barge_ins": pipeline.stats["barge_ins"],
+              "answered": any("the time is" in text for _, text in speaker.spoken)}
+    if onset is not None and pipeline.barge_in_at is not None:
+        spoken_at = audio.opened_at[1] + onset
+        listening = [t for t, kind, value in events
+                     if kind == "state" and value == assistant.LISTENING and t >= pipeline.barge_in_at]
+        result["detect_ms"] = (pipeline.barge_in_at - spoken_at) * 1000
+        result["silent_ms"] = (speaker.stopped_at[0] - spoken_at) * 1000 if speaker.stopped_at else None
+        result["listening_ms"] = (listening[0] - spoken_at) * 1000 if listening else None
+    return result
+
+
+def fmt(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--echo', type=int, nargs='+', default=[0, 1000],
+                        help="amplitudes of Friday's voice picked up by the microphone (speech is 9000)")
+    parser.add_argument('--factor', type=float, default=3.0, help="ECHO_FACTOR for the guarded runs")
+    parser.add_argument('--echo-from', type=float, default=0.4, help="seconds into the recording her voice is heard")
+    parser.add_argument('--onset', type=float, default=1.5, help="seconds into the recording the user talks")
+    args = parser.parse_args(argv)
+
+    print(f"{'echo':>6}{'guard':>7}{'barge-ins':>11}{'detect ms':>11}{'silent ms':>11}{'listen ms':>11}"
+          f"{'answered':>10}{'echo cut reply':>16}")
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for echo in args.echo:
+                for factor in ((1.0, args.factor) if echo else (args.factor,)):
+                    speech = run_session(workdir, echo, factor, args.onset, args)
+                    quiet = run_session(workdir, echo, factor, None, args)
+                    print(f"{echo:>6}{'on' if factor > 1 else 'off':>7}{speech['barge_ins']:>11}"
+                          f"{fmt(speech.get('detect_ms')):>11}{fmt(speech.get('silent_ms')):>11}"
+                          f"{fmt(speech.get('listening_ms')):>11}{'yes' if speech['answered'] else 'no':>10}"
+                          f"{'yes' if quiet['cut'] else 'no':>16}")
+        finally:
+            os.chdir(cwd)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
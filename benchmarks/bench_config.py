@@ -0,0 +1,32 @@
+"""Stand-in for config.py while benchmarking.
+
+The harness installs this module as ``config`` before importing the
+assistant, so benchmarks never touch real API keys or user directories.
+The API URLs are filled in once the stub HTTP server is listening.
+"""
+import os
+import tempfile
+
+GEMINI_API_KEY = "benchmark"
+WEATHER_API_KEY = "benchmark"
+NEWS_API_KEY = "benchmark"
+
+WEATHER_API_URL = None
+NEWS_API_URL = None
+
+TRAINER_PATH = os.path.join("trainer", "trainer.yml")
+CASCADE_PATH = "haarcascade_frontalface_default.xml"
+RECOGNIZED_NAMES = ['', 'Tushar']
+
+CODE_PATH = ""
+NOTEPAD_PATH = ""
+PDF_DIR = tempfile.gettempdir()
+MUSIC_DIR = tempfile.gettempdir()
+
+GIF_1_PATH = ""
+GIF_2_PATH = ""
+GIF_3_PATH = ""
+GIF_4_PATH = ""
+
+# The stub chat has no quota.
+GEMINI_REQUESTS_PER_MINUTE = 60000
@@ -0,0 +1,145 @@
+"""Coverage and speed benchmark for the local calculator (calculator.py).
+
+Runs a corpus of spoken queries through calculator.try_calculate, the same
+check Assistant.dispatch uses before sending a query to Gemini, and reports:
+
+- how many arithmetic queries are answered locally, and how many correctly,
+- how many of them the old three-token handle_calculate could answer,
+- how many non-arithmetic queries are wrongly claimed as calculations,
+- the cost per query, cold (empty cache) and cached.
+
+    python -m benchmarks.calc_corpus
+    python -m benchmarks.calc_corpus --verbose
+"""
+import argparse
+import math
+import sys
+import time
+
+import calculator
+
+# (query, expected answer). Phrased the way speech recognition returns them.
+ARITHMETIC = [
+    ("5 plus 2", 7),
+    ("10 times 5", 50),
+    ("100 divided by 8", 12.5),
+    ("what is 12.5 percent of 240", 30),
+    ("square root of 81 plus 3", 12),
+    ("what's 15 percent of 80", 12),
+    ("what is 2 to the power of 10", 1024),
+    ("calculate 7 squared", 49),
+    ("what is 3 cubed minus 1", 26),
+    ("twelve point five times four", 50),
+    ("one hundred and twenty three plus seven", 130),
+    ("what is twenty five times four", 100),
+    ("how much is 1,250 minus 375", 875),
+    ("what is 18 multiplied by 3", 54),
+    ("144 divided by 12", 12),
+    ("what is half of 250", 125),
+    ("square root of 2", math.sqrt(2)),
+    ("cube root of 27", 3),
+    ("factorial of 6", 720),
+    ("17 mod 5", 2),
+    ("what is 3.5 plus 2.25", 5.75),
+    ("minus 8 plus 20", 12),
+    ("what is 2 raised to 8", 256),
+    ("log of 1000", 3),
+    ("what is 45 over 9", 5),
+    ("what is 9 x 9", 81),
+    ("calculate 1000 minus 1", 999),
+    ("what is ten percent of five thousand", 500),
+    ("what is 3 plus 4 times 2", 11),
+    ("square root of ( 16 plus 9 )", 5),
+    ("what is 5 into 6", 30),
+    ("what is 0.1 plus 0.2", 0.3),
+    ("what is 7 divided by 0", None),
+    ("what is a quarter of 60", 15),
+    ("what is 99 plus 1 please", 100),
+]
+
+OTHER = [
+    "what's the weather in ghaziabad",
+    "tell me something about mars",
+    "what is the capital of india",
+    "who created you",
+    "remember that the keys are in the drawer",
+    "what did i ask you to remember",
+    "give me the business news",
+    "convert 5 miles to kilometers",
+    "translate good morning to hindi",
+    "what is 5",
+    "play despacito on youtube",
+    "open chrome",
+    "how are you",
+    "what is the square of the hypotenuse",
+    "set a timer for 5 minutes",
+    "what is two and five",
+]
+
+
+def legacy_calculate(expression):
+    """The handle_calculate this replaced: exactly three tokens, whole numbers."""
+    import operator
+    parts = expression.lower().split()
+    ops = {'+': operator.add, 'plus': operator.add, '-': operator.sub, 'minus': operator.sub,
+           'x': operator.mul, 'multiplied': operator.mul, 'times': operator.imul,
+           'divided': operator.truediv, 'by': operator.truediv}
+    try:
+        return ops[parts[1]](int(parts[0]), int(parts[2])) if len(parts) == 3 else None
+    except (KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
+def time_per_query(queries, repeat):
+    """Mean microseconds per query, with the caches cleared before the first pass only."""
+    calculator.to_expression.cache_clear()
+    calculator.compile_expression.cache_clear()
+    started = time.perf_counter()
+    for query in queries:
+        calculator.try_calculate(query)
+    cold = (time.perf_counter() - started) / len(queries) * 1e6
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            calculator.try_calculate(query)
+    warm = (time.perf_counter() - started) / (len(queries) * repeat) * 1e6
+    return cold, warm
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--verbose', action='store_true', help="print every query and its answer")
+    args = parser.parse_args(argv)
+
+    solvable = [(q, e) for q, e in ARITHMETIC if e is not None]
+    local = correct = legacy = 0
+    for query, expected in ARITHMETIC:
+        answer = calculator.try_calculate(query)
+        if expected is None:
+            ok = answer is None
+        else:
+            local += answer is not None
+            ok = answer is not None and math.isclose(float(answer), expected, rel_tol=1e-9)
+            correct += ok
+            legacy += legacy_calculate(query) is not None
+        if args.verbose or not ok:
+            print(f"{'ok ' if ok else 'BAD'} {query!r} -> {answer} (expected {expected})")
+
+    claimed = [q for q in OTHER if calculator.try_calculate(q) is not None]
+    for query in claimed:
+        print(f"BAD {query!r} was treated as a calculation")
+
+    cold, warm = time_per_query([q for q, _ in ARITHMETIC] + OTHER, args.repeat)
+
+    n = len(solvable)
+    print(f"arithmetic queries answered locally  {local}/{n} ({local / n:.0%}), correct {correct}/{n}")
+    print(f"old handle_calculate could answer    {legacy}/{n} ({legacy / n:.0%})")
+    print(f"other queries claimed as arithmetic  {len(claimed)}/{len(OTHER)}")
+    print(f"cost per query                       {cold:.1f} us cold, {warm:.1f} us cached")
+    return 1 if correct < n or claimed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Enrollment capture benchmark: the old Sample generator loop against the quality gate.
+
+A simulated 30 fps webcam shows a drawn face that first holds still, then
+tilts, blinks, changes expression and moves through side light at random,
+with motion blur while it moves fast and a dim stretch early on. Both capture loops run against it until they
+have --samples crops:
+
+- old: every detected face is saved, JPEGs written on the loop, 100 ms wait
+  per frame (the original Sample generator.py); it runs until its set
+  contains --samples crops the gate would accept,
+- gated: enrollment.QualityGate decides, enrollment.SampleWriter writes,
+  no wait.
+
+For each resulting set it reports the seconds taken, how many crops were
+saved and how many of them are usable, how many are blurry or too dark, how
+many pairs are near-duplicates, and the mean dHash distance between
+samples (higher means a more varied set).
+
+    python -m benchmarks.enrollment_bench
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.face_detect_bench import CASCADE, draw_face
+from enrollment import BRIGHTNESS, MIN_DISTANCE, MIN_SHARPNESS, QualityGate, SampleWriter, dhash, hamming, sharpness
+
+WIDTH, HEIGHT = 640, 480
+FPS = 30
+
+
+class SimulatedCamera:
+    """Delivers the frame for the current moment, at most FPS times a second, like a webcam."""
+
+    def __init__(self, seed=0, seconds=60):
+        rng = np.random.default_rng(seed)
+        self.rng = rng
+        self.started = time.perf_counter()
+        self.last = None
+        self.background = cv2.GaussianBlur(rng.integers(60, 120, (HEIGHT, WIDTH)).astype(np.uint8), (0, 0), 4)
+        # Head tilt (degrees), mouth opening and side light as smooth random walks, one value per frame.
+        steps = rng.normal(0, 1, (seconds * FPS, 3)) * [1.2, 0.6, 0.03]
+        self.walk = np.cumsum(steps, axis=0)
+        self.walk[:, 0] = 15 * np.tanh(self.walk[:, 0] / 15)
+        self.walk[:, 1] = 6 + 5 * np.tanh(self.walk[:, 1] / 5)
+        self.walk[:, 2] = 0.4 * np.tanh(self.walk[:, 2])
+
+    def read(self):
+        now = time.perf_counter()
+        if self.last is not None and now - self.last < 1 / FPS:
+            time.sleep(1 / FPS - (now - self.last))
+        self.last = time.perf_counter()
+        return True, self.frame(self.last - self.started)
+
+    def frame(self, t):
+        # Still for the first 2 s, then tilting, changing expression and moving through side light.
+        i = min(int(max(0.0, t - 2) * FPS), len(self.walk) - 1)
+        angle, mouth, light = self.walk[i] if t >= 2 else (0.0, 6.0, 0.0)
+        speed = abs(self.walk[i][0] - self.walk[i - 1][0]) * FPS if t >= 2 and i else 0
+        blink = t >= 2 and (t % 1.3) < 0.15
+
+        patch = np.full((240, 240), 100, np.uint8)
+        draw_face(patch, 40, 40, 160)
+        cv2.ellipse(patch, (120, 162), (20, int(mouth)), 0, 0, 360, 70, -1)
+        if blink:
+            for ex in (98, 142):
+                cv2.ellipse(patch, (ex, 108), (14, 8), 0, 0, 360, 185, -1)
+                cv2.line(patch, (ex - 12, 108), (ex + 12, 108), 60, 2)
+        rotation = cv2.getRotationMatrix2D((120, 120), angle, 1.0)
+        patch = cv2.warpAffine(patch, rotation, (240, 240), borderValue=100)
+        patch = np.clip(patch * (1 + light * np.linspace(-1, 1, 240)[None, :]), 0, 255).astype(np.uint8)
+
+        frame = self.background.copy()
+        frame[120:360, 200:440] = patch
+        if speed > 25:
+            length = int(speed / 2)
+            frame = cv2.filter2D(frame, -1, np.ones((1, length), np.float32) / length)
+        if 3.0 <= t < 4.0:
+            frame = (frame * 0.3).astype(np.uint8)
+        frame = np.clip(frame + self.rng.normal(0, 3, frame.shape), 0, 255).astype(np.uint8)
+        return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+
+def capture_old(cam, detector, directory, samples, timeout):
+    """The original loop: save every face, write inline, wait 100 ms per frame.
+
+    It keeps going until its saved set holds `samples` crops the quality
+    gate would accept, i.e. until it has as much usable data as the gated
+    loop, or until timeout seconds have passed.
+    """
+    crops, usable = [], QualityGate()
+    started = time.perf_counter()
+    while usable.accepted < samples and time.perf_counter() - started < timeout:
+        ret, img = cam.read()
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        for (x, y, w, h) in detector.detectMultiScale(gray, 1.3, 5):
+            crop = gray[y:y + h, x:x + w]
+            cv2.imwrite(os.path.join(directory, f"old.{len(crops)}.jpg"), crop)
+            crops.append(crop)
+            usable.check(crop)
+        time.sleep(0.1)
+    return crops
+
+
+def capture_gated(cam, detector, directory, samples, timeout):
+    """The new loop: largest face only, quality gate, background writer."""
+    gate, writer, crops = QualityGate(), SampleWriter(), []
+    started = time.perf_counter()
+    while gate.accepted < samples and time.perf_counter() - started < timeout:
+        ret, img = cam.read()
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        faces = detector.detectMultiScale(gray, 1.3, 5)
+        if len(faces):
+            (x, y, w, h) = max(faces, key=lambda f: f[2] * f[3])
+            crop = gray[y:y + h, x:x + w]
+            if gate.check(crop)[0]:
+                writer.write(os.path.join(directory, f"gated.{gate.accepted}.jpg"), crop)
+                crops.append(crop)
+    writer.close()
+    return crops
+
+
+def describe_set(crops):
+    """Quality of a saved set; usable counts what QualityGate would have kept of it."""
+    gate = QualityGate()
+    for crop in crops:
+        gate.check(crop)
+    hashes = [dhash(c) for c in crops]
+    distances = [hamming(a, b) for a, b in itertools.combinations(hashes, 2)]
+    return {
+        "usable": gate.accepted,
+        "blurry": sum(sharpness(c) < MIN_SHARPNESS for c in crops),
+        "dark": sum(c.mean() < BRIGHTNESS[0] for c in crops),
+        "duplicate pairs": sum(d < MIN_DISTANCE for d in distances),
+        "mean distance": sum(distances) / max(len(distances), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=30, help="give up after this many seconds per loop")
+    args = parser.parse_args(argv)
+
+    detector = cv2.CascadeClassifier(CASCADE)
+    print(f"{'loop':<8}{'seconds':>9}{'saved':>7}{'usable':>8}{'blurry':>8}{'dark':>6}{'dup pairs':>11}"
+          f"{'mean dist':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, capture in (("old", capture_old), ("gated", capture_gated)):
+            started = time.perf_counter()
+            crops = capture(SimulatedCamera(), detector, directory, args.samples, args.timeout)
+            seconds = time.perf_counter() - started
+            stats = describe_set(crops)
+            print(f"{name:<8}{seconds:>9.2f}{len(crops):>7}{stats['usable']:>8}{stats['blurry']:>8}{stats['dark']:>6}"
+                  f"{stats['duplicate pairs']:>11}{stats['mean distance']:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
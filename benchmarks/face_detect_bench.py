@@ -0,0 +1,174 @@
+"""Frames per second and recall of face detection, with parameter auto-tuning.
+
+Runs face_tracker.FaceTracker over a frame sequence for every combination
+of --scales, --paddings, --rescans and --scale-factors, next to the old
+behaviour (the cascade over the full frame with scaleFactor 1.2, every
+frame), and prints the fastest settings whose recall stays within
+--max-recall-loss of the old behaviour.
+
+Frames come from --frames DIR (a recorded session, images sorted by name,
+e.g. saved with cv2.imwrite from the webcam) or, by default, from a
+synthetic 640x480 sequence: a drawn face drifting over a cluttered
+background and leaving the picture now and then. Recorded frames have no
+labels, so there the old detector's boxes are the ground truth.
+
+    python -m benchmarks.face_detect_bench
+    python -m benchmarks.face_detect_bench --frames recordings/desk --scales 1 0.5
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from face_tracker import FaceTracker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASCADE = os.path.join(ROOT, "haarcascade_frontalface_default.xml")
+WIDTH, HEIGHT = 640, 480
+MIN_SIZE = (int(0.1 * WIDTH), int(0.1 * HEIGHT))
+MIN_IOU = 0.4
+
+
+def draw_face(frame, x, y, size):
+    """Draws a schematic face (bright oval, dark eyes, brows and mouth) that the Haar cascade detects."""
+    s = size / 160
+
+    def p(px, py):
+        return int(x + px * s), int(y + py * s)
+
+    def axes(ax, ay):
+        return max(1, int(ax * s)), max(1, int(ay * s))
+
+    cv2.ellipse(frame, p(80, 85), axes(55, 72), 0, 0, 360, 185, -1)
+    for ex in (58, 102):
+        cv2.ellipse(frame, p(ex, 68), axes(13, 7), 0, 0, 360, 50, -1)
+        cv2.ellipse(frame, p(ex, 55), axes(15, 4), 0, 0, 360, 70, -1)
+    cv2.ellipse(frame, p(80, 95), axes(6, 14), 0, 0, 360, 160, -1)
+    cv2.ellipse(frame, p(80, 122), axes(20, 6), 0, 0, 360, 80, -1)
+
+
+def synthetic_frames(count, seed=0):
+    """Returns [(gray frame, true box or None)]: a face wandering over clutter, absent now and then."""
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(40, 140, (HEIGHT, WIDTH)).astype(np.uint8), (0, 0), 3)
+    for _ in range(25):
+        x, y = rng.integers(0, WIDTH), rng.integers(0, HEIGHT)
+        cv2.rectangle(background, (int(x), int(y)), (int(x + rng.integers(20, 120)), int(y + rng.integers(20, 120))),
+                      int(rng.integers(30, 200)), -1)
+
+    frames = []
+    x, y, size = 260.0, 160.0, 130.0
+    vx, vy = 3.0, 2.0
+    for i in range(count):
+        frame = background.copy()
+        vx = float(np.clip(vx + rng.normal(0, 1), -8, 8))
+        vy = float(np.clip(vy + rng.normal(0, 1), -6, 6))
+        size = float(np.clip(size + rng.normal(0, 2), 90, 200))
+        x = float(np.clip(x + vx, 0, WIDTH - size))
+        y = float(np.clip(y + vy, 0, HEIGHT - size))
+        # The user looks away for 10 frames out of every 90.
+        present = i % 90 < 80
+        if present:
+            draw_face(frame, x, y, size)
+        frame = cv2.GaussianBlur(frame, (0, 0), 1.2)
+        frame = np.clip(frame + rng.normal(0, 4, frame.shape), 0, 255).astype(np.uint8)
+        truth = (int(x), int(y), int(size), int(size)) if present else None
+        frames.append((frame, truth))
+    return frames
+
+
+def recorded_frames(directory, cascade):
+    """Loads a recorded session; the old full-frame detector provides the ground truth."""
+    frames = []
+    for name in sorted(os.listdir(directory)):
+        img = cv2.imread(os.path.join(directory, name))
+        if img is None:
+            continue
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        faces = cascade.detectMultiScale(gray, scaleFactor=1.2, minNeighbors=5, minSize=MIN_SIZE)
+        truth = tuple(max(faces, key=lambda f: f[2] * f[3])) if len(faces) else None
+        frames.append((gray, truth))
+    return frames
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    h = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = w * h
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+def evaluate(tracker, frames):
+    """Runs tracker over frames. Returns (fps, recall, false positives per frame)."""
+    hits = false_positives = 0
+    elapsed = 0.0
+    for gray, truth in frames:
+        started = time.perf_counter()
+        boxes = tracker.detect(gray)
+        elapsed += time.perf_counter() - started
+        matched = [truth is not None and iou(box, truth) >= MIN_IOU for box in boxes]
+        hits += any(matched)
+        false_positives += matched.count(False)
+    with_face = sum(truth is not None for _, truth in frames)
+    return len(frames) / elapsed, hits / max(with_face, 1), false_positives / len(frames)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', help="directory of recorded frames (default: a synthetic sequence)")
+    parser.add_argument('--count', type=int, default=180, help="synthetic frames to generate")
+    parser.add_argument('--scales', type=float, nargs='+', default=[1.0, 0.5, 0.35])
+    parser.add_argument('--paddings', type=float, nargs='+', default=[0.25, 0.5])
+    parser.add_argument('--rescans', type=int, nargs='+', default=[10, 30])
+    parser.add_argument('--scale-factors', type=float, nargs='+', default=[1.1, 1.2, 1.3])
+    parser.add_argument('--max-recall-loss', type=float, default=0.02,
+                        help="recall the tuned settings may give up against the old detector")
+    parser.add_argument('--top', type=int, default=8, help="settings to list")
+    args = parser.parse_args(argv)
+
+    cascade = cv2.CascadeClassifier(CASCADE)
+    frames = recorded_frames(args.frames, cascade) if args.frames else synthetic_frames(args.count)
+    if not frames:
+        print(f"No frames found in {args.frames}")
+        return 1
+
+    # The old detector: full frame, full resolution, scaleFactor 1.2, every frame.
+    old = FaceTracker(cascade, MIN_SIZE, scale=1.0, rescan_every=1, scale_factor=1.2)
+    old_fps, old_recall, old_fp = evaluate(old, frames)
+    print(f"{len(frames)} frames; full-frame detector: {old_fps:.1f} fps, recall {old_recall:.1%}, "
+          f"{old_fp:.2f} false positives per frame\n")
+
+    results = []
+    for scale, padding, rescan, factor in itertools.product(args.scales, args.paddings, args.rescans,
+                                                            args.scale_factors):
+        tracker = FaceTracker(cascade, MIN_SIZE, scale=scale, padding=padding, rescan_every=rescan,
+                              scale_factor=factor)
+        fps, recall, fp = evaluate(tracker, frames)
+        full = tracker.stats["full_scans"] / tracker.stats["frames"]
+        results.append(((scale, padding, rescan, factor), fps, recall, fp, full))
+
+    eligible = [r for r in results if r[2] >= old_recall - args.max_recall_loss]
+    eligible.sort(key=lambda r: -r[1])
+    print(f"{'scale':>6}{'padding':>9}{'rescan':>8}{'factor':>8}{'fps':>9}{'speedup':>9}{'recall':>8}"
+          f"{'fp/frame':>10}{'full scans':>12}")
+    for (scale, padding, rescan, factor), fps, recall, fp, full in eligible[:args.top]:
+        print(f"{scale:>6}{padding:>9}{rescan:>8}{factor:>8}{fps:>9.1f}{fps / old_fps:>8.1f}x{recall:>8.1%}"
+              f"{fp:>10.2f}{full:>12.0%}")
+
+    if not eligible:
+        print("No setting kept the recall; try larger --scales or smaller --scale-factors.")
+        return 1
+    scale, padding, rescan, factor = eligible[0][0]
+    print(f"\nBest setting, for config.py:\nFACE_TRACKER = {{'scale': {scale}, 'padding': {padding}, "
+          f"'rescan_every': {rescan}, 'scale_factor': {factor}}}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
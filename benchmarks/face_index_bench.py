@@ -0,0 +1,194 @@
+"""Scaling benchmark for the face enrollment index (face_index.py).
+
+Enrolls synthetic identities (a smoothed random texture per identity, with
+noisy, shifted and re-lit copies as samples), then times classifying one
+frame with 1 and 4 faces as the number of identities grows, and checks
+that a held-out sample of every identity finds its own identity first
+(top-1). For comparison it times OpenCV's LBPH recognizer (one predict()
+per face) trained on the same crops, when opencv-contrib is installed.
+
+It then measures the match threshold: held-out samples of enrolled
+identities are genuine trials, samples of --strangers identities that were
+never enrolled are impostor trials. It prints the false accept rate
+(impostors matched to anyone, or genuine samples matched to the wrong
+identity) and the false reject rate at --threshold, the equal-error rate,
+and the largest threshold whose false accept rate stays within --far.
+--dataset calibrates on your own enrollment photos (Model Trainer.py's
+samples directory) instead: every identity in turn is left out of the
+index and its photos are the impostors.
+
+    python -m benchmarks.face_index_bench
+    python -m benchmarks.face_index_bench --identities 2 10 100 1000 --samples 5
+    python -m benchmarks.face_index_bench --dataset samples --far 0.001
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from face_index import MATCH_THRESHOLD, FaceIndex, describe
+
+
+def make_faces(identities, samples, seed=0, size=120, queries_each=1):
+    """Returns (enrolled crops, labels, query crops, query labels)."""
+    rng = np.random.default_rng(seed)
+    faces, labels, queries, query_labels = [], [], [], []
+    for label in range(identities):
+        base = cv2.GaussianBlur(rng.integers(0, 256, (size + 8, size + 8)).astype(np.uint8), (9, 9), 0)
+        for i in range(samples + queries_each):
+            dy, dx = rng.integers(0, 8, 2)
+            crop = base[dy:dy + size, dx:dx + size].astype(np.int16)
+            crop = crop * rng.uniform(0.8, 1.2) + rng.normal(0, 6, crop.shape)
+            crop = np.clip(crop, 0, 255).astype(np.uint8)
+            if i < samples:
+                faces.append(crop)
+                labels.append(label)
+            else:
+                queries.append(crop)
+                query_labels.append(label)
+    return faces, labels, queries, query_labels
+
+
+def read_dataset(directory):
+    """(crops, labels) from Model Trainer.py's samples: face.<id>.<n>.jpg, the face found by the cascade."""
+    detector = cv2.CascadeClassifier("haarcascade_frontalface_default.xml")
+    crops, labels = [], []
+    for name in sorted(os.listdir(directory)):
+        image = cv2.imread(os.path.join(directory, name), cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            continue
+        for (x, y, w, h) in detector.detectMultiScale(image):
+            crops.append(image[y:y + h, x:x + w])
+            labels.append(int(name.split(".")[1]))
+    return crops, np.array(labels)
+
+
+def synthetic_trials(identities, strangers, samples, queries_each):
+    """(genuine, impostor) results of index.search for synthetic identities: (own or None, label, distance) rows."""
+    faces, labels, queries, query_labels = make_faces(identities + strangers, samples, seed=1,
+                                                      queries_each=queries_each)
+    n = identities * samples
+    index = FaceIndex.build(faces[:n], labels[:n])
+    found, distances = index.search(describe(queries), k=1)
+    rows = list(zip(query_labels, found[:, 0], distances[:, 0]))
+    genuine = [row for row in rows if row[0] < identities]
+    impostor = [(None, label, distance) for own, label, distance in rows if own >= identities]
+    return genuine, impostor
+
+
+def dataset_trials(directory, samples):
+    """Genuine and impostor trials from real enrollment photos, leaving each identity out in turn."""
+    crops, labels = read_dataset(directory)
+    histograms = describe(crops)
+    genuine, impostor = [], []
+    for own in np.unique(labels):
+        mine = np.flatnonzero(labels == own)
+        others = np.flatnonzero(labels != own)
+        # The first samples of every identity are enrolled, this one's later photos are genuine trials.
+        enrolled = np.concatenate([mine[:samples], others])
+        index = FaceIndex(np.sqrt(histograms[enrolled]), labels[enrolled])
+        found, distances = index.search(histograms[mine[samples:]], k=1)
+        genuine += [(own, label, distance) for label, distance in zip(found[:, 0], distances[:, 0])]
+        # With this identity left out entirely, its photos are strangers to the index.
+        outsiders = FaceIndex(np.sqrt(histograms[others]), labels[others])
+        found, distances = outsiders.search(histograms[mine], k=1)
+        impostor += [(None, label, distance) for label, distance in zip(found[:, 0], distances[:, 0])]
+    return genuine, impostor
+
+
+def error_rates(genuine, impostor, threshold):
+    """(false accept rate, false reject rate) of classify(threshold) over the trials."""
+    false_accepts = sum(distance <= threshold for _, _, distance in impostor)
+    false_accepts += sum(distance <= threshold and label != own for own, label, distance in genuine)
+    false_rejects = sum(not (distance <= threshold and label == own) for own, label, distance in genuine)
+    return false_accepts / (len(impostor) + len(genuine)), false_rejects / len(genuine)
+
+
+def calibrate(genuine, impostor, far):
+    """(EER, its threshold, largest threshold with a false accept rate within far)."""
+    thresholds = np.unique([distance for _, _, distance in genuine + impostor])
+    rates = np.array([error_rates(genuine, impostor, t) for t in thresholds])
+    crossing = int(np.argmin(np.abs(rates[:, 0] - rates[:, 1])))
+    within = thresholds[rates[:, 0] <= far]
+    return rates[crossing].mean(), float(thresholds[crossing]), float(within.max()) if len(within) else 0.0
+
+
+def best_of(fn, repeat):
+    """Fastest of repeat runs, in ms."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--identities', type=int, nargs='+', default=[2, 10, 100, 1000])
+    parser.add_argument('--samples', type=int, default=5, help="enrolled samples per identity")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD,
+                        help="chi-square distance threshold to report the error rates at")
+    parser.add_argument('--far', type=float, default=0.01, help="false accept rate to calibrate for")
+    parser.add_argument('--strangers', type=int, default=100, help="synthetic identities never enrolled")
+    parser.add_argument('--dataset', help="calibrate on this directory of face.<id>.<n>.jpg enrollment photos")
+    parser.add_argument('--no-lbph', action='store_true', help="skip the OpenCV LBPH comparison")
+    args = parser.parse_args(argv)
+
+    if args.dataset:
+        genuine, impostor = dataset_trials(args.dataset, args.samples)
+        return report_threshold(genuine, impostor, args)
+
+    lbph = not args.no_lbph and hasattr(cv2, 'face')
+    faces, labels, queries, query_labels = make_faces(max(args.identities), args.samples)
+
+    print(f"{'ids':>6}{'samples':>9}{'build s':>9}{'1 face ms':>11}{'4 faces ms':>12}"
+          f"{'lbph 4 ms':>11}{'top-1':>8}")
+    for identities in args.identities:
+        n = identities * args.samples
+        started = time.perf_counter()
+        index = FaceIndex.build(faces[:n], labels[:n])
+        build = time.perf_counter() - started
+
+        frame = queries[:min(4, identities)]
+        one = best_of(lambda: index.classify(frame[:1], args.threshold), args.repeat)
+        four = best_of(lambda: index.classify(frame, args.threshold), args.repeat)
+
+        nearest, _ = index.search(describe(queries[:identities]), k=1)
+        correct = int((nearest[:, 0] == np.array(query_labels[:identities])).sum())
+
+        lbph_ms = "-"
+        if lbph:
+            recognizer = cv2.face.LBPHFaceRecognizer_create()
+            recognizer.train(faces[:n], np.array(labels[:n]))
+            lbph_ms = round(best_of(lambda: [recognizer.predict(f) for f in frame], max(1, args.repeat // 5)), 2)
+
+        print(f"{identities:>6}{n:>9}{build:>9.2f}{one:>11.2f}{four:>12.2f}{lbph_ms!s:>11}"
+              f"{correct / identities:>8.1%}")
+
+    genuine, impostor = synthetic_trials(min(max(args.identities), 100), args.strangers, args.samples, 5)
+    return report_threshold(genuine, impostor, args)
+
+
+def report_threshold(genuine, impostor, args):
+    if not genuine or not impostor:
+        print("Need genuine and impostor trials: at least two identities with more than --samples photos")
+        return 1
+    far, frr = error_rates(genuine, impostor, args.threshold)
+    eer, eer_at, calibrated = calibrate(genuine, impostor, args.far)
+    print(f"\n{len(genuine)} genuine and {len(impostor)} impostor trials")
+    print(f"at threshold {args.threshold}: false accepts {far:.2%}, false rejects {frr:.2%}")
+    print(f"equal-error rate {eer:.2%} at threshold {eer_at:.3f}")
+    print(f"largest threshold with false accepts within {args.far:.2%}: {calibrated:.3f} "
+          f"(false rejects {error_rates(genuine, impostor, calibrated)[1]:.2%})")
+    if args.dataset:
+        print(f"\nFor config.py:\nFACE_MATCH_THRESHOLD = {calibrated:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
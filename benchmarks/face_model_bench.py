@@ -0,0 +1,156 @@
+"""Face model load time against the number of enrolled identities, and hot reload.
+
+For each --identities count it enrolls --samples synthetic faces per
+identity and writes the model in three formats:
+
+- yaml: OpenCV's LBPH recognizer, trainer.yml as Model Trainer.py writes
+  it (only up to --yaml-identities, the text grows by about 100 KB per sample),
+- npz: the enrollment index as np.savez wrote it before,
+- fidx: the binary format of face_index.FaceIndex.save().
+
+It reports file sizes and the time to load each one: recognizer.read()
+for yaml, FaceIndex.load() for the others, the binary one both read into
+memory and memory-mapped. With mmap, pages are only read when a search
+touches them, so the time of the first match after loading is reported
+as well. The file is in the page cache after it is written, so these are
+warm-cache times; a cold start also pays for the disk reads, which
+mapping defers to the first search.
+
+Finally a face_model.ResidentModel watching the binary file is sent a
+retrained index, and the time until it serves the new one is reported.
+
+    python -m benchmarks.face_model_bench
+    python -m benchmarks.face_model_bench --identities 10 100 1000 5000 --samples 3
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from face_index import BINS, DIMENSIONS, GRID, MATCH_THRESHOLD, FaceIndex
+from face_model import ResidentModel
+
+
+def synthetic_index(identities, samples, seed=0):
+    """An index with random, properly normalized LBP grid histograms; load times do not depend on the values."""
+    rng = np.random.default_rng(seed)
+    histograms = rng.random((identities * samples, GRID * GRID, BINS), dtype=np.float32)
+    histograms /= histograms.sum(axis=2, keepdims=True)
+    labels = np.repeat(np.arange(identities, dtype=np.int32), samples)
+    names = {label: f"User {label}" for label in range(identities)}
+    return FaceIndex(np.sqrt(histograms.reshape(-1, DIMENSIONS)), labels, names)
+
+
+def save_npz(index, path):
+    """The enrollment index the way FaceIndex.save() wrote it before the binary format."""
+    ids = sorted(index.names)
+    np.savez(path, roots=index.roots, labels=index.labels, name_ids=np.array(ids, dtype=np.int32),
+             name_values=np.array([index.names[i] for i in ids], dtype=str))
+
+
+def save_yaml(identities, samples, path, seed=0):
+    """Trains the LBPH recognizer on random crops and writes its YAML model."""
+    rng = np.random.default_rng(seed)
+    faces = [rng.integers(0, 256, (64, 64), dtype=np.uint8) for _ in range(identities * samples)]
+    recognizer = cv2.face.LBPHFaceRecognizer_create()
+    recognizer.train(faces, np.repeat(np.arange(identities), samples))
+    recognizer.write(path)
+
+
+def best_of(fn, repeat):
+    """(fastest of repeat runs in ms, the last result)."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return min(times), result
+
+
+def first_match_ms(path, face):
+    """Loads the memory-mapped index and times its first search."""
+    index = FaceIndex.load(path, mmap=True)
+    started = time.perf_counter()
+    index.classify([face], MATCH_THRESHOLD)
+    return (time.perf_counter() - started) * 1000
+
+
+def reload_delay(workdir, poll):
+    """Seconds from writing a retrained index until a ResidentModel watching it serves it."""
+    path = os.path.join(workdir, "reload.fidx")
+    synthetic_index(10, 2).save(path)
+    model = ResidentModel(path, FaceIndex.load, poll=poll)
+    model.get()
+    model.start()
+    try:
+        written = time.perf_counter()
+        synthetic_index(20, 2, seed=1).save(path)
+        while model.get().identities != 20:
+            if time.perf_counter() - written > 10 * poll + 5:
+                return None
+            time.sleep(0.001)
+        return time.perf_counter() - written
+    finally:
+        model.stop()
+
+
+def megabytes(path):
+    return os.path.getsize(path) / (1024 * 1024)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--identities', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--samples', type=int, default=5, help="enrolled samples per identity")
+    parser.add_argument('--yaml-identities', type=int, default=100,
+                        help="largest identity count to also write and load as LBPH YAML")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--poll', type=float, default=0.2, help="ResidentModel poll interval for the reload test")
+    args = parser.parse_args(argv)
+
+    face = np.random.default_rng(1).integers(0, 256, (120, 120), dtype=np.uint8)
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for identities in args.identities:
+            index = synthetic_index(identities, args.samples)
+            paths = {kind: os.path.join(workdir, f"faces{identities}.{kind}") for kind in ("yaml", "npz", "fidx")}
+            index.save(paths["fidx"])
+            save_npz(index, paths["npz"])
+            row = {"identities": identities, "samples": len(index)}
+            if identities <= args.yaml_identities and hasattr(cv2, "face"):
+                save_yaml(identities, args.samples, paths["yaml"])
+                recognizer = cv2.face.LBPHFaceRecognizer_create()
+                row["yaml_mb"] = megabytes(paths["yaml"])
+                row["yaml_ms"] = best_of(lambda: recognizer.read(paths["yaml"]), args.repeat)[0]
+            row["npz_mb"] = megabytes(paths["npz"])
+            row["fidx_mb"] = megabytes(paths["fidx"])
+            row["npz_ms"] = best_of(lambda: FaceIndex.load(paths["npz"]), args.repeat)[0]
+            row["read_ms"] = best_of(lambda: FaceIndex.load(paths["fidx"], mmap=False), args.repeat)[0]
+            row["mmap_ms"] = best_of(lambda: FaceIndex.load(paths["fidx"], mmap=True), args.repeat)[0]
+            row["first_match_ms"] = first_match_ms(paths["fidx"], face)
+            rows.append(row)
+        delay = reload_delay(workdir, args.poll)
+
+    def cell(row, key, digits=1):
+        return f"{row[key]:.{digits}f}" if key in row else "-"
+
+    print(f"{'identities':>10}{'samples':>9}{'yaml MB':>9}{'npz MB':>8}{'fidx MB':>9}"
+          f"{'yaml ms':>10}{'npz ms':>9}{'read ms':>9}{'mmap ms':>9}{'1st match ms':>14}")
+    for row in rows:
+        print(f"{row['identities']:>10}{row['samples']:>9}{cell(row, 'yaml_mb'):>9}{cell(row, 'npz_mb'):>8}"
+              f"{cell(row, 'fidx_mb'):>9}{cell(row, 'yaml_ms'):>10}{cell(row, 'npz_ms', 2):>9}"
+              f"{cell(row, 'read_ms', 2):>9}{cell(row, 'mmap_ms', 2):>9}{cell(row, 'first_match_ms', 2):>14}")
+    if delay is None:
+        print("The resident model did not pick up the retrained index")
+        return 1
+    print(f"A retrained index was served {delay * 1000:.0f} ms after it was written (polling every "
+          f"{args.poll * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
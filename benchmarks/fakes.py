@@ -0,0 +1,283 @@
+"""Drop-in replacements for Friday's devices and services.
+
+Each fake mirrors the small surface of the real thing that the assistant
+uses, so the real pipeline in assistant.py runs unchanged on top of them:
+
+- WavFileAudio      the microphone (sr.Microphone) -> WAV files
+- TranscriptLookup  Google Speech Recognition -> a transcript per WAV file
+- ImageDirCamera    the webcam (cv2.VideoCapture) -> a directory of frames
+- RecordingSpeaker  pyttsx3 -> a timestamped list of spoken lines
+- ScriptedChat      the Gemini chat session -> canned replies and tool calls
+- StubHTTPServer    OpenWeather / NewsAPI -> a local JSON server
+"""
+import json
+import math
+import os
+import struct
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+import speech_recognition as sr
+
+
+def write_utterance_wav(path, seed, seconds=0.6, rate=16000):
+    """Writes a short tone burst padded with silence that sr.Recognizer.listen will pick up.
+
+    The tone frequency is derived from seed so every utterance sounds different.
+    """
+    freq = 220 + (seed % 40) * 15
+    lead = [0] * int(0.2 * rate)
+    tone = [int(9000 * math.sin(2 * math.pi * freq * i / rate)) for i in range(int(seconds * rate))]
+    tail = [0] * int(1.2 * rate)
+    samples = lead + tone + tail
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+class _PacedStream:
+    """Wraps an sr.AudioFile stream so a chunk is returned when its last sample would have been recorded."""
+
+    def __init__(self, stream, bytes_per_second):
+        self.stream = stream
+        self.bytes_per_second = bytes_per_second
+        self.started = time.perf_counter()
+        self.position = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.position += len(data)
+        delay = self.started + self.position / self.bytes_per_second - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return data
+
+
+class _RealtimeAudioFile(sr.AudioFile):
+    def __enter__(self):
+        super().__enter__()
+        self.stream = _PacedStream(self.stream, self.SAMPLE_RATE * self.SAMPLE_WIDTH)
+        return self
+
+
+class WavFileAudio:
+    """Feeds a fixed list of WAV files to takeCommand, one per call.
+
+    Call it like sr.Microphone: each call returns an sr.AudioFile for the
+    next utterance. The files are recorded in opened, in order, and the time
+    each utterance was opened is kept in opened_at.
+    Once the list is exhausted on_exhausted is called (typically to stop the
+    assistant) and the last file is replayed.
+    With realtime, listening to a file takes as long as the audio lasts,
+    like a microphone; otherwise it is read as fast as it decodes. wait, if
+    set, is called with the index of each utterance before it is opened,
+    e.g. to hold it back until the previous reply has been spoken.
+    """
+
+    def __init__(self, paths, on_exhausted=None, realtime=False, wait=None):
+        self.paths = list(paths)
+        self.on_exhausted = on_exhausted
+        self.wait = wait
+        self.audio_file = _RealtimeAudioFile if realtime else sr.AudioFile
+        self.opened = []
+        self.opened_at = []
+        self._next = 0
+
+    def __call__(self):
+        if self._next >= len(self.paths):
+            if self.on_exhausted:
+                self.on_exhausted()
+            self.opened.append(self.paths[-1])
+            return self.audio_file(self.paths[-1])
+        if self.wait:
+            self.wait(self._next)
+        path = self.paths[self._next]
+        self._next += 1
+        self.opened.append(path)
+        self.opened_at.append(time.perf_counter())
+        return self.audio_file(path)
+
+
+class TranscriptLookup:
+    """Transcribes the files WavFileAudio played, in order, from a path -> text map.
+
+    Recognition may run behind capture (see pipeline.py), so each call
+    takes the oldest utterance not transcribed yet. delay simulates the
+    round trip to the speech recognition service.
+    """
+
+    def __init__(self, audio_source, transcripts, delay=0.0):
+        self.audio_source = audio_source
+        self.transcripts = dict(transcripts)
+        self.delay = delay
+        self._next = 0
+
+    def __call__(self, recognizer, audio):
+        path = self.audio_source.opened[self._next]
+        self._next += 1
+        if self.delay:
+            time.sleep(self.delay)
+        try:
+            return self.transcripts[path]
+        except KeyError:
+            raise sr.UnknownValueError()
+
+
+class ImageDirCamera:
+    """Serves the images in a directory as webcam frames, looping forever."""
+
+    def __init__(self, directory, width=640, height=480):
+        names = sorted(n for n in os.listdir(directory)
+                       if n.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp')))
+        self.frames = [cv2.imread(os.path.join(directory, n)) for n in names]
+        self.frames = [f for f in self.frames if f is not None]
+        self.props = {3: width, 4: height}
+        self.index = 0
+
+    def isOpened(self):
+        return bool(self.frames)
+
+    def set(self, prop, value):
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0)
+
+    def read(self):
+        if not self.frames:
+            return False, None
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return True, frame.copy()
+
+    def release(self):
+        pass
+
+
+class RecordingSpeaker:
+    """Records what would have been spoken, with a perf_counter timestamp.
+
+    Playback of each line takes delay seconds, or delay(text) if it is
+    callable, unless stop() cuts it short; the perf_counter times of those
+    cuts are kept in stopped_at. finished counts the lines whose playback
+    is over.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.spoken = []
+        self.stopped_at = []
+        self.finished = 0
+        self._stop = threading.Event()
+
+    def say(self, text):
+        self._stop.clear()
+        self.spoken.append((time.perf_counter(), text))
+        delay = self.delay(text) if callable(self.delay) else self.delay
+        if delay and self._stop.wait(delay):
+            self.stopped_at.append(time.perf_counter())
+        self.finished += 1
+
+    def stop(self):
+        self._stop.set()
+
+
+def _text_response(text):
+    return SimpleNamespace(parts=[SimpleNamespace(text=text, function_call=None)], text=text)
+
+
+def _call_response(name, args):
+    call = SimpleNamespace(name=name, args=dict(args))
+    return SimpleNamespace(parts=[SimpleNamespace(text="", function_call=call)])
+
+
+class ScriptedChat:
+    """A stand-in for the Gemini ChatSession with canned, delayed replies.
+
+    script maps a query to either a reply string or a (function_name, args)
+    tuple. For function calls the chat then expects the handler result back
+    and answers with it verbatim, like a model summarising a tool result.
+    Unknown queries get default_reply. Every message sleeps for latency,
+    seconds or a zero-argument callable returning them (for jittery models).
+    """
+
+    def __init__(self, script=None, latency=0.0, default_reply="I am not sure about that."):
+        self.script = dict(script or {})
+        self.latency = latency
+        self.default_reply = default_reply
+        self.history = []
+
+    def send_message(self, content, **kwargs):
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+        self.history.append(content)
+
+        if isinstance(content, list):
+            results = [part["function_response"]["response"]["result"] for part in content]
+            return _text_response(" ".join(str(r) for r in results))
+
+        reply = self.script.get(content, self.default_reply)
+        if isinstance(reply, tuple):
+            return _call_response(*reply)
+        return _text_response(reply)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        time.sleep(self.server.latency)
+
+        if url.path == '/weather':
+            body = {
+                "weather": [{"description": "clear sky"}],
+                "main": {"temp": 27.5, "humidity": 40},
+                "name": params.get('q', ''),
+            }
+        elif url.path == '/news':
+            count = int(params.get('pageSize', 3))
+            body = {"articles": [{"title": f"Stub headline {i + 1}"} for i in range(count)]}
+        else:
+            self.send_error(404)
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubHTTPServer:
+    """Serves fake OpenWeather (/weather) and NewsAPI (/news) responses on localhost."""
+
+    def __init__(self, latency=0.0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        self.httpd.latency = latency
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
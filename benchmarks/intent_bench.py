@@ -0,0 +1,158 @@
+"""Accuracy and speed benchmark for the offline intent classifier (intents.py).
+
+The queries below are held out: none of them is in intents.CORPUS. Tool
+queries carry the handler and arguments Gemini would have chosen; open
+queries (expected None) should still go to Gemini. Reports:
+
+- coverage: tool queries answered without Gemini,
+- precision: of those, how many picked the right handler and arguments,
+- open queries wrongly kept local,
+- whether the handlers picked for ANSWERED_QUERIES give the right answer,
+- training time and time per prediction.
+
+    python -m benchmarks.intent_bench
+    python -m benchmarks.intent_bench --verbose
+"""
+import argparse
+import sys
+import time
+
+from benchmarks import bench_config
+
+sys.modules['config'] = bench_config
+
+import intents
+
+TOOL_QUERIES = [
+    ("what's the weather like in bangalore", "handle_weather", {"city": "bangalore"}),
+    ("how is the weather in paris", "handle_weather", {"city": "paris"}),
+    ("tell me the temperature in chennai", "handle_weather", {"city": "chennai"}),
+    ("show me the sports news", "handle_news", {"category": "sports"}),
+    ("what are today's headlines", "handle_news", {}),
+    ("any technology news", "handle_news", {"category": "technology"}),
+    ("remember that my car is parked on level two", "handle_remember", {"text_to_remember": "my car is parked on level two"}),
+    ("please remember the wifi password is sunshine", "handle_remember", {"text_to_remember": "the wifi password is sunshine"}),
+    ("what did i tell you to remember", "handle_recall", {}),
+    ("do you remember what i said", "handle_recall", {}),
+    ("translate where is the station to french", "handle_translate", {"text": "where is the station", "target_language": "french"}),
+    ("how do you say good night in japanese", "handle_translate", {"text": "good night", "target_language": "japanese"}),
+    ("turn the volume down", "handle_volume", {"direction": "down"}),
+    ("please make it a bit louder", "handle_volume", {"direction": "up"}),
+    ("mute the volume", "handle_volume", {"direction": "mute"}),
+    ("how much battery do i have left", "handle_battery", {}),
+    ("what's my battery level", "handle_battery", {}),
+    ("take a screenshot of my screen", "handle_screenshot", {}),
+    ("check the internet speed", "handle_internet_speed", {}),
+    ("how fast is my connection", "handle_internet_speed", {}),
+    ("tell me a funny joke", "handle_joke", {}),
+    ("play some songs", "handle_play_music", {}),
+    ("play arijit singh songs on youtube", "handle_youtube", {"search_query": "arijit singh songs"}),
+    ("search youtube for cooking videos", "handle_youtube", {"search_query": "cooking videos"}),
+    ("search google for cheap flights to goa", "handle_google", {"search_query": "cheap flights to goa"}),
+    ("look up the nearest pharmacy", "handle_google", {"search_query": "the nearest pharmacy"}),
+    ("open instagram website", "handle_open_web", {"site_name": "instagram"}),
+    ("go to facebook", "handle_open_web", {"site_name": "facebook"}),
+    ("launch notepad", "handle_open_app", {"app_name": "notepad"}),
+    ("open vs code", "handle_open_app", {"app_name": "vs code"}),
+    ("switch on the camera", "handle_open_camera", {}),
+    ("what's the time right now", "handle_time", {}),
+    ("convert 3 liters to gallons", "handle_convert", {"conversion_query": "3 liters to gallons"}),
+    ("how do i change a flat tyre", "handle_wikihow", {"task": "change a flat tyre"}),
+    ("teach me how to make pasta", "handle_wikihow", {"task": "make pasta"}),
+    ("read the pdf chemistry notes", "handle_read_pdf", {"pdf_name": "chemistry notes"}),
+    ("what does wikipedia say about alan turing", "handle_wikipedia", {"topic": "alan turing"}),
+    ("go to sleep now", "handle_sleep", {}),
+]
+
+OPEN_QUERIES = [
+    "tell me something interesting about black holes",
+    "who invented the telephone",
+    "what is the population of japan",
+    "can you help me write an email to my boss",
+    "what's your name",
+    "explain how vaccines work",
+    "give me three ideas for a birthday party",
+    "why do cats purr",
+    "what is the difference between a virus and bacteria",
+    "recommend a good book",
+    "how far is the moon",
+    "what is photosynthesis",
+    "who is the prime minister of india",
+    "compose a haiku about autumn",
+    "i am feeling bored",
+    "sleep well",
+    "goodbye for now and thanks",
+    "how fast is a cheetah",
+    "what is the time in london",
+    "remember to check the weather in delhi",
+    "how many students are in a class",
+]
+
+# Queries whose answer is checked too: the handler the classifier picks
+# runs, and its reply has to contain the expected text.
+ANSWERED_QUERIES = [
+    ("how many feet in a mile", "5280"),
+    ("how many centimeters in an inch", "2.54"),
+    ("how many seconds in an hour", "3600"),
+    ("convert 3 liters to gallons", "0.79"),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--verbose', action='store_true', help="print every query and its prediction")
+    args = parser.parse_args(argv)
+
+    import assistant
+    bot = assistant.Assistant(verify=False, connect_llm=False)
+    tools = bot.tools
+
+    train_ms = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        classifier = intents.IntentClassifier(tools=tools)
+        train_ms.append((time.perf_counter() - started) * 1000)
+
+    handled = correct = 0
+    for query, name, expected_args in TOOL_QUERIES:
+        intent = classifier.predict(query)
+        ok = intent is not None and intent.name == name and intent.args == expected_args
+        handled += intent is not None
+        correct += ok
+        if args.verbose or (intent is not None and not ok):
+            print(f"{'ok ' if ok else 'BAD' if intent else '-> '} {query!r}: {intent} (expected {name} {expected_args})")
+
+    leaked = [(q, classifier.predict(q)) for q in OPEN_QUERIES]
+    leaked = [(q, intent) for q, intent in leaked if intent is not None]
+    for query, intent in leaked:
+        print(f"BAD {query!r} kept local as {intent}")
+
+    answered = 0
+    for query, expected in ANSWERED_QUERIES:
+        intent = classifier.predict(query)
+        reply = getattr(bot, intent.name)(**intent.args) if intent else None
+        ok = reply is not None and expected in reply
+        answered += ok
+        if args.verbose or not ok:
+            print(f"{'ok ' if ok else 'BAD'} {query!r}: {intent} answered {reply!r} (expected {expected!r})")
+
+    queries = [q for q, _, _ in TOOL_QUERIES] + OPEN_QUERIES
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for query in queries:
+            classifier.predict(query)
+    predict_ms = (time.perf_counter() - started) * 1000 / (args.repeat * len(queries))
+
+    n = len(TOOL_QUERIES)
+    print(f"tool queries answered without Gemini  {handled}/{n} ({handled / n:.0%})")
+    print(f"right handler and arguments           {correct}/{handled} ({correct / max(handled, 1):.0%})")
+    print(f"open queries kept local               {len(leaked)}/{len(OPEN_QUERIES)}")
+    print(f"handler answers right                 {answered}/{len(ANSWERED_QUERIES)}")
+    print(f"training                              {min(train_ms):.1f} ms (first {train_ms[0]:.1f} ms)")
+    print(f"prediction                            {predict_ms:.3f} ms per query")
+    return 1 if correct < handled or leaked or answered < len(ANSWERED_QUERIES) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
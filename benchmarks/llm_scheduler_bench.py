@@ -0,0 +1,157 @@
+"""Gemini quota benchmark: direct calls against llm_scheduler.LLMScheduler.
+
+A stub server enforces a rolling-window quota like Gemini's and answers
+HTTP 429 above it. The workload is a burst of calls at the start plus
+queries arriving over the run. The minute is scaled down so a run takes
+seconds: --rpm requests per --window seconds. --server-rpm below --rpm
+simulates a scheduler configured above the real quota, to exercise 429
+backoff.
+
+- direct: every caller sends straight away, as ask_gemini did,
+- scheduled: every call goes through the scheduler.
+
+Reported: requests sent to the server, 429s received, calls that failed,
+latency (p50/p95), the highest request count seen in any window against
+the quota, and the scheduler's metrics().
+
+    python -m benchmarks.llm_scheduler_bench
+    python -m benchmarks.llm_scheduler_bench --rpm 20 --queries 20
+    python -m benchmarks.llm_scheduler_bench --server-rpm 6
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_scheduler import LLMScheduler, QuotaExceeded
+
+
+class RateLimited(Exception):
+    code = 429
+
+
+class QuotaServer:
+    """Answers after `latency` seconds; more than `limit` requests in `window` seconds get a 429."""
+
+    def __init__(self, limit, window, latency):
+        self.limit = limit
+        self.window = window
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.accepted = []
+        self.requests = 0
+        self.rejected = 0
+
+    def ask(self, prompt):
+        with self.lock:
+            now = time.perf_counter()
+            self.requests += 1
+            while self.recent and now - self.recent[0] >= self.window:
+                self.recent.popleft()
+            if len(self.recent) >= self.limit:
+                self.rejected += 1
+                raise RateLimited(prompt)
+            self.recent.append(now)
+            self.accepted.append(now)
+        time.sleep(self.latency)
+        return f"answer to {prompt}"
+
+    def peak(self):
+        """Most accepted requests in any window; the quota held if this is <= limit."""
+        times = self.accepted
+        return max((sum(1 for t in times[i:] if t - start < self.window) for i, start in enumerate(times)),
+                   default=0)
+
+
+def workload(queries, burst, spread, seed=0):
+    """(delay, prompt) pairs: burst calls at the start, then queries spread over the run."""
+    rng = random.Random(seed)
+    jobs = [(0.0, f"burst {i}") for i in range(burst)]
+    jobs += [(rng.uniform(0, spread), f"question {i}") for i in range(queries)]
+    return sorted(jobs, key=lambda job: job[0])
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run(mode, jobs, args):
+    server = QuotaServer(args.server_rpm or args.rpm, args.window, args.latency)
+    scheduler = None
+    if mode != "direct":
+        # rpm per window, scaled to the per-minute rate the scheduler expects.
+        scheduler = LLMScheduler(args.rpm * 60 / args.window, max_wait=args.max_wait, backoff=args.window / 10)
+
+    def call(prompt):
+        if scheduler is None:
+            return server.ask(prompt)
+        return scheduler.call(lambda: server.ask(prompt))
+
+    latencies = []
+    failures = 0
+    started = time.perf_counter()
+
+    def client(delay, prompt):
+        nonlocal failures
+        time.sleep(max(0.0, started + delay - time.perf_counter()))
+        sent = time.perf_counter()
+        try:
+            call(prompt)
+        except (RateLimited, QuotaExceeded):
+            failures += 1
+            return
+        latencies.append(time.perf_counter() - sent)
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        for job in jobs:
+            pool.submit(client, *job)
+
+    metrics = scheduler.metrics() if scheduler else {}
+    if scheduler:
+        scheduler.close()
+    return {
+        "sent": server.requests,
+        "429s": server.rejected,
+        "failed": failures,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "peak": server.peak(),
+        "seconds": time.perf_counter() - started,
+        "metrics": metrics,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rpm', type=int, default=10, help="quota: requests per window")
+    parser.add_argument('--server-rpm', type=int, help="quota the server enforces, default --rpm")
+    parser.add_argument('--window', type=float, default=1.0, help="seconds standing in for a minute")
+    parser.add_argument('--latency', type=float, default=0.1, help="server response time in seconds")
+    parser.add_argument('--queries', type=int, default=16)
+    parser.add_argument('--burst', type=int, default=20, help="calls made at the start")
+    parser.add_argument('--spread', type=float, default=2.0, help="queries arrive over this many seconds")
+    parser.add_argument('--max-wait', type=float, default=3.0)
+    parser.add_argument('--verbose', action='store_true', help="print the scheduler metrics")
+    args = parser.parse_args(argv)
+
+    jobs = workload(args.queries, args.burst, args.spread)
+    print(f"{len(jobs)} calls, quota {args.server_rpm or args.rpm} per {args.window:g} s, scheduler at {args.rpm}")
+    print(f"{'mode':<11}{'sent':>6}{'429s':>6}{'failed':>8}{'p50':>8}{'p95':>8}{'peak':>6}{'seconds':>9}")
+    for mode in ("direct", "scheduled"):
+        r = run(mode, jobs, args)
+        print(f"{mode:<11}{r['sent']:>6}{r['429s']:>6}{r['failed']:>8}{r['p50']:>8.2f}{r['p95']:>8.2f}"
+              f"{r['peak']:>6}{r['seconds']:>9.2f}")
+        if args.verbose and r["metrics"]:
+            print(f"  {r['metrics']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
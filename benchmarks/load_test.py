@@ -0,0 +1,132 @@
+"""Load test for the multi-session server in server.py.
+
+Starts a SessionServer in-process whose sessions talk to the scripted fake
+chat and the stub weather/news server, then opens a growing number of
+concurrent sessions, each with its own connection sending a mix of local,
+chat and tool commands back to back.
+
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --levels 1 8 64 256 --p99-target 800
+
+For every concurrency level it reports throughput and p50/p99 latency.
+Sessions per core is the highest level whose p99 stays within
+--p99-target, divided by the number of CPU cores.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import bench_config
+
+sys.modules['config'] = bench_config
+
+from benchmarks.fakes import ScriptedChat, StubHTTPServer
+from benchmarks.run_pipeline import percentile
+
+COMMANDS = [
+    "friday time",
+    "friday tell me something about mars",
+    "friday what's the weather in pune",
+    "friday remember that the meeting is at five",
+    "friday battery",
+]
+
+SCRIPT = {
+    "friday tell me something about mars": "Mars is the fourth planet from the Sun.",
+    "friday what's the weather in pune": ("handle_weather", {"city": "Pune"}),
+    "friday remember that the meeting is at five": ("handle_remember", {"text_to_remember": "the meeting is at five"}),
+}
+
+
+async def run_session(host, port, session_id, rounds, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(rounds):
+            request = {"session": session_id, "id": i, "text": COMMANDS[i % len(COMMANDS)]}
+            started = time.perf_counter()
+            writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            latencies.append((time.perf_counter() - started) * 1000)
+            if reply.get("error"):
+                errors.append(reply["error"])
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, sessions, rounds, level):
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(run_session(host, port, f"level{level}-user{i}", rounds, latencies, errors)
+                           for i in range(sessions)))
+    elapsed = time.perf_counter() - started
+    return {
+        "sessions": sessions,
+        "requests": len(latencies),
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "errors": len(errors),
+    }
+
+
+async def run(args, workdir):
+    import assistant
+    from daemon import SilentSpeaker
+    from server import SessionServer
+
+    assistant.set_speaker(SilentSpeaker())
+
+    def bot_factory(session_id):
+        return assistant.Assistant(chat=ScriptedChat(SCRIPT, latency=args.llm_latency), verify=False,
+                                   memory_path=os.path.join(workdir, f"{session_id}.txt"))
+
+    server = SessionServer(bot_factory=bot_factory, workers=args.workers)
+    listener = await server.start('127.0.0.1', 0)
+    host, port = listener.sockets[0].getsockname()[:2]
+
+    results = []
+    async with listener:
+        for level, sessions in enumerate(args.levels):
+            with contextlib.redirect_stdout(io.StringIO()):
+                results.append(await run_level(host, port, sessions, args.rounds, level))
+    return results, server.stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 4, 16, 64, 128],
+                        help="concurrent sessions to try")
+    parser.add_argument('--rounds', type=int, default=10, help="commands per session")
+    parser.add_argument('--workers', type=int, help="server handler threads (default: 4 per core)")
+    parser.add_argument('--llm-latency', type=float, default=0.1, help="fake Gemini delay per message, seconds")
+    parser.add_argument('--http-latency', type=float, default=0.02, help="stub weather API delay, seconds")
+    parser.add_argument('--p99-target', type=float, default=500, help="tail latency budget, ms")
+    args = parser.parse_args(argv)
+
+    with StubHTTPServer(latency=args.http_latency) as stub, tempfile.TemporaryDirectory() as workdir:
+        bench_config.WEATHER_API_URL = stub.base_url + "/weather"
+        bench_config.NEWS_API_URL = stub.base_url + "/news"
+        results, stats = asyncio.run(run(args, workdir))
+
+    print(f"{'sessions':>9}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for r in results:
+        print(f"{r['sessions']:>9}{r['requests']:>10}{r['req_per_s']:>9}{r['p50_ms']:>9}{r['p99_ms']:>9}{r['errors']:>8}")
+
+    cores = os.cpu_count() or 1
+    within = [r["sessions"] for r in results if r["p99_ms"] <= args.p99_target and not r["errors"]]
+    best = max(within, default=0)
+    print(f"\n{best} concurrent sessions within p99 {args.p99_target:.0f} ms on {cores} cores "
+          f"= {best / cores:.1f} sessions per core")
+    print(f"server stats: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
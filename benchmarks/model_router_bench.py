@@ -0,0 +1,122 @@
+"""Model routing benchmark: everything on the pro model against model_router.ModelRouter.
+
+Three scripted models stand in for the Gemini tiers, each with its own
+latency and an occasional slow reply (--tail of them take --tail-factor
+times longer). A session of simple, medium and complex queries is asked
+one after the other, --repeat times, in three modes:
+
+- pro: every query on the slowest tier, as before,
+- routed: ModelRouter picks the tier, no hedging,
+- hedged: ModelRouter with hedged requests after --budget seconds.
+
+Reported per mode: p50/p95/max latency, the share of queries answered by
+the pro tier, extra requests spent on hedges, and with --verbose the
+router's per-tier stats().
+
+    python -m benchmarks.model_router_bench
+    python -m benchmarks.model_router_bench --budget 0.3 --tail 0.2 --verbose
+"""
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.fakes import ScriptedChat
+from model_router import ModelRouter
+
+SIMPLE = [
+    "tell me something about mars",
+    "who wrote hamlet",
+    "what is the capital of peru",
+    "how tall is mount everest",
+    "say something nice",
+    "who is the president of france",
+    "how many legs does a spider have",
+    "what does dna stand for",
+    "give me a fun fact",
+    "what year did the titanic sink",
+]
+MEDIUM = [
+    "what are some good places to visit in japan during the spring season",
+    "can you suggest a healthy breakfast that takes less than ten minutes",
+    "what should i keep in mind when buying a second hand laptop",
+    "recommend a few science fiction books for someone who liked dune",
+]
+COMPLEX = [
+    "explain how a transformer neural network works",
+    "compare python and rust for writing a web server",
+    "why is the sky blue",
+    "write a short poem about the monsoon",
+    "plan a three day trip to goa on a budget",
+    "what is the difference between a virus and a bacterium",
+]
+# (tier, median seconds), fastest first.
+TIERS = [("flash-lite", 0.05), ("flash", 0.15), ("pro", 0.45)]
+
+
+def jittery(median, tail, factor, rng):
+    """Latency around median; a `tail` fraction of replies is `factor` times slower."""
+    def latency():
+        slow = factor if rng.random() < tail else 1.0
+        return median * slow * rng.uniform(0.8, 1.2)
+    return latency
+
+
+def make_tiers(args, seed):
+    rng = random.Random(seed)
+    return [(name, ScriptedChat(latency=jittery(median, args.tail, args.tail_factor, rng),
+                                default_reply=f"answer from {name}"))
+            for name, median in TIERS]
+
+
+def run(mode, args):
+    tiers = make_tiers(args, seed=1)
+    if mode == "pro":
+        tiers = tiers[-1:]
+    router = ModelRouter(tiers, budget=args.budget, hedge=(mode == "hedged"))
+    queries = (SIMPLE + MEDIUM + COMPLEX) * args.repeat
+    random.Random(0).shuffle(queries)
+
+    latencies, by_pro = [], 0
+    for query in queries:
+        started = time.perf_counter()
+        tier, _, _ = router.send(query)
+        latencies.append(time.perf_counter() - started)
+        by_pro += tier == "pro"
+    stats = router.stats()
+    router.close()
+
+    latencies.sort()
+    requests = sum(s["requests"] for s in stats.values())
+    return {
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000,
+        "max": latencies[-1] * 1000,
+        "pro share": by_pro / len(queries),
+        "extra requests": requests - len(queries),
+        "stats": stats,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget', type=float, default=0.6, help="seconds before a hedged request")
+    parser.add_argument('--tail', type=float, default=0.1, help="fraction of slow replies")
+    parser.add_argument('--tail-factor', type=float, default=4.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--verbose', action='store_true', help="print per-tier stats")
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<9}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'pro share':>11}{'extra reqs':>12}")
+    for mode in ("pro", "routed", "hedged"):
+        r = run(mode, args)
+        print(f"{mode:<9}{r['p50']:>9.1f}{r['p95']:>9.1f}{r['max']:>9.1f}{r['pro share']:>11.0%}"
+              f"{r['extra requests']:>12}")
+        if args.verbose:
+            for tier, stats in r["stats"].items():
+                print(f"  {tier:<11}{stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Multi-intent benchmark: a query with several commands, answered one after the other or all at once.
+
+Each query below holds two to four commands that can run locally. For
+each one the splitter (splitter.py) finds the commands, and the benchmark
+times:
+
+- serial: their handlers run one after the other, the sum of their
+  latencies, like a Gemini turn that calls the tools in sequence,
+- parallel: Assistant.route(), which runs them at the same time and joins
+  the replies,
+- slowest: the slowest command on its own, the best parallel can do.
+
+The queries in SINGLE_QUERIES hold one command whose free text contains
+words that start others; the benchmark fails if any of them is split.
+
+Weather and news requests go to the stub HTTP server with --http-latency
+and are not cached, so the handlers wait on the network as they would.
+
+    python -m benchmarks.multi_intent_bench
+    python -m benchmarks.multi_intent_bench --http-latency 0.5 --repeat 10 --verbose
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+from benchmarks import bench_config
+
+sys.modules['config'] = bench_config
+
+from benchmarks.fakes import StubHTTPServer
+
+MULTI_QUERIES = [
+    "friday what's the time, the weather in mumbai and my battery",
+    "friday give me the business news and the weather in pune",
+    "friday what's the weather in delhi, the sports news and the time",
+    "friday check the battery then the weather in kolkata",
+    "friday the weather in chennai, the weather in jaipur, the health news and the time",
+]
+
+SINGLE_QUERIES = [
+    "friday remember to take the battery",
+    "friday how do i check my battery",
+    "friday remember that i need bread and milk",
+    "friday search for pizza and tell me the time",
+]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--http-latency', type=float, default=0.2, help="stub weather/news API delay, seconds")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--verbose', action='store_true', help="print the commands found and the merged reply")
+    args = parser.parse_args(argv)
+
+    bench_config.API_CACHE_SECONDS = 0
+    import assistant
+    import splitter
+
+    rows = []
+    with StubHTTPServer(latency=args.http_latency) as stub:
+        bench_config.WEATHER_API_URL = assistant.WEATHER_API_URL = stub.base_url + "/weather"
+        bench_config.NEWS_API_URL = assistant.NEWS_API_URL = stub.base_url + "/news"
+        bot = assistant.Assistant(verify=False, connect_llm=False)
+        for query in MULTI_QUERIES:
+            clean_query = query.replace("friday", "").strip()
+            plans = splitter.split(clean_query, bot.plan)
+            serial, parallel, slowest = [], [], []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(args.repeat):
+                    parts = [timed(plan.action)[0] for plan in plans]
+                    serial.append(sum(parts))
+                    slowest.append(max(parts))
+                    elapsed, result = timed(lambda: bot.route(query))
+                    parallel.append(elapsed)
+            rows.append((query, plans, statistics.median(serial), statistics.median(parallel),
+                         statistics.median(slowest)))
+            if args.verbose:
+                print(f"{query}\n  {[plan.trigger for plan in plans]} -> {result['response']}")
+
+        split_wrongly = []
+        for query in SINGLE_QUERIES:
+            plans = splitter.split(query.replace("friday", "").strip(), bot.plan)
+            if len(plans) > 1:
+                split_wrongly.append(query)
+                print(f"BAD {query!r} split into {[plan.trigger for plan in plans]}")
+
+    print(f"{'query':<58}{'parts':>6}{'serial ms':>11}{'parallel ms':>13}{'slowest ms':>12}{'speedup':>9}")
+    for query, plans, serial, parallel, slowest in rows:
+        print(f"{query[7:64]:<58}{len(plans):>6}{serial:>11.1f}{parallel:>13.1f}{slowest:>12.1f}"
+              f"{serial / parallel:>8.1f}x")
+    print(f"single commands split: {len(split_wrongly)}/{len(SINGLE_QUERIES)}")
+    return 0 if all(len(plans) > 1 for _, plans, _, _, _ in rows) and not split_wrongly else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
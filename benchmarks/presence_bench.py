@@ -0,0 +1,132 @@
+"""CPU cost and reaction time of the background presence check.
+
+Runs presence.PresenceMonitor on its thread, in real time, against a fake
+camera that follows a timeline: the user sits still in front of it (with
+sensor noise) for --still seconds, leaves for --away seconds and comes back
+for --back seconds. The face is the drawn one from face_detect_bench.py and
+the matcher verifies any face, so only the sampling policy is measured:
+
+- every-frame: the full cascade and matcher on every frame at 15 fps, what
+  re-running detect() in a loop would cost,
+- gated: --fps samples a second, the cascade only when something moved or
+  every --recheck seconds,
+- budgeted: the same, also held to --cpu-budget of one core.
+
+For each it reports the CPU time of the monitor thread as a share of one
+core, the cascade runs, and how long after leaving and coming back
+`present` flipped. Leaving counts from the last sample that saw the
+user, so it takes up to --absent-after.
+
+    python -m benchmarks.presence_bench
+    python -m benchmarks.presence_bench --still 20 --away 5 --back 5 --fps 1
+"""
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.face_detect_bench import CASCADE, HEIGHT, WIDTH, draw_face
+from presence import PresenceMonitor
+
+
+class TimelineCamera:
+    """A cv2.VideoCapture stand-in whose picture follows the wall clock.
+
+    The user is in the picture before `leave` and after `back` seconds from
+    `started`; read() returns one of a few pre-rendered noisy frames of the
+    current state, so the camera itself costs next to nothing.
+    """
+
+    def __init__(self, started, leave, back, seed=0):
+        self.started = started
+        self.leave = leave
+        self.back = back
+        rng = np.random.default_rng(seed)
+        background = cv2.GaussianBlur(rng.integers(40, 140, (HEIGHT, WIDTH)).astype(np.uint8), (0, 0), 3)
+        with_face = background.copy()
+        draw_face(with_face, 250, 150, 150)
+        self.frames = {}
+        for present, picture in ((True, with_face), (False, background)):
+            picture = cv2.GaussianBlur(picture, (0, 0), 1.2)
+            self.frames[present] = [np.clip(picture + rng.normal(0, 4, picture.shape), 0, 255).astype(np.uint8)
+                                    for _ in range(4)]
+        self.reads = 0
+
+    def read(self):
+        elapsed = time.monotonic() - self.started
+        present = not self.leave <= elapsed < self.back
+        self.reads += 1
+        return True, self.frames[present][self.reads % 4]
+
+    def release(self):
+        pass
+
+
+def verify_any(crops):
+    return [(True, "user", "") for _ in crops]
+
+
+def run(name, args, options):
+    """Runs one monitor over the timeline; returns its result row."""
+    cascade = cv2.CascadeClassifier(CASCADE)
+    changes = []
+    started = time.monotonic()
+    leave, back = args.still, args.still + args.away
+    camera = TimelineCamera(started, leave, back)
+    monitor = PresenceMonitor(lambda: camera, verify_any, cascade, absent_after=args.absent_after,
+                              on_change=lambda present: changes.append((time.monotonic() - started, present)),
+                              **options)
+    monitor.start()
+    time.sleep(back + args.back)
+    monitor.stop()
+    wall = time.monotonic() - started
+
+    left = next((at - leave for at, present in changes if not present and at >= leave), None)
+    returned = next((at - back for at, present in changes if present and at >= back), None)
+    stats = monitor.stats
+    return (name, stats["samples"], stats["checks"], stats["cpu_seconds"] / wall,
+            stats["cpu_seconds"] * 1000 / max(stats["samples"], 1), left, returned)
+
+
+def seconds(value):
+    return "missed" if value is None else f"{value:.2f}s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--still', type=float, default=10.0, help="seconds the user sits still at first")
+    parser.add_argument('--away', type=float, default=5.0, help="seconds the user is away")
+    parser.add_argument('--back', type=float, default=3.0, help="seconds after the user comes back")
+    parser.add_argument('--fps', type=float, default=2.0, help="samples a second of the gated monitors")
+    parser.add_argument('--recheck', type=float, default=30.0, help="seconds between cascade runs without motion")
+    parser.add_argument('--absent-after', type=float, default=2.0,
+                        help="seconds without a verified face before the user counts as gone")
+    parser.add_argument('--cpu-budget', type=float, default=0.02, help="share of one core for the budgeted monitor")
+    args = parser.parse_args(argv)
+
+    if cv2.CascadeClassifier(CASCADE).empty():
+        print(f"Cannot load the cascade {CASCADE}")
+        return 1
+
+    configurations = [
+        ("every-frame", {"fps": 15.0, "recheck": 0.0, "cpu_budget": None}),
+        ("gated", {"fps": args.fps, "recheck": args.recheck, "cpu_budget": None}),
+        ("budgeted", {"fps": args.fps, "recheck": args.recheck, "cpu_budget": args.cpu_budget}),
+    ]
+    total = args.still + args.away + args.back
+    print(f"{total:.0f}s timeline per monitor: still {args.still:.0f}s, away {args.away:.0f}s, "
+          f"back {args.back:.0f}s; absent after {args.absent_after:.0f}s without a face")
+    # One after the other, so that they do not compete for the CPU.
+    results = [run(name, args, options) for name, options in configurations]
+
+    print(f"{'monitor':<13}{'samples':>8}{'cascade':>9}{'CPU':>8}{'ms/sample':>11}{'left':>9}{'back':>9}")
+    for name, samples, checks, cpu, per_sample, left, returned in results:
+        print(f"{name:<13}{samples:>8}{checks:>9}{cpu:>8.2%}{per_sample:>11.2f}{seconds(left):>9}"
+              f"{seconds(returned):>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
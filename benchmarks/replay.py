@@ -0,0 +1,156 @@
+"""Replays a flight recorder dump through the benchmark harness.
+
+Every interaction in the dump (flight_recorder.py) becomes one utterance
+for the real Assistant running on the fakes in fakes.py: the recorded
+audio if the dump has it (FLIGHT_RECORDER_AUDIO), else a synthetic one,
+transcribed to the recorded transcript. The scripted Gemini chat gives the
+recorded answers, or asks for the first recorded tool call, so Gemini-routed
+commands take the path they took when recorded.
+
+For each interaction it prints what was recorded and what happens now:
+route and trigger, tools called, status (ok, error, interrupted) and
+dispatch time. A command that failed when recorded is either "reproduced"
+or "fixed" now; the run fails (exit code 1) when one that worked takes a
+different route or calls different tools than it did, or now fails. So a
+dump from a bug report can be replayed before and after the fix. Replies
+that depend on the moment (the time, the battery) naturally differ and
+only show with --verbose.
+
+    python -m benchmarks.replay flight_records/friday-20261019-101500-000000.jsonl.gz
+    python -m benchmarks.replay dump.jsonl.gz --sequential --verbose
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+from benchmarks import bench_config
+
+sys.modules['config'] = bench_config
+
+from benchmarks.fakes import (RecordingSpeaker, ScriptedChat, StubHTTPServer, TranscriptLookup, WavFileAudio,
+                              write_utterance_wav)
+from benchmarks.run_pipeline import take_turns
+import flight_recorder
+
+
+def build_script(entries):
+    """Scripted Gemini replies: the first recorded tool call, else the recorded answer."""
+    script = {}
+    for entry in entries:
+        if entry["route"] != "gemini":
+            continue
+        if entry["tools"]:
+            script[entry["transcript"]] = (entry["tools"][0]["name"], entry["tools"][0]["args"])
+        elif entry["response"] is not None:
+            script[entry["transcript"]] = entry["response"]
+    return script
+
+
+def replay(entries, args, workdir):
+    """Runs the recorded transcripts through a fresh Assistant; returns its flight recorder entries."""
+    import assistant
+
+    commands = [entry["transcript"] for entry in entries]
+    if not commands or "sleep" not in commands[-1]:
+        commands.append("friday sleep")
+    paths, transcripts = [], {}
+    for i, command in enumerate(commands):
+        path = os.path.join(workdir, f"replay_{i}.wav")
+        audio = entries[i].get("audio") if i < len(entries) else None
+        if audio:
+            with open(path, 'wb') as f:
+                f.write(audio)
+        else:
+            write_utterance_wav(path, seed=i)
+        paths.append(path)
+        transcripts[path] = command
+
+    answered = ["friday" in command for command in commands]
+    speaker = RecordingSpeaker()
+    audio = WavFileAudio(paths, wait=take_turns(speaker, answered))
+    assistant.set_speaker(speaker)
+    bot = assistant.Assistant(
+        audio_source=audio,
+        transcriber=TranscriptLookup(audio, transcripts, delay=args.stt_latency),
+        chat=ScriptedChat(build_script(entries), latency=args.llm_latency),
+        verify=False,
+        pipelined=not args.sequential,
+    )
+    audio.on_exhausted = bot.stop
+    out = sys.stdout if args.verbose else io.StringIO()
+    with contextlib.redirect_stdout(out):
+        bot.run()
+    return list(bot.recorder.entries)
+
+
+def summary(entry):
+    if entry is None:
+        return "(not replayed)"
+    tools = ",".join(tool["name"] for tool in entry["tools"]) or "-"
+    return f"{entry['route']}/{entry['trigger'] or '-'} tools={tools} {entry['status']}"
+
+
+def verdict(recorded, replayed):
+    """same or changed path; for a command that failed when recorded, reproduced or fixed."""
+    if recorded["status"] == "error":
+        return "reproduced" if replayed is None or replayed["status"] == "error" else "fixed"
+    same = (replayed is not None and replayed["status"] != "error" and recorded["route"] == replayed["route"]
+            and recorded["trigger"] == replayed["trigger"]
+            and [t["name"] for t in recorded["tools"]] == [t["name"] for t in replayed["tools"]])
+    return "same" if same else "changed"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('dump', help="a flight recorder dump (.jsonl.gz)")
+    parser.add_argument('--stt-latency', type=float, default=0.0, help="fake speech recognition delay, seconds")
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="fake Gemini delay per message, seconds")
+    parser.add_argument('--http-latency', type=float, default=0.0, help="stub weather/news API delay, seconds")
+    parser.add_argument('--sequential', action='store_true',
+                        help="run the one-command-at-a-time loop instead of the pipeline")
+    parser.add_argument('--verbose', action='store_true', help="show the assistant's output and both replies")
+    args = parser.parse_args(argv)
+
+    header, entries = flight_recorder.load(args.dump)
+    print(f"{len(entries)} interactions, saved because: {header.get('reason') or '-'}")
+
+    with StubHTTPServer(latency=args.http_latency) as stub, tempfile.TemporaryDirectory() as workdir:
+        bench_config.WEATHER_API_URL = stub.base_url + "/weather"
+        bench_config.NEWS_API_URL = stub.base_url + "/news"
+        bench_config.FLIGHT_RECORDER_SIZE = len(entries) + 1
+        # Handlers such as handle_remember write to the working directory.
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            replayed = replay(entries, args, workdir)
+        finally:
+            os.chdir(cwd)
+
+    verdicts = []
+    print(f"{'#':>3}  {'transcript':<36}{'recorded':<42}{'replayed':<42}{'ms then':>9}{'ms now':>9}  verdict")
+    for i, recorded in enumerate(entries):
+        now = replayed[i] if i < len(replayed) else None
+        verdicts.append(verdict(recorded, now))
+        then_ms = recorded["timings"].get("dispatch_ms")
+        now_ms = now["timings"].get("dispatch_ms") if now else None
+        print(f"{i + 1:>3}  {recorded['transcript'][:35]:<36}{summary(recorded)[:41]:<42}"
+              f"{summary(now)[:41]:<42}{then_ms if then_ms is not None else '-':>9}"
+              f"{now_ms if now_ms is not None else '-':>9}  {verdicts[-1]}")
+        if args.verbose:
+            print(f"      then: {recorded['response']}")
+            print(f"      now:  {now['response'] if now else '-'}")
+        if recorded["error"]:
+            print(f"      recorded error: {recorded['error']}")
+        if now and now["error"]:
+            print(f"      replayed error: {now['error']}")
+
+    counts = {name: verdicts.count(name) for name in ("same", "changed", "reproduced", "fixed")}
+    print(", ".join(f"{count} {name}" for name, count in counts.items()))
+    return 1 if counts["changed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""End-to-end latency benchmark for the assistant pipeline.
+
+Runs the real Assistant.run() loop -- listening, recognition, the local
+router, the function_map handlers and speak() -- on top of the fakes in
+fakes.py, so it needs no microphone, camera, speakers or API keys and runs
+headless. By default the stages overlap (pipeline.py); --sequential runs
+the one-command-at-a-time loop instead.
+
+    python -m benchmarks.run_pipeline
+    python -m benchmarks.run_pipeline --scenario gemini_tools --repeat 20
+    python -m benchmarks.run_pipeline --json results.json
+    python -m benchmarks.run_pipeline --baseline results.json
+    python -m benchmarks.run_pipeline --back-to-back --realtime-audio --tts-latency 0.5
+    python -m benchmarks.run_pipeline --back-to-back --realtime-audio --tts-latency 0.5 --sequential
+
+Latency is measured per command, from the moment its audio is opened to the
+moment its reply reaches the speaker; throughput is commands answered per
+second of session. By default the user takes turns: each command is spoken
+once the previous reply has finished. With --back-to-back the commands
+come one after another without waiting, and --realtime-audio makes capture
+take as long as the utterance, like a microphone; together they show what
+overlapping the stages buys. The run fails (exit code 1) when a scenario's
+p95 exceeds its max_p95_ms (taking turns only), or exceeds a --baseline
+result by more than --tolerance.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import bench_config
+
+sys.modules['config'] = bench_config
+
+from benchmarks.fakes import (ImageDirCamera, RecordingSpeaker, ScriptedChat, StubHTTPServer,
+                              TranscriptLookup, WavFileAudio, write_utterance_wav)
+from benchmarks.scenarios import SCENARIOS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def command_latencies(opened_at, spoken, answered):
+    """Pairs each answered utterance with its reply, in ms.
+
+    Replies come in the order the utterances were heard, but with the
+    pipeline the next utterance may be opened before the last reply.
+    answered[i] is False for utterances that get no reply (ignored queries).
+    """
+    replies = [t for t, _ in spoken if t >= opened_at[0]]
+    starts = [t for t, expected in zip(opened_at, answered) if expected]
+    return [(end - start) * 1000 for start, end in zip(starts, replies)]
+
+
+def take_turns(speaker, answered):
+    """A WavFileAudio wait hook: utterance i waits until the replies to the ones before it were spoken."""
+    replies_before = [sum(answered[:i]) for i in range(len(answered))]
+    start = []
+
+    def wait(i):
+        if not start:
+            start.append(speaker.finished)
+        deadline = time.perf_counter() + 10
+        while speaker.finished < start[0] + replies_before[i] and time.perf_counter() < deadline:
+            time.sleep(0.001)
+    return wait
+
+
+def build_session(name, scenario, args, workdir):
+    """Wires an Assistant to fresh fakes for one scripted session."""
+    import assistant
+
+    commands = scenario["commands"] + ["friday sleep"]
+    paths, transcripts = [], {}
+    for i, command in enumerate(commands):
+        path = os.path.join(workdir, f"{name}_{i}.wav")
+        if not os.path.exists(path):
+            write_utterance_wav(path, seed=i)
+        paths.append(path)
+        transcripts[path] = command
+
+    answered = ["friday" in command for command in commands]
+    speaker = RecordingSpeaker(delay=args.tts_latency)
+    audio = WavFileAudio(paths, realtime=args.realtime_audio,
+                         wait=None if args.back_to_back else take_turns(speaker, answered))
+    assistant.set_speaker(speaker)
+
+    camera = ImageDirCamera(args.frames) if args.frames else None
+    bot = assistant.Assistant(
+        audio_source=audio,
+        transcriber=TranscriptLookup(audio, transcripts, delay=args.stt_latency),
+        chat=ScriptedChat(scenario["script"], latency=args.llm_latency),
+        camera=camera,
+        verify=camera is not None,
+        pipelined=not args.sequential,
+    )
+    audio.on_exhausted = bot.stop
+    return bot, audio, speaker, answered
+
+
+def run_scenario(name, scenario, args, workdir):
+    """Runs one scenario args.repeat times and summarises its latencies."""
+    latencies, wall = [], []
+    for _ in range(args.repeat):
+        bot, audio, speaker, answered = build_session(name, scenario, args, workdir)
+        out = sys.stdout if args.verbose else io.StringIO()
+        with contextlib.redirect_stdout(out):
+            started = time.perf_counter()
+            bot.run()
+            wall.append(time.perf_counter() - started)
+        # The trailing "friday sleep" is bookkeeping, not part of the scenario.
+        latencies.extend(command_latencies(audio.opened_at, speaker.spoken, answered)[:-1])
+
+    return {
+        "commands": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "max_ms": round(max(latencies), 2),
+        "session_s": round(sum(wall) / len(wall), 3),
+        "per_s": round(len(latencies) / sum(wall), 2),
+        "max_p95_ms": None if args.back_to_back else scenario["max_p95_ms"],
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    """Lists scenarios over their threshold or slower than the baseline."""
+    failures = []
+    for name, result in results.items():
+        if result["max_p95_ms"] and result["p95_ms"] > result["max_p95_ms"]:
+            failures.append(f"{name}: p95 {result['p95_ms']} ms > threshold {result['max_p95_ms']} ms")
+        previous = baseline.get(name)
+        if previous and result["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            failures.append(f"{name}: p95 {result['p95_ms']} ms > baseline {previous['p95_ms']} ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help="sessions per scenario")
+    parser.add_argument('--stt-latency', type=float, default=0.05, help="fake speech recognition delay, seconds")
+    parser.add_argument('--llm-latency', type=float, default=0.1, help="fake Gemini delay per message, seconds")
+    parser.add_argument('--http-latency', type=float, default=0.02, help="stub weather/news API delay, seconds")
+    parser.add_argument('--tts-latency', type=float, default=0.0, help="fake speech playback time, seconds")
+    parser.add_argument('--back-to-back', action='store_true',
+                        help="speak each command without waiting for the previous reply")
+    parser.add_argument('--realtime-audio', action='store_true',
+                        help="capture each utterance in real time, like a microphone")
+    parser.add_argument('--sequential', action='store_true',
+                        help="run the one-command-at-a-time loop instead of the pipeline")
+    parser.add_argument('--frames', help="directory of camera frames; enables face verification")
+    parser.add_argument('--no-intents', action='store_true',
+                        help="disable the offline intent classifier so tool queries go through Gemini")
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--baseline', help="results file from an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown against --baseline")
+    parser.add_argument('--verbose', action='store_true', help="show the assistant's own output")
+    args = parser.parse_args(argv)
+    if args.frames:
+        args.frames = os.path.abspath(args.frames)
+
+    bench_config.USE_INTENT_CLASSIFIER = not args.no_intents
+    bench_config.CASCADE_PATH = os.path.join(ROOT, "haarcascade_frontalface_default.xml")
+    bench_config.TRAINER_PATH = os.path.join(ROOT, "trainer", "trainer.yml")
+
+    results = {}
+    with StubHTTPServer(latency=args.http_latency) as stub, tempfile.TemporaryDirectory() as workdir:
+        bench_config.WEATHER_API_URL = stub.base_url + "/weather"
+        bench_config.NEWS_API_URL = stub.base_url + "/news"
+        # Handlers such as handle_remember write to the working directory.
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for name in args.scenario or sorted(SCENARIOS):
+                results[name] = run_scenario(name, SCENARIOS[name], args, workdir)
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'scenario':<18}{'cmds':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'cmd/s':>8}{'limit':>8}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['commands']:>6}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['max_ms']:>10}{r['per_s']:>8}"
+              f"{r['max_p95_ms'] or '-':>8}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failures = find_regressions(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Scripted sessions for the pipeline benchmark.
+
+Each scenario is a list of spoken commands plus the Gemini script needed to
+answer the ones that leave the local router. The harness appends a final
+"friday sleep" so the real run() loop ends on its own. max_p95_ms is the
+regression threshold for the per-command latency of that scenario, with the
+default fake latencies in run_pipeline.py.
+"""
+
+SCENARIOS = {
+    "local_commands": {
+        "commands": [
+            "friday time",
+            "friday battery",
+            "friday time please",
+            "friday power left",
+            "friday what is 12.5 percent of 240",
+            "friday square root of 81 plus 3",
+        ],
+        "script": {},
+        "max_p95_ms": 100,
+    },
+    "gemini_chat": {
+        "commands": [
+            "friday tell me something about mars",
+            "friday who created you",
+        ],
+        "script": {
+            "friday tell me something about mars": "Mars is the fourth planet from the Sun.",
+            "friday who created you": "I was created by Tushar, Tanishka, and Vishakha.",
+        },
+        "max_p95_ms": 250,
+    },
+    "gemini_tools": {
+        "commands": [
+            "friday what's the weather in ghaziabad",
+            "friday give me the business news",
+            "friday remember that the keys are in the drawer",
+            "friday what did i ask you to remember",
+        ],
+        "script": {
+            "friday what's the weather in ghaziabad": ("handle_weather", {"city": "Ghaziabad"}),
+            "friday give me the business news": ("handle_news", {"category": "business"}),
+            "friday remember that the keys are in the drawer": ("handle_remember", {"text_to_remember": "the keys are in the drawer"}),
+            "friday what did i ask you to remember": ("handle_recall", {}),
+        },
+        "max_p95_ms": 400,
+    },
+    "mixed_session": {
+        "commands": [
+            "friday time",
+            "friday tell me something about mars",
+            "what is this",
+            "friday what's the weather in mumbai",
+            "friday battery",
+        ],
+        "script": {
+            "friday tell me something about mars": "Mars is the fourth planet from the Sun.",
+            "friday what's the weather in mumbai": ("handle_weather", {"city": "Mumbai"}),
+        },
+        "max_p95_ms": 400,
+    },
+}
@@ -0,0 +1,136 @@
+"""Soak test: a long scripted session that fails if Friday keeps growing.
+
+Runs the real pipelined Assistant.run() loop on the fakes in fakes.py for
+--commands commands, cycling through every command of every scenario in
+scenarios.py (local commands, Gemini chat and Gemini tool calls), back to
+back. Every --every commands a resource_monitor.ResourceMonitor samples
+the process: resident memory, memory traced by tracemalloc, open file
+descriptors and threads, plus the Gemini chat history length.
+
+The first --warmup commands fill the caches (API responses, the flight
+recorder, lazily imported modules) and are not measured. Over the rest,
+the run fails (exit code 1) when the fitted growth of a metric exceeds its
+limit:
+
+- traced memory: --max-bytes-per-command on average. Some growth is
+  expected: the fakes keep a record of every utterance and reply, the
+  scripted chat keeps its history like a real Gemini chat does, and at
+  this speed all the replies fall within the pipeline's ECHO_SECONDS,
+  whose replies it keeps to spot echoes,
+- resident memory: --max-rss-mb over the measured part of the run,
+- open files and threads: --max-handles.
+
+It prints the allocation sites that grew most, which is where to look.
+
+    python -m benchmarks.soak_test
+    python -m benchmarks.soak_test --commands 5000 --every 100
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmarks import bench_config
+
+sys.modules['config'] = bench_config
+
+from benchmarks.fakes import StubHTTPServer
+from benchmarks.run_pipeline import build_session
+from benchmarks.scenarios import SCENARIOS
+from resource_monitor import MB, ResourceMonitor, amount
+
+
+def soak_scenario(count):
+    """Every scenario's commands, round robin, count of them, with all their scripts."""
+    commands, script = [], {}
+    for scenario in SCENARIOS.values():
+        commands.extend(scenario["commands"])
+        script.update(scenario["script"])
+    return {"commands": [commands[i % len(commands)] for i in range(count)], "script": script}
+
+
+def run(args, workdir):
+    """Runs the session, sampling every args.every commands; returns (monitor, seconds, measured commands)."""
+    session_args = SimpleNamespace(tts_latency=0.0, realtime_audio=False, back_to_back=True, frames=None,
+                                   stt_latency=args.stt_latency, llm_latency=args.llm_latency, sequential=False)
+    bot, audio, _, _ = build_session("soak", soak_scenario(args.commands), session_args, workdir)
+    samples = (args.commands - args.warmup - 1) // args.every + 1
+    limits = {"traced": args.max_bytes_per_command * (args.commands - args.warmup), "rss": args.max_rss_mb * MB,
+              "fds": args.max_handles, "threads": args.max_handles}
+    monitor = ResourceMonitor(window=samples, limits=limits, trace=True)
+    monitor.watch("chat_messages", bot.chat_messages)
+
+    def wait(i):
+        if i == args.warmup:
+            monitor.start_tracing()
+            monitor.samples.clear()
+        if i >= args.warmup and (i - args.warmup) % args.every == 0:
+            monitor.sample()
+
+    audio.wait = wait
+    out = sys.stdout if args.verbose else io.StringIO()
+    with contextlib.redirect_stdout(out):
+        started = time.perf_counter()
+        bot.run()
+        elapsed = time.perf_counter() - started
+    return monitor, elapsed, args.commands - args.warmup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--commands', type=int, default=2000, help="commands in the session")
+    parser.add_argument('--warmup', type=int, default=200, help="commands before measuring")
+    parser.add_argument('--every', type=int, default=50, help="commands between samples")
+    parser.add_argument('--stt-latency', type=float, default=0.0, help="fake speech recognition delay, seconds")
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="fake Gemini delay per message, seconds")
+    parser.add_argument('--max-bytes-per-command', type=float, default=2048,
+                        help="traced memory growth allowed per command")
+    parser.add_argument('--max-rss-mb', type=float, default=20, help="resident memory growth allowed")
+    parser.add_argument('--max-handles', type=int, default=2, help="growth allowed in open files and threads")
+    parser.add_argument('--top', type=int, default=8, help="allocation sites to list")
+    parser.add_argument('--verbose', action='store_true', help="show the assistant's own output")
+    args = parser.parse_args(argv)
+    if args.commands < args.warmup + 5 * args.every:
+        parser.error("--commands must leave at least 5 samples after --warmup")
+
+    with StubHTTPServer() as stub, tempfile.TemporaryDirectory() as workdir:
+        bench_config.WEATHER_API_URL = stub.base_url + "/weather"
+        bench_config.NEWS_API_URL = stub.base_url + "/news"
+        # Handlers such as handle_remember write to the working directory.
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            monitor, elapsed, measured = run(args, workdir)
+        finally:
+            os.chdir(cwd)
+
+    first, last = monitor.samples[0], monitor.samples[-1]
+    growing = monitor.growing()
+    print(f"{args.commands} commands in {elapsed:.1f}s, {measured} measured after {args.warmup} of warm-up, "
+          f"{len(monitor.samples)} samples")
+    print(f"{'metric':<15}{'start':>17}{'end':>17}{'fitted growth':>17}{'limit':>17}  verdict")
+    for name in ("rss", "traced", "fds", "threads", "chat_messages"):
+        trend = monitor.trend(name)
+        growth = trend[0] if trend else 0
+        limit = monitor.limits.get(name)
+        verdict = "-" if limit is None else "GROWING" if name in growing else "ok"
+        print(f"{name:<15}{amount(name, first[name]):>17}{amount(name, last[name]):>17}{amount(name, growth):>17}"
+              f"{amount(name, limit) if limit is not None else '-':>17}  {verdict}")
+    per_command = (last["traced"] - first["traced"]) / max(measured, 1)
+    print(f"traced memory per command: {per_command:.0f} bytes "
+          f"({(last['chat_messages'] - first['chat_messages']) / max(measured, 1):.2f} chat messages)")
+    print("Allocation sites that grew most:")
+    for where, size, blocks in monitor.top_allocators(args.top):
+        print(f"  {size / 1024:>9.1f} KB {blocks:>+8} blocks  {where}")
+
+    for name, (growth, _) in growing.items():
+        print(f"LEAK {name} grew by {amount(name, growth)}, over the limit of {amount(name, monitor.limits[name])}")
+    return 1 if growing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Tool pruning benchmark: how much of every Gemini request the tool declarations take, and what pruning keeps.
+
+Every Gemini request used to carry all the function declarations.
+skills.SkillRegistry.relevant() picks the k most relevant ones per query
+instead. On the held-out queries of intent_bench.py, plus the indirect
+tool requests below that the intent classifier leaves to Gemini, it
+reports for each k:
+
+- recall: tool queries whose expected handler is among the k offered, for
+  the intent_bench ones and for those that reach Gemini,
+- the size of the declarations sent, in characters of JSON and estimated
+  input tokens (4 characters a token), against sending all of them, for
+  tool and open queries alike,
+- the time relevant() takes per query.
+
+    python -m benchmarks.tool_pruning_bench
+    python -m benchmarks.tool_pruning_bench --k 3 5 8 --verbose
+"""
+import argparse
+import json
+import sys
+import time
+
+from benchmarks import bench_config
+
+sys.modules['config'] = bench_config
+
+from benchmarks.intent_bench import OPEN_QUERIES, TOOL_QUERIES
+
+CHARS_PER_TOKEN = 4
+
+# Tool requests phrased the way the intent classifier does not recognise.
+INDIRECT_QUERIES = [
+    ("do i need an umbrella in delhi today", "handle_weather"),
+    ("is it sunny over in kolkata at the moment", "handle_weather"),
+    ("what's going on in the stock market", "handle_news"),
+    ("catch me up on what happened in cricket", "handle_news"),
+    ("jot down that the meeting moved to thursday", "handle_remember"),
+    ("what was that thing i asked you to keep track of", "handle_recall"),
+    ("i can't hear anything, crank it up", "handle_volume"),
+    ("shh, silence please", "handle_volume"),
+    ("is the wifi slow or is it just me", "handle_internet_speed"),
+    ("find me a video about knitting a scarf", "handle_youtube"),
+    ("put on some lofi beats from youtube", "handle_youtube"),
+    ("how would a german say thank you very much", "handle_translate"),
+    ("how many pounds is 70 kilos", "handle_convert"),
+    ("what's 15 percent tip on 2400 rupees", "handle_calculate"),
+    ("am i running low on charge", "handle_battery"),
+    ("snap what's on my display", "handle_screenshot"),
+    ("open my editor so i can code", "handle_open_app"),
+    ("bring up my email inbox", "handle_open_web"),
+    ("give me a quick bio of marie curie from the encyclopedia", "handle_wikipedia"),
+    ("i need step by step instructions for planting tomatoes", "handle_wikihow"),
+    ("cheer me up with something nerdy and funny", "handle_joke"),
+    ("i want to hear one of my tracks", "handle_play_music"),
+    ("open up chapter one of my physics document", "handle_read_pdf"),
+    ("we're done for today, friday", "handle_sleep"),
+]
+
+
+def declaration_chars(tools):
+    return len(json.dumps(tools, separators=(",", ":")))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--k', type=int, nargs='+', default=[3, 5, 8, 12], help="tools offered per request")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--verbose', action='store_true', help="print the queries whose handler was pruned")
+    args = parser.parse_args(argv)
+
+    import assistant
+    import intents
+
+    bot = assistant.Assistant(verify=False, connect_llm=False)
+    skills = bot.skills
+    classifier = intents.get_classifier(bot.tools)
+    to_gemini = [(q, name) for q, name, _ in TOOL_QUERIES if classifier.predict(q) is None]
+    to_gemini += [(q, name) for q, name in INDIRECT_QUERIES if classifier.predict(q) is None]
+    queries = [q for q, _, _ in TOOL_QUERIES] + [q for q, _ in INDIRECT_QUERIES] + OPEN_QUERIES
+
+    skills.relevant(queries[0], 1)
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for query in queries:
+            skills.relevant(query, max(args.k))
+    score_ms = (time.perf_counter() - started) * 1000 / (args.repeat * len(queries))
+
+    all_chars = declaration_chars(skills.tools())
+    print(f"{len(skills.function_map())} tools, {all_chars} characters (~{all_chars // CHARS_PER_TOKEN} tokens) "
+          f"of declarations per request; {len(to_gemini)} of the tool queries reach Gemini")
+    print(f"{'k':>4}{'recall':>9}{'to Gemini':>11}{'chars':>8}{'~tokens':>9}{'saved':>8}")
+    for k in args.k:
+        offered = {q: skills.relevant(q, k) for q in queries}
+        hits = [name in offered[q] for q, name, _ in TOOL_QUERIES]
+        gemini_hits = [name in offered[q] for q, name in to_gemini]
+        chars = sum(declaration_chars(skills.tools(offered[q])) for q in queries) / len(queries)
+        print(f"{k:>4}{sum(hits) / len(hits):>9.0%}{sum(gemini_hits) / max(len(gemini_hits), 1):>11.0%}"
+              f"{chars:>8.0f}{chars / CHARS_PER_TOKEN:>9.0f}{1 - chars / all_chars:>8.0%}")
+        if args.verbose:
+            for query, name in [(q, n) for q, n, _ in TOOL_QUERIES] + to_gemini:
+                if name not in offered[query]:
+                    print(f"     missed {name} for {query!r}: {offered[query]}")
+    print(f"relevant() takes {score_ms:.3f} ms per query")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
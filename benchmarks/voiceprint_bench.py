@@ -0,0 +1,196 @@
+"""Speaker verification benchmark: equal-error rate and latency of voiceprint.py on WAV files.
+
+Recordings come from --fixtures DIR, one sub-directory per speaker with
+their WAV files, e.g. DIR/alice/01.wav. Without it the benchmark writes
+synthetic fixtures first: --speakers voices, each with their own pitch,
+vocal tract length (formant scale), breathiness and way of saying the
+vowels, saying --utterances times "Friday" followed by random vowels, with
+random intonation and background noise. They are a smoke test, not a
+substitute for recordings: real voices vary more within a speaker and
+channels vary more between sessions.
+
+The first --enroll utterances of each speaker make their voiceprint; every
+other utterance is compared with every voiceprint. Distances to the
+speaker's own voiceprint are genuine trials, the others impostor trials.
+The equal-error rate (EER) is where the false accept rate (impostors
+within the threshold) equals the false reject rate (genuine trials
+further than it). It also reports both rates at --threshold
+(VOICEPRINT_THRESHOLD in assistant.py), and the time to read the samples
+out of an sr.AudioData, embed them and verify them.
+
+    python -m benchmarks.voiceprint_bench
+    python -m benchmarks.voiceprint_bench --fixtures recordings/voices --threshold 2.5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+import speech_recognition as sr
+
+import voiceprint
+from voiceprint import RATE, VoiceprintStore
+
+# Formants F1-F3 of English vowels (Peterson & Barney, adult male averages), Hz.
+VOWELS = [(730, 1090, 2440), (270, 2290, 3010), (300, 870, 2240), (530, 1840, 2480), (660, 1720, 2410),
+          (490, 1350, 1690), (640, 1190, 2390), (440, 1020, 2240), (570, 840, 2410), (390, 1990, 2550)]
+BANDWIDTHS = (80, 100, 140)
+
+
+def random_speaker(rng):
+    return {
+        "pitch": rng.uniform(90, 240),
+        "tract": rng.uniform(0.85, 1.2),
+        "bandwidth": rng.uniform(0.8, 1.4),
+        "tilt": rng.uniform(0.6, 1.4),
+        "breath": rng.uniform(0.01, 0.08),
+        # How this speaker says each vowel.
+        "accent": rng.uniform(0.93, 1.07, (len(VOWELS), 3)),
+    }
+
+
+def vowel(speaker, rng, start, end, seconds):
+    """A voiced sound gliding from formants start to end (indexes into VOWELS), as float samples at RATE."""
+    length = int(seconds * RATE)
+    t = np.arange(length) / RATE
+    # Intonation: the pitch drifts and wobbles differently each time.
+    pitch = speaker["pitch"] * rng.uniform(0.92, 1.08) * (1 + rng.uniform(-0.08, 0.08) * t / t[-1]
+                                                           + 0.01 * rng.standard_normal(length).cumsum() / 50)
+    phase = 2 * np.pi * np.cumsum(pitch) / RATE
+    harmonics = np.arange(1, int(0.45 * RATE / speaker["pitch"]) + 1)
+    frequencies = pitch[:, None] * harmonics
+    glide = (t / t[-1])[:, None]
+    formants = [np.array(VOWELS[v]) * speaker["accent"][v] for v in (start, end)]
+    formants = (formants[0] * (1 - glide) + formants[1] * glide) * speaker["tract"] * rng.uniform(0.98, 1.02, 3)
+    envelope = harmonics ** -speaker["tilt"] * np.ones_like(frequencies)
+    for formant, bandwidth in zip(formants.T, BANDWIDTHS):
+        formant, bandwidth = formant[:, None], bandwidth * speaker["bandwidth"]
+        envelope *= formant ** 2 / np.sqrt((formant ** 2 - frequencies ** 2) ** 2 + (bandwidth * frequencies) ** 2)
+    envelope[frequencies >= RATE / 2] = 0
+    voice = (envelope * np.sin(phase[:, None] * harmonics)).sum(axis=1)
+    voice += speaker["breath"] * np.abs(voice).max() * rng.standard_normal(length)
+    fade = np.minimum(1, np.minimum(t, t[-1] - t) / 0.02)
+    return voice * fade / np.abs(voice).max()
+
+
+def synthesize(speaker, rng):
+    """One utterance: "Friday" (two diphthongs) then a few random vowels, padded with silence."""
+    sounds = [(0, 9, rng.uniform(0.18, 0.26)), (3, 1, rng.uniform(0.18, 0.26))]
+    for _ in range(rng.integers(2, 5)):
+        v = rng.integers(len(VOWELS))
+        sounds.append((v, v, rng.uniform(0.12, 0.3)))
+    segments = []
+    for start, end, seconds in sounds:
+        segments.append(vowel(speaker, rng, start, end, seconds))
+        segments.append(np.zeros(int(rng.uniform(0.02, 0.08) * RATE)))
+    silence = np.zeros(int(0.3 * RATE))
+    samples = np.concatenate([silence] + segments + [silence]) * rng.uniform(0.2, 0.6)
+    return samples + 10 ** (-rng.uniform(40, 55) / 20) * rng.standard_normal(len(samples))
+
+
+def write_wav(path, samples):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes((np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes())
+
+
+def write_fixtures(directory, speakers, utterances, seed=0):
+    rng = np.random.default_rng(seed)
+    for number in range(speakers):
+        speaker = random_speaker(rng)
+        os.makedirs(os.path.join(directory, f"speaker{number:02d}"))
+        for i in range(utterances):
+            write_wav(os.path.join(directory, f"speaker{number:02d}", f"{i:02d}.wav"), synthesize(speaker, rng))
+
+
+def read_fixtures(directory):
+    """{speaker: [sr.AudioData, ...]} from directory/<speaker>/*.wav, in name order."""
+    fixtures = {}
+    for speaker in sorted(os.listdir(directory)):
+        folder = os.path.join(directory, speaker)
+        if not os.path.isdir(folder):
+            continue
+        recordings = []
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(".wav"):
+                with sr.AudioFile(os.path.join(folder, name)) as source:
+                    recordings.append(sr.Recognizer().record(source))
+        if recordings:
+            fixtures[speaker] = recordings
+    return fixtures
+
+
+def equal_error_rate(genuine, impostor):
+    """(EER, threshold) where the false accept and false reject rates of genuine and impostor distances cross."""
+    genuine, impostor = np.sort(genuine), np.sort(impostor)
+    thresholds = np.unique(np.concatenate([genuine, impostor]))
+    false_reject = 1 - np.searchsorted(genuine, thresholds, side='right') / len(genuine)
+    false_accept = np.searchsorted(impostor, thresholds, side='right') / len(impostor)
+    best = int(np.argmin(np.abs(false_accept - false_reject)))
+    return (false_accept[best] + false_reject[best]) / 2, float(thresholds[best])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', help="directory with a sub-directory of WAV files per speaker "
+                                           "(default: synthetic voices)")
+    parser.add_argument('--speakers', type=int, default=20, help="synthetic speakers")
+    parser.add_argument('--utterances', type=int, default=15, help="synthetic utterances per speaker")
+    parser.add_argument('--enroll', type=int, default=5, help="utterances per speaker used for enrollment")
+    parser.add_argument('--threshold', type=float, default=1.8, help="distance threshold to report the error rates at")
+    args = parser.parse_args(argv)
+
+    if args.fixtures:
+        fixtures = read_fixtures(args.fixtures)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            write_fixtures(directory, args.speakers, args.utterances)
+            fixtures = read_fixtures(directory)
+    fixtures = {speaker: audio for speaker, audio in fixtures.items() if len(audio) > args.enroll}
+    if len(fixtures) < 2:
+        print(f"Need at least 2 speakers with more than {args.enroll} recordings each")
+        return 1
+
+    store = VoiceprintStore()
+    for speaker, recordings in fixtures.items():
+        embeddings = [voiceprint.embed(voiceprint.samples_from_audio(audio)) for audio in recordings[:args.enroll]]
+        store.enroll(speaker, [embedding for embedding in embeddings if embedding is not None])
+
+    genuine, impostor, latencies, seconds, rejected = [], [], [], [], 0
+    for speaker, recordings in fixtures.items():
+        own = store.names.index(speaker)
+        for audio in recordings[args.enroll:]:
+            started = time.perf_counter()
+            embedding = voiceprint.embed(voiceprint.samples_from_audio(audio))
+            store.verify(embedding, args.threshold)
+            latencies.append((time.perf_counter() - started) * 1000)
+            seconds.append(len(audio.frame_data) / (audio.sample_rate * audio.sample_width))
+            if embedding is None:
+                rejected += 1
+                continue
+            distances = store.distances(embedding)
+            genuine.append(distances[own])
+            impostor.extend(np.delete(distances, own))
+
+    eer, at = equal_error_rate(genuine, impostor)
+    false_accept = np.mean(np.array(impostor) <= args.threshold)
+    false_reject = np.mean(np.array(genuine) > args.threshold)
+    latencies.sort()
+    print(f"{len(fixtures)} speakers, {args.enroll} enrollment utterances each, {len(genuine)} genuine and "
+          f"{len(impostor)} impostor trials ({rejected} utterances too short to score)")
+    print(f"equal-error rate {eer:.1%} at threshold {at:.3f}")
+    print(f"at threshold {args.threshold}: false accepts {false_accept:.2%}, false rejects {false_reject:.2%}")
+    print(f"verification of a {statistics.mean(seconds):.1f} s utterance: median "
+          f"{statistics.median(latencies):.1f} ms, p95 {latencies[int(0.95 * (len(latencies) - 1))]:.1f} ms, "
+          f"max {latencies[-1]:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""Local arithmetic for spoken queries.
+
+"what is 12.5 percent of 240" and "square root of 81 plus 3" are answered
+here in microseconds instead of a Gemini round trip. There are three steps:
+
+1. to_expression() turns spoken numbers and operator words into a Python
+   expression string ("12.5/100*240", "sqrt(81)+3"),
+2. compile_expression() parses it with ast, rejects anything but numbers,
+   arithmetic operators and a few math functions, and builds a tree of
+   closures that evaluates it,
+3. both steps are cached, so a repeated query costs one dictionary lookup.
+
+Nothing is ever passed to eval(). Anything that is not arithmetic raises
+CalculationError, which is how the router tells calculations from other
+questions.
+"""
+import ast
+import math
+import operator
+import re
+from functools import lru_cache
+
+CACHE_SIZE = 1024
+MAX_EXPONENT = 1000
+MAX_FACTORIAL = 170
+
+
+class CalculationError(ValueError):
+    """The text is not an arithmetic expression we can evaluate."""
+
+
+UNITS = {
+    'zero': 0, 'oh': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
+    'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+}
+TENS = {
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50, 'sixty': 60, 'seventy': 70, 'eighty': 80,
+    'ninety': 90,
+}
+SCALES = {'hundred': 100, 'thousand': 1000, 'lakh': 100000, 'million': 10 ** 6, 'crore': 10 ** 7,
+          'billion': 10 ** 9}
+FRACTIONS = {'half': '0.5', 'quarter': '0.25'}
+
+# Multi-word phrases first: the longest match wins.
+PHRASES = [
+    (('to', 'the', 'power', 'of'), '**'),
+    (('raised', 'to', 'the', 'power', 'of'), '**'),
+    (('raised', 'to'), '**'),
+    (('to', 'the', 'power'), '**'),
+    (('power', 'of'), '**'),
+    (('multiplied', 'by'), '*'),
+    (('divided', 'by'), '/'),
+    (('added', 'to'), '+'),
+    (('square', 'root', 'of'), 'sqrt'),
+    (('square', 'root'), 'sqrt'),
+    (('cube', 'root', 'of'), 'cbrt'),
+    (('cube', 'root'), 'cbrt'),
+    (('absolute', 'value', 'of'), 'abs'),
+    (('log', 'of'), 'log'),
+    (('natural', 'log', 'of'), 'ln'),
+    (('percent', 'of'), '/100*'),
+    (('per', 'cent', 'of'), '/100*'),
+    (('per', 'cent'), '/100'),
+    (('factorial', 'of'), 'factorial'),
+]
+WORDS = {
+    'plus': '+', '+': '+', 'add': '+',
+    'minus': '-', '-': '-', 'less': '-',
+    'times': '*', 'x': '*', '*': '*', 'into': '*', 'multiply': '*', '×': '*',
+    'over': '/', 'by': '/', '/': '/', '÷': '/',
+    'mod': '%', 'modulo': '%', '%': '%',
+    '^': '**', 'power': '**',
+    'squared': '**2', 'cubed': '**3',
+    'percent': '/100',
+    'of': '*',
+    '(': '(', ')': ')',
+    'sqrt': 'sqrt', 'abs': 'abs', 'log': 'log', 'ln': 'ln', 'factorial': 'factorial',
+}
+# Prefix functions: they apply to the number (or bracket) right after them.
+FUNCTIONS = {'sqrt', 'cbrt', 'abs', 'log', 'ln', 'factorial'}
+FILLER = {
+    'what', "what's", 'whats', 'is', 'calculate', 'compute', 'evaluate', 'the', 'value', 'please',
+    'friday', 'tell', 'me', 'how', 'much', 'equals', 'equal', 'to', 'answer', 'result', 'solve',
+    'a', 'an', 'and',
+}
+
+_TOKEN = re.compile(r"\d+(?:\.\d+)?|\.\d+|[a-z']+|\*\*|[-+*/^%()×÷]")
+
+
+def _read_number(words, i):
+    """Reads spoken number words starting at words[i]. Returns (text, next index) or None."""
+    total, current, seen = 0, 0, False
+    while i < len(words):
+        word = words[i]
+        if word in UNITS:
+            current += UNITS[word]
+        elif word in TENS:
+            current += TENS[word]
+        elif word == 'hundred' and seen:
+            current = (current or 1) * 100
+        elif word in SCALES and seen:
+            total += (current or 1) * SCALES[word]
+            current = 0
+        elif (word == 'and' and (words[i - 1] == 'hundred' or words[i - 1] in SCALES)
+              and i + 1 < len(words) and (words[i + 1] in UNITS or words[i + 1] in TENS)):
+            # "two hundred and five"; "two and five" is an addition.
+            pass
+        else:
+            break
+        seen = True
+        i += 1
+    if not seen:
+        return None
+
+    value = str(total + current)
+    if i + 1 < len(words) and words[i] == 'point' and words[i + 1] in UNITS:
+        digits = []
+        i += 1
+        while i < len(words) and words[i] in UNITS and UNITS[words[i]] < 10:
+            digits.append(str(UNITS[words[i]]))
+            i += 1
+        value += '.' + ''.join(digits)
+    return value, i
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def to_expression(text):
+    """Converts a spoken calculation to a Python arithmetic expression string."""
+    text = re.sub(r'(?<=\d),(?=\d{3})', '', text.lower())
+    text = text.replace('?', ' ').replace('=', ' ')
+    words = _TOKEN.findall(text)
+
+    out = []
+    depth = 0            # open brackets the user said
+    pending = []         # bracket depth at which each open prefix function started
+    i = 0
+    while i < len(words):
+        word = words[i]
+
+        for phrase, symbol in PHRASES:
+            if tuple(words[i:i + len(phrase)]) == phrase:
+                emit, i = symbol, i + len(phrase)
+                break
+        else:
+            number = _read_number(words, i)
+            if number:
+                emit, i = number
+            elif re.fullmatch(r'\d+(?:\.\d+)?|\.\d+', word):
+                emit, i = word, i + 1
+            elif word in FRACTIONS:
+                emit, i = FRACTIONS[word], i + 1
+            elif word in WORDS:
+                emit, i = WORDS[word], i + 1
+            elif word in FILLER:
+                i += 1
+                continue
+            else:
+                raise CalculationError(f"not arithmetic: {word!r}")
+
+        if (emit[0].isdigit() or emit[0] == '.') and out and (out[-1][-1].isdigit() or out[-1] == ')'):
+            # "two and five": the user did not say which operation.
+            raise CalculationError(f"no operator before {emit!r}")
+
+        if emit in FUNCTIONS:
+            out.append(emit + '(')
+            pending.append(depth)
+            continue
+
+        out.append(emit)
+        if emit == '(':
+            depth += 1
+        elif emit == ')':
+            depth -= 1
+        if emit[-1].isdigit() or emit == ')':
+            # The operand of every function opened at this depth is complete.
+            while pending and pending[-1] == depth:
+                out.append(')')
+                pending.pop()
+
+    out.extend(')' * len(pending))
+    expression = ''.join(out)
+    if not expression:
+        raise CalculationError("empty expression")
+    return expression
+
+
+def _safe_pow(base, exponent):
+    if abs(exponent) > MAX_EXPONENT or (abs(base) > 1 and abs(exponent) * math.log10(abs(base)) > 300):
+        raise CalculationError("number too large")
+    return operator.pow(base, exponent)
+
+
+def _factorial(n):
+    if n != int(n) or n < 0 or n > MAX_FACTORIAL:
+        raise CalculationError("factorial needs a whole number from 0 to 170")
+    return math.factorial(int(n))
+
+
+BINARY = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+    ast.Mod: operator.mod, ast.FloorDiv: operator.floordiv, ast.Pow: _safe_pow,
+}
+UNARY = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+CALLS = {
+    'sqrt': math.sqrt, 'cbrt': lambda x: math.copysign(abs(x) ** (1 / 3), x), 'abs': abs,
+    'log': math.log10, 'ln': math.log, 'factorial': _factorial,
+}
+
+
+def _compile(node):
+    """Turns a validated AST node into a zero-argument closure."""
+    if isinstance(node, ast.Expression):
+        return _compile(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda: value
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY:
+        op, left, right = BINARY[type(node.op)], _compile(node.left), _compile(node.right)
+        return lambda: op(left(), right())
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY:
+        op, operand = UNARY[type(node.op)], _compile(node.operand)
+        return lambda: op(operand())
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in CALLS
+            and len(node.args) == 1 and not node.keywords):
+        fn, arg = CALLS[node.func.id], _compile(node.args[0])
+        return lambda: fn(arg())
+    raise CalculationError(f"unsupported: {type(node).__name__}")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(expression):
+    """Validates an arithmetic expression string and returns a function that evaluates it."""
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise CalculationError(f"cannot parse {expression!r}") from e
+    if not any(isinstance(node, (ast.BinOp, ast.UnaryOp, ast.Call)) for node in ast.walk(tree)):
+        raise CalculationError("no operation")
+    return _compile(tree)
+
+
+def evaluate(text):
+    """Evaluates a spoken calculation. Raises CalculationError if it is not one."""
+    try:
+        value = compile_expression(to_expression(text))()
+    except (ZeroDivisionError, OverflowError, ValueError) as e:
+        if isinstance(e, CalculationError):
+            raise
+        raise CalculationError(str(e)) from e
+    if isinstance(value, complex):
+        raise CalculationError("the result is not a real number")
+    return value
+
+
+def format_number(value):
+    """12.0 -> '12', 0.1 + 0.2 -> '0.3', large results keep their digits."""
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return f"{value:.10g}"
+    return str(value)
+
+
+def try_calculate(text):
+    """Returns the formatted answer if text is a calculation, else None."""
+    try:
+        return format_number(evaluate(text))
+    except CalculationError:
+        return None
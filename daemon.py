@@ -0,0 +1,198 @@
+"""Headless Friday: the command pipeline without the Qt window.
+
+Commands arrive one per line, either on a Unix domain socket or on stdin,
+as plain text or as JSON:
+
+    {"id": 1, "text": "what's the time"}
+    {"id": 2, "audio": "<base64-encoded WAV>"}
+
+and every command gets one JSON line back:
+
+    {"id": 1, "query": "friday what's the time", "route": "local",
+     "trigger": "time", "response": "sir the time is 10:42 AM",
+     "error": null, "timings": {"recognize_ms": 0.0, "dispatch_ms": 0.4, "total_ms": 0.5}}
+
+Commands sent here are addressed to Friday, so the wake word is optional.
+Usage:
+
+    python daemon.py                      # serve on config.DAEMON_SOCKET
+    python daemon.py --stdin              # read commands from stdin
+    python daemon.py --send "battery"     # send one command to a running daemon
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+STARTED = time.perf_counter()
+
+import speech_recognition as sr
+
+import config
+import assistant
+
+DEFAULT_SOCKET = getattr(config, 'DAEMON_SOCKET', '/tmp/friday.sock')
+
+
+class SilentSpeaker:
+    """Discards speech; replies are returned to the client instead."""
+
+    def say(self, text):
+        pass
+
+
+class CommandRunner:
+    """Turns request dicts into response dicts using a single Assistant.
+
+    The assistant keeps one chat session, so commands are run one at a time.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def read_audio(wav_bytes):
+        """The sr.AudioData of a WAV file's bytes."""
+        with sr.AudioFile(io.BytesIO(wav_bytes)) as source:
+            return sr.Recognizer().record(source)
+
+    def transcribe(self, audio):
+        return self.bot.transcriber(sr.Recognizer(), audio)
+
+    def handle(self, request):
+        started = time.perf_counter()
+        reply = {"id": request.get("id"), "query": None, "route": None, "trigger": None,
+                 "response": None, "error": None, "timings": {}}
+        with self.lock:
+            try:
+                audio = None
+                if "audio" in request:
+                    audio = self.read_audio(base64.b64decode(request["audio"]))
+                    query = self.transcribe(audio)
+                else:
+                    query = request.get("text", "")
+                recognized = time.perf_counter()
+
+                query = query.lower().strip()
+                if "friday" not in query:
+                    query = f"friday {query}"
+                reply["query"] = query
+
+                reply["timings"]["recognize_ms"] = round((recognized - started) * 1000, 2)
+                # The audio goes on to the flight recorder and to a voice enrollment in progress.
+                result = self.bot.dispatch(query, audio, timings=dict(reply["timings"]))
+                reply.update(route=result["route"], trigger=result["trigger"], response=result["response"])
+                reply["timings"]["dispatch_ms"] = round((time.perf_counter() - recognized) * 1000, 2)
+            except sr.UnknownValueError:
+                reply["error"] = "Could not understand the audio."
+            except Exception as e:
+                print(f"Error handling command: {e}", file=sys.stderr)
+                reply["error"] = str(e)
+        reply["timings"]["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return reply
+
+
+def parse_request(line):
+    """Accepts a JSON object or a bare line of text."""
+    line = line.strip()
+    if line.startswith("{"):
+        return json.loads(line)
+    return {"text": line}
+
+
+def serve_lines(runner, lines, write):
+    """Answers each request line until the input ends or Friday is told to sleep."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            request = parse_request(line)
+        except ValueError as e:
+            write({"id": None, "error": f"Bad request: {e}"})
+            continue
+        write(runner.handle(request))
+        if not runner.bot.running:
+            break
+
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        def write(reply):
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+            self.wfile.flush()
+
+        lines = (raw.decode() for raw in self.rfile)
+        serve_lines(self.server.runner, lines, write)
+        if not self.server.runner.bot.running:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+def serve_socket(runner, path):
+    if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+        print("Unix domain sockets are not available here; use --stdin instead.", file=sys.stderr)
+        return 1
+    if os.path.exists(path):
+        os.unlink(path)
+
+    with socketserver.ThreadingUnixStreamServer(path, _SocketHandler) as server:
+        server.daemon_threads = True
+        server.runner = runner
+        print(f"Friday listening on {path} (ready in {(time.perf_counter() - STARTED) * 1000:.0f} ms)",
+              file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+    return 0
+
+
+def send(path, text):
+    """Sends one command to a running daemon and prints the reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall((json.dumps({"text": text}) + "\n").encode())
+        client.shutdown(socket.SHUT_WR)
+        print(client.makefile().readline().strip())
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Friday headless.")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument('--stdin', action='store_true', help="read commands from stdin instead of a socket")
+    parser.add_argument('--send', metavar='TEXT', help="send one command to a running daemon")
+    parser.add_argument('--speak', action='store_true', help="also speak replies aloud")
+    args = parser.parse_args(argv)
+
+    if args.send:
+        return send(args.socket, args.send)
+
+    if not args.speak:
+        assistant.set_speaker(SilentSpeaker())
+    runner = CommandRunner(assistant.Assistant(verify=False, connect_llm=False))
+
+    if args.stdin:
+        # stdout carries the replies; the assistant's own logging goes to stderr.
+        out, sys.stdout = sys.stdout, sys.stderr
+
+        def write(reply):
+            print(json.dumps(reply), file=out, flush=True)
+
+        print(f"Friday ready in {(time.perf_counter() - STARTED) * 1000:.0f} ms", file=sys.stderr)
+        serve_lines(runner, sys.stdin, write)
+        return 0
+
+    return serve_socket(runner, args.socket)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
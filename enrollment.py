@@ -0,0 +1,105 @@
+"""Quality gate and background writer for enrollment samples."""
+import os
+import queue
+import threading
+from collections import Counter
+
+import cv2
+import numpy as np
+
+MIN_SIZE = 80
+MIN_SHARPNESS = 60.0
+BRIGHTNESS = (50, 210)
+MIN_DISTANCE = 6
+# Crops are compared at this size, so the scores do not depend on how far away the user sits.
+SCORE_SIZE = 96
+
+
+def sharpness(gray):
+    return float(cv2.Laplacian(cv2.resize(gray, (SCORE_SIZE, SCORE_SIZE)), cv2.CV_64F).var())
+
+
+def dhash(gray, bits=8):
+    """64-bit difference hash: is each pixel brighter than its right neighbour, on a 9x8 thumbnail."""
+    small = cv2.resize(gray, (bits + 1, bits), interpolation=cv2.INTER_AREA)
+    diff = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(diff).tobytes(), 'big')
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class QualityGate:
+    """Accepts sharp, well-lit, large enough crops that differ from the ones already accepted."""
+
+    def __init__(self, min_size=MIN_SIZE, min_sharpness=MIN_SHARPNESS, brightness=BRIGHTNESS,
+                 min_distance=MIN_DISTANCE):
+        self.min_size = min_size
+        self.min_sharpness = min_sharpness
+        self.brightness = brightness
+        self.min_distance = min_distance
+        self.hashes = []
+        self.rejected = Counter()
+
+    @property
+    def accepted(self):
+        return len(self.hashes)
+
+    def check(self, gray):
+        """Returns (accepted, reason); reason is None or why the crop was rejected."""
+        reason = self._reject_reason(gray)
+        if reason:
+            self.rejected[reason] += 1
+            return False, reason
+        return True, None
+
+    def _reject_reason(self, gray):
+        h, w = gray.shape[:2]
+        if min(h, w) < self.min_size:
+            return "too small"
+        mean = float(gray.mean())
+        if mean < self.brightness[0]:
+            return "too dark"
+        if mean > self.brightness[1]:
+            return "too bright"
+        if sharpness(gray) < self.min_sharpness:
+            return "blurry"
+        code = dhash(gray)
+        if any(hamming(code, seen) < self.min_distance for seen in self.hashes):
+            return "duplicate"
+        self.hashes.append(code)
+        return None
+
+
+class SampleWriter:
+    """Writes images on a background thread. close() waits for the queue to drain."""
+
+    def __init__(self, maxsize=64):
+        self.queue = queue.Queue(maxsize)
+        self.written = 0
+        self.errors = 0
+        self.thread = threading.Thread(target=self._run, name="sample-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, path, image):
+        # Callers keep reusing their frame buffers, so the writer gets its own copy.
+        self.queue.put((path, image.copy()))
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            path, image = item
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if cv2.imwrite(path, image):
+                self.written += 1
+            else:
+                self.errors += 1
@@ -0,0 +1,243 @@
+"""Enrollment index for face verification.
+
+Every enrolled face sample is described by a grid of uniform local binary
+pattern (LBP) histograms, the same idea as OpenCV's LBPH recognizer, and
+all samples live in one contiguous float32 matrix. Matching a frame is a
+handful of NumPy operations for all detected faces at once instead of one
+recognizer.predict call (a linear scan in C++) per face:
+
+1. describe every face crop in the frame in one batch,
+2. shortlist candidate samples for every face with a single matrix product
+   (Bhattacharyya similarity of the histograms),
+3. rank the shortlist by chi-square distance, the measure LBPH uses, and
+   keep the best k identities.
+
+The matrix stores square roots of the histograms, which is what step 2
+needs; step 3 squares the few shortlisted rows back.
+
+save() writes a flat binary file: a fixed header, the matrix as raw
+float32, the labels as int32 and the names as JSON. load() maps the matrix
+straight from the file (np.memmap) instead of parsing anything, so loading
+takes the same time for 10 identities as for 10,000 and pages are only
+read as searches touch them. Files from np.savez (faces.npz) still load.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+import cv2
+
+FACE_SIZE = 98              # crops are resized to this square before describing
+GRID = 8                    # GRID x GRID histogram cells
+SHORTLIST = 64              # samples re-ranked exactly per face
+# Largest chi-square distance the benchmarks accept as a match. It suits
+# the synthetic faces of benchmarks/face_index_bench.py and says nothing
+# about real ones: Friday only matches against the index once
+# FACE_MATCH_THRESHOLD is set in config.py from a --dataset samples run.
+MATCH_THRESHOLD = 0.38
+BLOCK_ELEMENTS = 1 << 23    # float32 elements per chi-square temporary (32 MB)
+
+MAGIC = b"FRIDAYFX"
+VERSION = 1
+# magic, version, dimensions, samples, bytes of names JSON; the arrays start at HEADER_SIZE.
+_HEADER = struct.Struct("<8sIIQQ")
+HEADER_SIZE = 64
+# Windows cannot replace a file while it is mapped, which would stop Model
+# Trainer.py from writing a new index while Friday runs; read it there instead.
+MMAP = os.name != 'nt'
+
+# Side of one histogram cell, in LBP pixels.
+_CELL = (FACE_SIZE - 2) // GRID
+
+
+def _uniform_table():
+    """Maps the 256 LBP codes to 59 bins: one per uniform pattern, one for the rest."""
+    table = np.full(256, 58, dtype=np.int64)
+    next_bin = 0
+    for code in range(256):
+        bits = [(code >> i) & 1 for i in range(8)]
+        transitions = sum(bits[i] != bits[(i + 1) % 8] for i in range(8))
+        if transitions <= 2:
+            table[code] = next_bin
+            next_bin += 1
+    return table
+
+
+UNIFORM = _uniform_table()
+BINS = 59
+DIMENSIONS = GRID * GRID * BINS
+
+# Clockwise neighbours starting top-left, as (row, column) offsets.
+_NEIGHBOURS = ((-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1))
+
+# Which grid cell every LBP pixel falls into.
+_cells = np.minimum(np.arange(FACE_SIZE - 2) // _CELL, GRID - 1)
+_CELL_MAP = (_cells[:, None] * GRID + _cells[None, :]).ravel()
+_CELL_PIXELS = np.bincount(_CELL_MAP, minlength=GRID * GRID).astype(np.float32)
+
+
+def describe(faces):
+    """Returns an (n, DIMENSIONS) float32 matrix of LBP grid histograms for grayscale crops.
+
+    Each cell histogram is normalized to sum to one.
+    """
+    if not len(faces):
+        return np.zeros((0, DIMENSIONS), dtype=np.float32)
+
+    batch = np.stack([cv2.resize(np.asarray(face, dtype=np.uint8), (FACE_SIZE, FACE_SIZE))
+                      for face in faces]).astype(np.int16)
+    center = batch[:, 1:-1, 1:-1]
+    codes = np.zeros(center.shape, dtype=np.int64)
+    for bit, (dy, dx) in enumerate(_NEIGHBOURS):
+        neighbour = batch[:, 1 + dy:FACE_SIZE - 1 + dy, 1 + dx:FACE_SIZE - 1 + dx]
+        codes |= (neighbour >= center).astype(np.int64) << bit
+
+    n = len(batch)
+    slots = (np.arange(n)[:, None] * (GRID * GRID) + _CELL_MAP[None, :]) * BINS
+    slots = slots + UNIFORM[codes.reshape(n, -1)]
+    counts = np.bincount(slots.ravel(), minlength=n * DIMENSIONS).astype(np.float32)
+    histograms = counts.reshape(n, GRID * GRID, BINS) / _CELL_PIXELS[None, :, None]
+    return histograms.reshape(n, DIMENSIONS)
+
+
+def chi_square(a, b):
+    """Chi-square distance along the last axis (broadcasting), scaled to [0, 2]."""
+    terms = a - b
+    terms *= terms
+    total = a + b
+    # Bins empty in both histograms have a zero numerator; the epsilon only avoids 0/0.
+    total += np.float32(1e-12)
+    terms /= total
+    return terms.sum(axis=-1) / (GRID * GRID)
+
+
+class FaceIndex:
+    """Enrolled face samples with their labels and display names.
+
+    labels are the numeric user IDs used by the sample files
+    (face.<id>.<n>.jpg); names maps an ID to the name spoken on a match.
+    """
+
+    def __init__(self, roots=None, labels=None, names=None):
+        self.roots = np.zeros((0, DIMENSIONS), dtype=np.float32) if roots is None else roots
+        self.labels = np.zeros(0, dtype=np.int32) if labels is None else labels
+        self.names = dict(names or {})
+
+    @classmethod
+    def build(cls, faces, labels, names=None, batch=256):
+        """Creates an index from parallel lists of grayscale face crops and their labels."""
+        histograms = [describe(faces[start:start + batch]) for start in range(0, len(faces), batch)]
+        histograms = np.vstack(histograms) if histograms else np.zeros((0, DIMENSIONS), dtype=np.float32)
+        return cls(np.sqrt(histograms), np.asarray(labels, dtype=np.int32), names)
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def identities(self):
+        return len(np.unique(self.labels))
+
+    def add(self, label, faces, batch=256):
+        """Enrolls grayscale face crops under label, describing them batch at a time."""
+        for start in range(0, len(faces), batch):
+            self.add_histograms(label, describe(faces[start:start + batch]))
+
+    def add_histograms(self, label, histograms):
+        """Enrolls precomputed describe() rows under label."""
+        self.roots = np.ascontiguousarray(np.vstack([self.roots, np.sqrt(histograms, dtype=np.float32)]))
+        self.labels = np.concatenate([self.labels, np.full(len(histograms), label, dtype=np.int32)])
+
+    def name(self, label):
+        return self.names.get(int(label), f"User {label}")
+
+    def search(self, histograms, k=1, shortlist=SHORTLIST):
+        """Finds the k closest identities for every row of histograms.
+
+        Returns (labels, distances), both (n, k) arrays sorted by distance;
+        distance is the chi-square distance to that identity's closest
+        sample. Missing entries (fewer than k identities) are -1 and inf.
+        """
+        n = len(histograms)
+        labels = np.full((n, k), -1, dtype=np.int32)
+        distances = np.full((n, k), np.inf, dtype=np.float32)
+        if n == 0 or len(self) == 0:
+            return labels, distances
+
+        if len(self) > shortlist:
+            similarity = np.sqrt(histograms, dtype=np.float32) @ self.roots.T
+            candidates = np.argpartition(-similarity, shortlist - 1, axis=1)[:, :shortlist]
+        else:
+            candidates = np.broadcast_to(np.arange(len(self)), (n, len(self)))
+
+        # Re-rank in blocks of faces so the (faces, candidates, dims) temporary stays small.
+        block = max(1, BLOCK_ELEMENTS // (candidates.shape[1] * DIMENSIONS))
+        scores = np.vstack([chi_square(histograms[i:i + block, None, :], self.roots[candidates[i:i + block]] ** 2)
+                            for i in range(0, n, block)])
+        order = np.argsort(scores, axis=1)
+        ranked_scores = np.take_along_axis(scores, order, axis=1)
+        ranked_labels = self.labels[np.take_along_axis(candidates, order, axis=1)]
+
+        for i in range(n):
+            # First occurrence of each label in distance order is its best sample.
+            _, first = np.unique(ranked_labels[i], return_index=True)
+            best = np.sort(first)[:k]
+            labels[i, :len(best)] = ranked_labels[i, best]
+            distances[i, :len(best)] = ranked_scores[i, best]
+        return labels, distances
+
+    def classify(self, faces, threshold):
+        """Matches every face crop from one frame in a single call.
+
+        Returns a list of (label, name, distance); label is None when the
+        closest identity is further than threshold.
+        """
+        labels, distances = self.search(describe(faces), k=1)
+        results = []
+        for label, distance in zip(labels[:, 0], distances[:, 0]):
+            if label >= 0 and distance <= threshold:
+                results.append((int(label), self.name(label), float(distance)))
+            else:
+                results.append((None, "unknown", float(distance)))
+        return results
+
+    def save(self, path):
+        """Writes the index in the binary format, replacing path only once the new file is complete."""
+        names = json.dumps({str(label): name for label, name in sorted(self.names.items())}).encode('utf-8')
+        header = _HEADER.pack(MAGIC, VERSION, DIMENSIONS, len(self), len(names))
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(np.ascontiguousarray(self.roots, dtype=np.float32).tobytes())
+            f.write(np.ascontiguousarray(self.labels, dtype=np.int32).tobytes())
+            f.write(names)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path, mmap=MMAP):
+        """Reads an index written by save(), mapping its matrix unless mmap is False, or an older .npz file."""
+        with open(path, 'rb') as f:
+            head = f.read(HEADER_SIZE)
+            if not head.startswith(MAGIC):
+                return cls._load_npz(path)
+            _, version, dimensions, count, names_size = _HEADER.unpack_from(head)
+            if version != VERSION or dimensions != DIMENSIONS:
+                raise ValueError(f"{path}: face index version {version} with {dimensions} dimensions, "
+                                 f"expected version {VERSION} with {DIMENSIONS}")
+            labels_at = HEADER_SIZE + count * DIMENSIONS * 4
+            if mmap and count:
+                roots = np.memmap(path, dtype=np.float32, mode='r', offset=HEADER_SIZE, shape=(count, DIMENSIONS))
+            else:
+                roots = np.fromfile(f, dtype=np.float32, count=count * DIMENSIONS).reshape(count, DIMENSIONS)
+            f.seek(labels_at)
+            labels = np.fromfile(f, dtype=np.int32, count=count)
+            names = json.loads(f.read(names_size).decode('utf-8'))
+        if len(labels) != count or len(roots) != count:
+            raise ValueError(f"{path}: face index is truncated")
+        return cls(roots, labels, {int(label): name for label, name in names.items()})
+
+    @classmethod
+    def _load_npz(cls, path):
+        with np.load(path) as data:
+            names = dict(zip(data['name_ids'].tolist(), data['name_values'].tolist()))
+            return cls(np.ascontiguousarray(data['roots']), data['labels'], names)
@@ -0,0 +1,70 @@
+"""The face model, loaded once and reloaded in the background when Model Trainer.py replaces it."""
+import os
+import threading
+
+POLL_SECONDS = 2.0
+
+
+class ResidentModel:
+    """The model load(path) returns, reloaded in the background whenever the file at path changes."""
+
+    def __init__(self, path, load, poll=POLL_SECONDS):
+        self.path = path
+        self.load = load
+        self.poll = poll
+        self.model = None
+        self.version = None
+        self.failed = None
+        self.reloads = 0
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def get(self):
+        """The current model, loading it on first use; load errors propagate then."""
+        if self.model is None:
+            with self.lock:
+                if self.model is None:
+                    version = self._version()
+                    self.model = self.load(self.path)
+                    self.version = version
+        return self.model
+
+    def start(self):
+        """Starts watching the file, unless poll is 0."""
+        if self.poll and self.thread is None:
+            self.thread = threading.Thread(target=self._watch, name="face-model", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def refresh(self):
+        """Reloads the model if the file changed since it was loaded; returns whether it did."""
+        version = self._version()
+        if version is None or version in (self.version, self.failed):
+            return False
+        try:
+            model = self.load(self.path)
+        except Exception as e:
+            print(f"Could not reload {self.path}, keeping the loaded face model: {e}")
+            self.failed = version
+            return False
+        with self.lock:
+            self.model, self.version = model, version
+            self.reloads += 1
+        print(f"Reloaded the face model from {self.path}")
+        return True
+
+    def _version(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _watch(self):
+        while not self.stopping.wait(self.poll):
+            self.refresh()
@@ -0,0 +1,91 @@
+"""Haar cascade face detection that does not re-scan the whole frame.
+
+Between two webcam frames the user's face barely moves, yet running
+detectMultiScale over the full 640x480 frame costs most of a frame's
+budget. FaceTracker cuts that down in two ways:
+
+- every pass runs on a copy downscaled by `scale`, and the boxes are mapped
+  back to full-frame coordinates,
+- once a face is found, the next frames search only a region around the
+  last box (grown by `padding` times its size on every side) and only for
+  faces of about the same size. The whole frame is scanned again every
+  `rescan_every` frames, to pick up newcomers, and immediately when the
+  face is lost.
+
+benchmarks/face_detect_bench.py measures frames per second and recall for
+a grid of these parameters and prints the best setting for config.py.
+"""
+import cv2
+import numpy as np
+
+SCALE = 0.5
+PADDING = 0.5
+RESCAN_EVERY = 15
+SCALE_FACTOR = 1.2
+MIN_NEIGHBORS = 5
+# In the region around a known face, only sizes within this factor of it are searched.
+SIZE_TOLERANCE = 1.5
+
+
+class FaceTracker:
+    """Finds faces in consecutive grayscale frames of one camera.
+
+    detect(gray) returns the (x, y, w, h) boxes in full-frame pixels, like
+    detectMultiScale. min_size is the smallest face, in full-frame pixels.
+    """
+
+    def __init__(self, cascade, min_size=(0, 0), scale=SCALE, padding=PADDING,
+                 rescan_every=RESCAN_EVERY, scale_factor=SCALE_FACTOR, min_neighbors=MIN_NEIGHBORS):
+        self.cascade = cascade
+        self.min_size = min_size
+        self.scale = scale
+        self.padding = padding
+        self.rescan_every = rescan_every
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.boxes = []
+        self.since_full_scan = 0
+        self.stats = {"frames": 0, "full_scans": 0, "region_scans": 0}
+
+    def reset(self):
+        """Forgets the last faces, so the next frame is scanned in full."""
+        self.boxes = []
+
+    def detect(self, gray):
+        self.stats["frames"] += 1
+        self.since_full_scan += 1
+
+        found = []
+        if self.boxes and self.since_full_scan < self.rescan_every:
+            for box in self.boxes:
+                found.extend(self._search_region(gray, box))
+        if not found:
+            found = self._search(gray, 0, 0, self.min_size, None)
+            self.since_full_scan = 0
+            self.stats["full_scans"] += 1
+
+        self.boxes = found
+        return np.array(found, dtype=np.int32).reshape(-1, 4)
+
+    def _search_region(self, gray, box):
+        x, y, w, h = box
+        height, width = gray.shape[:2]
+        pad_w, pad_h = int(w * self.padding), int(h * self.padding)
+        x0, y0 = max(0, x - pad_w), max(0, y - pad_h)
+        x1, y1 = min(width, x + w + pad_w), min(height, y + h + pad_h)
+        self.stats["region_scans"] += 1
+        min_size = (max(self.min_size[0], int(w / SIZE_TOLERANCE)), max(self.min_size[1], int(h / SIZE_TOLERANCE)))
+        max_size = (int(w * SIZE_TOLERANCE), int(h * SIZE_TOLERANCE))
+        return self._search(gray[y0:y1, x0:x1], x0, y0, min_size, max_size)
+
+    def _search(self, gray, offset_x, offset_y, min_size, max_size):
+        """Runs the cascade on gray downscaled by self.scale; returns full-frame boxes."""
+        s = self.scale
+        if s != 1.0:
+            gray = cv2.resize(gray, None, fx=s, fy=s, interpolation=cv2.INTER_AREA)
+        kwargs = {"minSize": (int(min_size[0] * s), int(min_size[1] * s))}
+        if max_size is not None:
+            kwargs["maxSize"] = (int(max_size[0] * s), int(max_size[1] * s))
+        faces = self.cascade.detectMultiScale(gray, scaleFactor=self.scale_factor,
+                                              minNeighbors=self.min_neighbors, **kwargs)
+        return [(int(x / s) + offset_x, int(y / s) + offset_y, int(w / s), int(h / s)) for (x, y, w, h) in faces]
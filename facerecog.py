@@ -1,18 +1,23 @@
 import cv2
 
-recognizer = cv2.face.LBPHFaceRecognizer_create() # Local Binary Patterns Histograms
-recognizer.read('trainer/trainer.yml')   #load trained model
+from face_index import FaceIndex
+from face_tracker import FaceTracker
+
+try:
+    from config import FACE_MATCH_THRESHOLD as threshold # largest chi-square distance accepted as a match
+except ImportError:
+    threshold = None
+if threshold is None:
+    # face_index.MATCH_THRESHOLD only suits synthetic faces; calibrate on your own photos first
+    raise SystemExit("Set FACE_MATCH_THRESHOLD in config.py from: python -m benchmarks.face_index_bench --dataset samples")
+
+index = FaceIndex.load('trainer/faces.fidx')   #load enrollment index written by Model Trainer.py
 cascadePath = "haarcascade_frontalface_default.xml"
 faceCascade = cv2.CascadeClassifier(cascadePath) #initializing haar cascade for object detection approach
 
 font = cv2.FONT_HERSHEY_SIMPLEX #denotes the font type
 
-
-id = 2 #number of persons you want to Recognize
-
-
-names = ['','Tushar']  #names, leave first empty bcz counter starts from 0
-names2 = ['', 'Tanishka']
+print(f"{index.identities} enrolled identities")
 
 cam = cv2.VideoCapture(0, cv2.CAP_DSHOW) #cv2.CAP_DSHOW to remove warning
 cam.set(3, 640) # set video FrameWidht
@@ -22,6 +27,9 @@ cam.set(4, 480) # set video FrameHeight
 minW = 0.1*cam.get(3)
 minH = 0.1*cam.get(4)
 
+# Scans a downscaled frame, then only the region around the last face; see face_tracker.py
+tracker = FaceTracker(faceCascade, (int(minW), int(minH)))
+
 # flag = True
 
 while True:
@@ -30,31 +38,21 @@ while True:
 
     converted_image = cv2.cvtColor(img,cv2.COLOR_BGR2GRAY)  #The function converts an input image from one color space to another
 
-    faces = faceCascade.detectMultiScale( 
-        converted_image,
-        scaleFactor = 1.2,
-        minNeighbors = 5,
-        minSize = (int(minW), int(minH)),
-       )
+    faces = tracker.detect(converted_image)
 
-    for(x,y,w,h) in faces:
+    crops = [converted_image[y:y+h,x:x+w] for (x,y,w,h) in faces]
+    matches = index.classify(crops, threshold) if crops else [] #every face in the frame in one call
 
-        cv2.rectangle(img, (x,y), (x+w,y+h), (0,255,0), 2) #used to draw a rectangle on any image
+    for (x,y,w,h), (label, name, distance) in zip(faces, matches):
 
-        id, accuracy = recognizer.predict(converted_image[y:y+h,x:x+w]) #to predict on every single image
+        cv2.rectangle(img, (x,y), (x+w,y+h), (0,255,0), 2) #used to draw a rectangle on any image
 
-        # Check if accuracy is less them 100 ==> "0" is perfect match 
-        if (accuracy < 100):
-            id = names[id]
-            accuracy = "  {0}%".format(round(100 - accuracy))
+        if label is not None:
             print("verification successful")
-
         else:
-            id = "unknown"
-            accuracy = "  {0}%".format(round(100 - accuracy))
             print("cannot verify")
-        cv2.putText(img, str(id), (x+5,y-5), font, 1, (255,255,255), 2)
-        cv2.putText(img, str(accuracy), (x+5,y+h-5), font, 1, (255,255,0), 1)  
+        cv2.putText(img, str(name), (x+5,y-5), font, 1, (255,255,255), 2)
+        cv2.putText(img, "  {0:.2f}".format(distance), (x+5,y+h-5), font, 1, (255,255,0), 1)  
     
     cv2.imshow('camera',img) 
 
@@ -0,0 +1,131 @@
+"""A flight recorder for Friday's last interactions, dumped when a command fails or on request."""
+import base64
+import contextlib
+import datetime
+import gzip
+import itertools
+import json
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import CancelledError
+
+FORMAT = "friday-flight-record"
+VERSION = 1
+SIZE = 50
+
+
+class FlightRecorder:
+    """The last `size` interactions; dumps go to files in directory."""
+
+    def __init__(self, size=SIZE, keep_audio=False, directory='flight_records'):
+        self.entries = deque(maxlen=size)
+        self.keep_audio = keep_audio
+        self.directory = directory
+        self.ids = itertools.count(1)
+        self.local = threading.local()
+
+    @contextlib.contextmanager
+    def record(self, transcript, audio=None, timings=None):
+        """Records one command; the body fills in the entry it is given.
+
+        An exception escaping the body is stored on the entry, the buffer
+        is dumped and the exception re-raised. A CancelledError (the user
+        talked over Friday) is only marked as interrupted.
+        """
+        entry = {"id": next(self.ids), "at": time.time(), "transcript": transcript, "route": None,
+                 "trigger": None, "tier": None, "tools": [], "response": None, "error": None,
+                 "status": "ok", "timings": dict(timings or {}),
+                 "audio": audio if self.keep_audio else None}
+        self.entries.append(entry)
+        self.local.entry = entry
+        started = time.perf_counter()
+        try:
+            yield entry
+        except CancelledError:
+            entry["status"] = "interrupted"
+            raise
+        except Exception as e:
+            entry["timings"]["dispatch_ms"] = _elapsed_ms(started)
+            entry["status"] = "error"
+            entry["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+            entry["traceback"] = traceback.format_exc()
+            try:
+                print(f"Flight recorder saved to {self.dump(reason=entry['error'])}")
+            except OSError as dump_error:
+                print(f"Could not save the flight recorder: {dump_error}")
+            raise
+        finally:
+            entry["timings"]["dispatch_ms"] = _elapsed_ms(started)
+            self.local.entry = None
+
+    def current(self):
+        """The entry being recorded on this thread, or None."""
+        return getattr(self.local, "entry", None)
+
+    @contextlib.contextmanager
+    def attach(self, entry):
+        """Makes entry the current one on this thread too, for work a command hands to other threads."""
+        previous = self.current()
+        self.local.entry = entry
+        try:
+            yield entry
+        finally:
+            self.local.entry = previous
+
+    def note(self, **fields):
+        """Sets fields on the current entry, if any."""
+        entry = self.current()
+        if entry is not None:
+            entry.update(fields)
+
+    def tool_call(self, name, args, result, seconds, error=None):
+        """Adds a handler call, with its arguments and result or error, to the current entry."""
+        entry = self.current()
+        if entry is not None:
+            entry["tools"].append({"name": name, "args": dict(args), "result": result, "error": error,
+                                   "ms": round(seconds * 1000, 2)})
+
+    def dump(self, path=None, reason=None):
+        """Writes the buffer to path (by default a new file in directory) and returns the path.
+
+        The file is gzip-compressed JSON lines: a header, then one entry per
+        line, oldest first, audio as base64 WAV.
+        """
+        if path is None:
+            os.makedirs(self.directory, exist_ok=True)
+            stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            path = os.path.join(self.directory, f"friday-{stamp}.jsonl.gz")
+        header = {"format": FORMAT, "version": VERSION, "reason": reason, "dumped_at": time.time()}
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(header) + "\n")
+            for entry in list(self.entries):
+                f.write(json.dumps(_serializable(entry), default=str) + "\n")
+        return path
+
+
+def load(path):
+    """Reads a dump back: (header, entries); audio comes back as WAV bytes."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a flight recorder dump")
+        entries = [json.loads(line) for line in f if line.strip()]
+    for entry in entries:
+        if entry.get("audio"):
+            entry["audio"] = base64.b64decode(entry["audio"])
+    return header, entries
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _serializable(entry):
+    entry = dict(entry)
+    audio = entry["audio"]
+    if audio is not None:
+        entry["audio"] = base64.b64encode(audio.get_wav_data()).decode("ascii")
+    return entry
@@ -0,0 +1,350 @@
+"""Offline intent classifier: picks a function_map handler without Gemini.
+
+Queries that miss local_command_map used to cost a Gemini call just so the
+model could choose one of the declared tools. This module does that choice
+locally:
+
+- text is turned into hashed word unigrams, bigrams and character trigrams
+  (no vocabulary to store, unseen words still land somewhere),
+- a ridge-regression linear model, one output per handler plus "chat" for
+  open-ended questions, is trained in closed form from the tool
+  descriptions and the phrase corpus below,
+- the phrase templates double as slot extractors, so "weather in mumbai"
+  becomes handle_weather(city="mumbai").
+
+Training takes about 20 ms and a prediction well under one on a CPU, so the
+classifier is simply rebuilt at startup. Only confident predictions whose
+required slots were all found are returned; everything else goes to Gemini.
+"""
+import re
+import threading
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+DIMENSIONS = 1 << 12
+RIDGE = 0.5
+# A prediction is used only if its score clears MIN_SCORE and beats the runner-up by MIN_MARGIN.
+MIN_SCORE = 0.45
+MIN_MARGIN = 0.25
+CHAT = "chat"
+# A wrong guess at these does more than waste an answer: it ends the
+# session, runs a long speed test or overwrites the saved note. They need a
+# higher score and margin, and every word of the query outside their slots
+# must appear in their own phrases or tool description ("sleep well" is chat).
+SIDE_EFFECTS = {"handle_sleep", "handle_internet_speed", "handle_remember"}
+SIDE_EFFECT_SCORE = 0.5
+SIDE_EFFECT_MARGIN = 0.35
+# Words a template may follow: the wake word and fillers. Anything else in
+# front of a template ("remember to check the weather in delhi") is no match.
+LEAD_IN = ["friday", "hey", "hi", "ok", "okay", "so", "and", "then", "also", "now", "please", "just",
+           "um", "uh", "oh", "well", "can you", "could you", "would you", "will you", "tell me",
+           "show me", "give me", "the"]
+
+Intent = namedtuple("Intent", "name args confidence")
+
+# Slots with a closed vocabulary. Any other slot is free text.
+SLOT_PATTERNS = {
+    "direction": r"up|down|mute",
+    "category": r"business|entertainment|general|health|science|sports|technology|tech",
+    "country": r"in|us|gb|au|ca",
+    "target_language": r"hindi|english|french|spanish|german|italian|portuguese|russian|japanese|chinese|"
+                       r"korean|arabic|bengali|tamil|telugu|marathi|gujarati|punjabi|urdu|kannada|malayalam",
+    # The sites handle_open_web has URLs for.
+    "site_name": r"gmail|google|instagram|facebook|chat|wikipedia",
+    # A quantity has to be there: "5 miles to km", "an inch in centimeters".
+    "conversion_query": r".*(?:\d|\b(?:a|an|one)\b).*",
+    "app_name": r"code|vs code|visual studio code|notepad",
+}
+
+# Phrases per handler, the way speech recognition returns them (lowercase,
+# no wake word). {slot} marks a parameter; a (phrase, {slot: value}) pair
+# fixes a parameter the phrase implies.
+CORPUS = {
+    "handle_wikipedia": [
+        "search wikipedia for {topic}", "look up {topic} on wikipedia", "{topic} on wikipedia",
+        "what does wikipedia say about {topic}", "wikipedia summary of {topic}",
+        "according to wikipedia who is {topic}",
+    ],
+    "handle_youtube": [
+        "play {search_query} on youtube", "search youtube for {search_query}",
+        "find {search_query} on youtube", "open youtube and play {search_query}",
+        "put on {search_query} on youtube", "watch {search_query} on youtube",
+    ],
+    "handle_google": [
+        "search google for {search_query}", "search for {search_query}", "look up {search_query}",
+        "google search {search_query}", "find {search_query} on google",
+        "search the web for {search_query}", "search for python tutorials", "google best pizza near me",
+    ],
+    "handle_open_web": [
+        "open {site_name} website", "open the {site_name} website", "go to {site_name}",
+        "open {site_name} dot com", "launch {site_name} in the browser", "take me to {site_name}",
+        "open {site_name} in chrome",
+    ],
+    "handle_open_app": [
+        "open {app_name}", "launch {app_name}", "start {app_name}", "run {app_name}",
+        "open the {app_name} app", "open the {app_name} editor",
+    ],
+    "handle_open_camera": [
+        "open the camera", "open camera", "turn on the webcam", "start the webcam",
+        "show me the camera", "launch the camera",
+    ],
+    "handle_battery": [
+        "how much battery is left", "what is the battery percentage", "battery status",
+        "how much charge do i have", "check the battery", "is my laptop charged",
+    ],
+    "handle_internet_speed": [
+        "check my internet speed", "how fast is the internet", "run a speed test",
+        "test the internet connection speed", "what's my download speed", "internet speed test",
+        "how fast is my wifi", "connection speed",
+    ],
+    "handle_screenshot": [
+        "take a screenshot", "capture the screen", "grab a screenshot", "screenshot please",
+        "save a picture of the screen", "take a screen capture",
+    ],
+    "handle_volume": [
+        "turn the volume {direction}", "volume {direction}", "turn {direction} the volume",
+        ("increase the volume", {"direction": "up"}), ("make it louder", {"direction": "up"}),
+        ("raise the volume", {"direction": "up"}), ("decrease the volume", {"direction": "down"}),
+        ("lower the volume", {"direction": "down"}), ("make it quieter", {"direction": "down"}),
+        ("mute the sound", {"direction": "mute"}), ("silence the speakers", {"direction": "mute"}),
+        ("mute the volume", {"direction": "mute"}), ("louder", {"direction": "up"}),
+        ("quieter", {"direction": "down"}),
+    ],
+    "handle_sleep": [
+        "go to sleep", "you can sleep now", "goodbye", "stop listening", "that's all for now",
+        "shut down the assistant",
+    ],
+    "handle_time": [
+        "what time is it", "what's the time", "tell me the time", "current time",
+        "what is the time now", "do you know what time it is",
+    ],
+    "handle_convert": [
+        "convert {conversion_query}", "how many {conversion_query}", "change {conversion_query}",
+        "unit conversion {conversion_query}", "convert 10 meters to feet", "convert 5 kilograms to pounds",
+        "how many centimeters in an inch", "what is 100 fahrenheit in celsius",
+    ],
+    "handle_translate": [
+        "translate {text} to {target_language}", "translate {text} into {target_language}",
+        "how do you say {text} in {target_language}", "what is {text} in {target_language}",
+        "say {text} in {target_language}", "translate good morning to hindi",
+        "translate thank you into french", "what is hello in spanish",
+    ],
+    "handle_remember": [
+        "remember that {text_to_remember}", "remember {text_to_remember}",
+        "please remember that {text_to_remember}", "make a note that {text_to_remember}",
+        "don't forget that {text_to_remember}", "keep in mind that {text_to_remember}",
+    ],
+    "handle_recall": [
+        "what did i ask you to remember", "what do you remember", "what did i tell you to remember",
+        "recall my note", "remind me what i told you", "do you remember anything",
+    ],
+    "handle_read_pdf": [
+        "read the pdf {pdf_name}", "read {pdf_name} pdf", "read my {pdf_name} pdf",
+        "open and read the {pdf_name} pdf", "read the document {pdf_name}",
+    ],
+    "handle_weather": [
+        "what's the weather in {city}", "what is the weather in {city}", "weather in {city}",
+        "how is the weather in {city}", "temperature in {city}", "is it raining in {city}",
+        "how hot is it in {city}", "weather forecast for {city}", "what's the weather like in {city}",
+        "is it going to rain in {city}", "how cold is it in {city}",
+    ],
+    "handle_news": [
+        "give me the {category} news", "{category} news", "latest {category} headlines",
+        "what's in the news", "tell me the news", "top headlines", "read me the headlines",
+        "any {category} news today", "news headlines", "what are the headlines",
+    ],
+    "handle_play_music": [
+        "play some music", "play a song", "put on some music", "play my music",
+        "i want to listen to music", "play something",
+    ],
+    "handle_joke": [
+        "tell me a joke", "make me laugh", "say something funny", "do you know any jokes",
+        "tell me a programming joke", "i want to hear a joke",
+    ],
+    "handle_wikihow": [
+        "how do i {task}", "how can i {task}", "teach me how to {task}", "show me how to {task}",
+        "what's the best way to {task}", "guide to {task}", "how do i tie a tie",
+        "how can i bake bread", "steps to change a tyre",
+    ],
+    CHAT: [
+        "tell me something about mars", "who created you", "how are you", "what can you do",
+        "who are you", "what is the meaning of life", "explain quantum physics",
+        "why is the sky blue", "write a poem about rain", "what should i eat for dinner",
+        "tell me a story", "what do you think about artificial intelligence",
+        "who won the world cup", "what is the capital of india", "give me some advice",
+        "summarize the french revolution", "what is love", "are you a robot",
+        "good morning", "thank you", "what is machine learning", "describe the solar system",
+        "how does a car engine work", "which is the tallest mountain", "what time is it in new york",
+        "what's the time in tokyo", "current time in sydney", "what is the time in paris right now",
+        "how many people live in china", "how many players are in a football team",
+        "how many planets are there",
+        "what's happening in the world", "how do i look", "what is the speed of light",
+        "set an alarm for 7",
+    ],
+}
+
+_WORD = re.compile(r"[a-z0-9']+")
+_SLOT = re.compile(r"\{(\w+)\}")
+_FILLER_TAIL = re.compile(r"(?:\s+(?:please|now|right now|today|for me))+$")
+_LEAD_IN = "(?:(?:" + "|".join(re.escape(words) for words in LEAD_IN) + r")\s+)*"
+_LEAD_IN_RE = re.compile("^" + _LEAD_IN)
+
+
+def normalize(text):
+    text = re.sub(r"[^a-z0-9' .]+", " ", text.lower())
+    text = re.sub(r"\s+", " ", text).strip(" .")
+    return _FILLER_TAIL.sub("", text)
+
+
+def _features(text):
+    """Feature names of one text: words, word bigrams and character trigrams."""
+    words = _WORD.findall(_SLOT.sub(" ", text))
+    names = [f"w:{w}" for w in words]
+    names += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"<{w}>"
+        names += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return names
+
+
+def vectorize(texts):
+    """Hashed, signed, L2-normalized feature rows, shape (len(texts), DIMENSIONS)."""
+    rows, columns, values = [], [], []
+    for row, text in enumerate(texts):
+        for name in _features(text):
+            h = zlib.crc32(name.encode())
+            weight = 0.5 if name[0] == "c" else 1.0
+            rows.append(row)
+            columns.append(h & (DIMENSIONS - 1))
+            values.append(weight if h & DIMENSIONS else -weight)
+    matrix = np.zeros((len(texts), DIMENSIONS), dtype=np.float32)
+    np.add.at(matrix, (rows, columns), values)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _template_regex(template):
+    """'weather in {city}' -> a regex with a named group per slot, matching the whole query.
+
+    Only LEAD_IN words may come before the template. Like queries, templates
+    lose their filler tail ("any {category} news today").
+    """
+    template = _FILLER_TAIL.sub("", template)
+    parts, last = [], 0
+    for m in _SLOT.finditer(template):
+        parts.append(re.escape(template[last:m.start()]))
+        parts.append(f"(?P<{m.group(1)}>{SLOT_PATTERNS.get(m.group(1), '.+?')})")
+        last = m.end()
+    parts.append(re.escape(template[last:]))
+    return re.compile("^" + _LEAD_IN + "".join(parts) + "$")
+
+
+class IntentClassifier:
+    """Ridge-regression classifier over hashed n-grams, with template slot filling."""
+
+    def __init__(self, corpus=CORPUS, tools=None, ridge=RIDGE):
+        texts, labels = [], []
+        self.templates, self.required = {}, {}
+        # Words of each intent's phrases, for the SIDE_EFFECTS check.
+        self.vocabulary = {}
+        for name, phrases in corpus.items():
+            self.templates[name] = []
+            self.vocabulary[name] = set()
+            slots = set()
+            for phrase in phrases:
+                template, fixed = phrase if isinstance(phrase, tuple) else (phrase, {})
+                texts.append(template)
+                labels.append(name)
+                self.templates[name].append((_template_regex(template), fixed))
+                self.vocabulary[name].update(_WORD.findall(_SLOT.sub(" ", template)))
+                slots.update(_SLOT.findall(template), fixed)
+            self.required[name] = sorted(slots)
+        # Without tools every slot a template mentions is required. The Gemini
+        # declarations say which really are, and add their descriptions as examples.
+        for tool in tools or []:
+            for declaration in tool.get("function_declarations", []):
+                name = declaration["name"]
+                self.required[name] = declaration.get("parameters", {}).get("required", [])
+                if name in corpus:
+                    texts.append(declaration["description"].lower())
+                    labels.append(name)
+                    self.vocabulary[name].update(_WORD.findall(texts[-1]))
+
+        self.names = list(corpus)
+        targets = np.zeros((len(texts), len(self.names)), dtype=np.float32)
+        targets[np.arange(len(texts)), [self.names.index(label) for label in labels]] = 1
+        features = vectorize(texts)
+        # Dual form: the Gram matrix is samples x samples, far smaller than DIMENSIONS squared.
+        gram = features @ features.T + ridge * np.eye(len(texts), dtype=np.float32)
+        self.weights = features.T @ np.linalg.solve(gram, targets)
+
+    def scores(self, text):
+        """Score per intent name for one query."""
+        return dict(zip(self.names, (vectorize([normalize(text)]) @ self.weights)[0]))
+
+    def classify(self, text):
+        """Returns (best intent name, score, margin over the runner-up)."""
+        scores = (vectorize([normalize(text)]) @ self.weights)[0]
+        second, best = np.argsort(scores)[-2:]
+        return self.names[best], float(scores[best]), float(scores[best] - scores[second])
+
+    def extract(self, name, text):
+        """(slot values, query with the slot values cut out) for intent name, or None.
+
+        The first template of the intent that matches and fills every
+        required parameter wins.
+        """
+        text = normalize(text)
+        required = self.required.get(name, [])
+        for regex, fixed in self.templates.get(name, []):
+            match = regex.match(text)
+            if match:
+                args = {**{k: v.strip() for k, v in match.groupdict().items() if v}, **fixed}
+                if all(args.get(slot) for slot in required):
+                    literal = text
+                    for slot in sorted(match.re.groupindex, key=match.start, reverse=True):
+                        if match.start(slot) >= 0:
+                            literal = literal[:match.start(slot)] + literal[match.end(slot):]
+                    return args, literal
+        return None if required else ({}, text)
+
+    def _known_words(self, name, text):
+        """Whether every word of text after the LEAD_IN words occurs in intent name's phrases."""
+        return set(_WORD.findall(_LEAD_IN_RE.sub("", text))) <= self.vocabulary[name]
+
+    def predict(self, text):
+        """An Intent to run locally, or None when the query should go to the LLM."""
+        name, score, margin = self.classify(text)
+        if name == CHAT:
+            return None
+        found = self.extract(name, text)
+        if found is None:
+            return None
+        args, literal = found
+        if literal != normalize(text):
+            # Long free-text slots ("remember that ...") drown out the words that
+            # pick the handler; the training phrases have no slot values either.
+            name_again, score, margin = self.classify(literal)
+            if name_again != name:
+                return None
+        if score < MIN_SCORE or margin < MIN_MARGIN:
+            return None
+        if name in SIDE_EFFECTS and (score < SIDE_EFFECT_SCORE or margin < SIDE_EFFECT_MARGIN
+                                     or not self._known_words(name, literal)):
+            return None
+        return Intent(name, args, round(margin, 3))
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier(tools=None):
+    """The process-wide classifier, trained on first use."""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = IntentClassifier(tools=tools)
+        return _classifier
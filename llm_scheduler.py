@@ -0,0 +1,220 @@
+"""Quota-aware scheduling of Gemini requests.
+
+Every request to Gemini spends quota (2 a minute on the free tier), so
+they all go through one LLMScheduler per process:
+
+- a token bucket releases requests at the configured rate, with a small
+  burst, in the order they were submitted,
+- a rate-limit error (HTTP 429) empties the bucket and puts the request
+  back in the queue with exponential backoff; once the retries run out the
+  caller gets QuotaExceeded instead of a generic error,
+- a request that could not be sent within max_wait seconds fails fast
+  with QuotaExceeded, so the assistant can say so instead of going quiet,
+- a request whose Future is cancelled before it is sent (the user talked
+  over Friday) is dropped without spending quota.
+
+metrics() reports quota spend and queue depth.
+"""
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 2.0
+
+
+class QuotaExceeded(Exception):
+    """The request could not be sent within the quota. retry_after is in seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Gemini quota exceeded, retry in {retry_after:.0f} s")
+        self.retry_after = retry_after
+
+
+def is_rate_limited(error):
+    """True for Gemini's 429 (google.api_core ResourceExhausted) and anything else carrying HTTP 429."""
+    return (getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429
+            or type(error).__name__ in ("ResourceExhausted", "TooManyRequests"))
+
+
+class TokenBucket:
+    """rate_per_minute tokens a minute, at most capacity saved up. Not thread-safe on its own."""
+
+    def __init__(self, rate_per_minute, capacity, clock=time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self):
+        """Takes a token and returns 0, or returns the seconds until one is available."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self):
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def drain(self):
+        """The server says we are over quota: start saving up from zero."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+    def available(self):
+        self._refill()
+        return self.tokens
+
+
+class _Job:
+    __slots__ = ("seq", "fn", "future", "attempts", "not_before")
+
+    def __init__(self, seq, fn):
+        self.seq = seq
+        self.fn = fn
+        self.future = Future()
+        self.attempts = 0
+        self.not_before = 0.0
+
+
+class LLMScheduler:
+    """Rate-limits and retries LLM requests for the whole process."""
+
+    def __init__(self, requests_per_minute=2, burst=1, max_wait=30.0, max_retries=MAX_RETRIES,
+                 backoff=BACKOFF_SECONDS, workers=4, clock=time.monotonic):
+        # Gemini counts requests per rolling minute, so any burst above 1 can
+        # overshoot it; raise it only for quotas that allow bursts.
+        self.bucket = TokenBucket(requests_per_minute, burst, clock)
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.clock = clock
+        self.workers = workers
+        self.condition = threading.Condition()
+        self.queue = []
+        self.seq = itertools.count()
+        self.sent_at = deque()
+        self.counts = {"submitted": 0, "sent": 0, "rate_limited": 0, "failed": 0, "cancelled": 0}
+        self.executor = None
+        self.dispatcher = None
+
+    def submit(self, fn):
+        """Queues fn (one request to the LLM) and returns a Future for its result."""
+        with self.condition:
+            if self.dispatcher is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="llm")
+                self.dispatcher = threading.Thread(target=self._dispatch, name="llm-scheduler", daemon=True)
+                self.dispatcher.start()
+
+            if self.max_wait is not None:
+                wait = self._expected_wait()
+                if wait > self.max_wait:
+                    raise QuotaExceeded(wait)
+
+            self.counts["submitted"] += 1
+            job = _Job(next(self.seq), fn)
+            self.queue.append(job)
+            self.condition.notify()
+            return job.future
+
+    def call(self, fn):
+        """submit() and wait for the result."""
+        return self.submit(fn).result()
+
+    def can_send_now(self):
+        """True if a request submitted now would go out without waiting for quota."""
+        with self.condition:
+            return self._expected_wait() == 0
+
+    def metrics(self):
+        """Quota spend and queue depth, for logs and status commands."""
+        with self.condition:
+            now = self.clock()
+            while self.sent_at and now - self.sent_at[0] > 60:
+                self.sent_at.popleft()
+            return {
+                **self.counts,
+                "sent_last_minute": len(self.sent_at),
+                "tokens_available": round(self.bucket.available(), 2),
+                "queued": len(self.queue),
+            }
+
+    def close(self):
+        with self.condition:
+            dispatcher, self.dispatcher = self.dispatcher, None
+            self.condition.notify_all()
+        if dispatcher is not None:
+            dispatcher.join()
+            self.executor.shutdown(wait=True)
+
+    def _expected_wait(self):
+        """Seconds until a new request would be sent, at the current rate."""
+        deficit = max(0.0, len(self.queue) + 1 - self.bucket.available())
+        return deficit / self.bucket.rate
+
+    def _dispatch(self):
+        with self.condition:
+            while self.dispatcher is threading.current_thread():
+                cancelled = [job for job in self.queue if job.future.cancelled()]
+                for job in cancelled:
+                    self.queue.remove(job)
+                self.counts["cancelled"] += len(cancelled)
+
+                now = self.clock()
+                ready = [job for job in self.queue if job.not_before <= now]
+                if not ready:
+                    delays = [job.not_before - now for job in self.queue]
+                    self.condition.wait(min(delays) if delays else None)
+                    continue
+
+                job = min(ready, key=lambda j: j.seq)
+                wait = self.bucket.take()
+                if wait > 0:
+                    # Woken early by a retry coming back meanwhile, which goes before newer requests.
+                    self.condition.wait(wait)
+                    continue
+
+                self.queue.remove(job)
+                # A retry's Future is already running; a new one may have been cancelled while waiting.
+                if job.attempts == 0 and not job.future.set_running_or_notify_cancel():
+                    self.bucket.refund()
+                    self.counts["cancelled"] += 1
+                    continue
+                self.counts["sent"] += 1
+                self.sent_at.append(now)
+                self.executor.submit(self._run, job)
+
+    def _run(self, job):
+        try:
+            result = job.fn()
+        except Exception as e:
+            if not is_rate_limited(e):
+                with self.condition:
+                    self.counts["failed"] += 1
+                job.future.set_exception(e)
+                return
+
+            with self.condition:
+                self.counts["rate_limited"] += 1
+                self.bucket.drain()
+                delay = self.backoff * 2 ** job.attempts * random.uniform(0.8, 1.2)
+                if job.attempts >= self.max_retries:
+                    self.counts["failed"] += 1
+                    job.future.set_exception(QuotaExceeded(delay))
+                    return
+                job.attempts += 1
+                job.not_before = self.clock() + delay
+                self.queue.append(job)
+                self.condition.notify()
+            return
+        job.future.set_result(result)
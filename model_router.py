@@ -0,0 +1,224 @@
+"""Picks a Gemini model per query and hedges slow answers.
+
+Every query used to go to gemini-2.5-pro, the slowest model, even "tell me
+something about Mars". ModelRouter keeps one chat per tier, fastest first,
+and for each query:
+
+- choose(): queries that ask for reasoning or writing ("explain", "compare",
+  "write", ...) or are longer than long_words go to the slowest tier; short
+  ones (up to short_words) go to the fastest; the rest to a tier in
+  between. A simple query moves to a faster tier while its tier's recent
+  median latency is over the budget.
+- send(): if the chosen tier has not answered within budget seconds, the
+  same query is also sent to the fastest tier (a hedged request) and
+  whichever answers first is used. If the chosen tier fails, the fastest
+  tier is tried once as a fallback, unless the request was cancelled.
+  No hedge is sent while can_hedge() says there is no quota for it.
+
+Each tier has its own chat history, so a follow-up routed to another tier
+does not see the earlier turns of that conversation. Once one tier has
+answered, the other request is cancelled; if it was already sent, its
+turn is taken out of that tier's history when it returns.
+
+stats() reports per-tier latency and how often each tier's answer was the
+one used. benchmarks/model_router_bench.py drives it with scripted models.
+"""
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, wait
+
+SHORT_WORDS = 8
+LONG_WORDS = 25
+BUDGET_SECONDS = 4.0
+COMPLEX_MARKERS = ("explain", "why", "compare", "difference between", "analyse", "analyze", "write",
+                   "code", "program", "plan", "step by step", "essay", "summarize", "summarise",
+                   "prove", "pros and cons", "in detail")
+# Latencies kept per tier for the medians and percentiles.
+WINDOW = 50
+
+
+def _send_message(chat, content, cancel=None, **options):
+    if cancel is not None and cancel.is_set():
+        raise CancelledError()
+    return chat.send_message(content, **options)
+
+
+def _forget(chat, length):
+    """Cuts chat's history back to its first length messages."""
+    if hasattr(chat, "history"):
+        chat.history = chat.history[:length]
+
+
+class _Attempt:
+    """One send of a query to one tier."""
+
+    def __init__(self, name):
+        self.name = name
+        self.cancel = threading.Event()
+        self.future = None
+        # Set once the answer is in the chat history and may still be used.
+        self.kept = False
+        self.history_at = 0
+
+
+class ModelRouter:
+    """Routes queries over tiers, a list of (name, chat) pairs ordered fastest first.
+
+    The send argument, send(chat, content, cancel=event, **options),
+    delivers one message and should give up with CancelledError if the
+    event is set before the message goes out; the assistant passes one that
+    goes through the quota scheduler. can_hedge() says whether a hedged
+    request can be sent right away. With hedge=False a slow or failing tier
+    is waited for and not replaced.
+    """
+
+    def __init__(self, tiers, send=_send_message, short_words=SHORT_WORDS, long_words=LONG_WORDS,
+                 budget=BUDGET_SECONDS, hedge=True, complex_markers=COMPLEX_MARKERS, can_hedge=None):
+        self.tiers = list(tiers)
+        self.chats = dict(self.tiers)
+        self.names = [name for name, _ in self.tiers]
+        self.send_message = send
+        self.short_words = short_words
+        self.long_words = long_words
+        self.budget = budget
+        self.hedge = hedge
+        self.can_hedge = can_hedge or (lambda: True)
+        self.complex = re.compile(r"\b(" + "|".join(re.escape(m) for m in complex_markers) + r")")
+        self.lock = threading.Lock()
+        self.latencies = {name: deque(maxlen=WINDOW) for name in self.names}
+        self.counts = {name: {"requests": 0, "answers": 0, "hedged": 0, "unhedged": 0, "errors": 0}
+                       for name in self.names}
+        # A chat takes one message at a time: a request that lost may still be finishing.
+        self.chat_locks = {name: threading.Lock() for name in self.names}
+        self.executor = None
+
+    def choose(self, query):
+        """The tier for query, by the heuristics and the latency budget."""
+        words = len(query.split())
+        complex_query = bool(self.complex.search(query.lower())) or words > self.long_words
+        if complex_query:
+            return self.names[-1]
+        index = 0 if words <= self.short_words else len(self.names) // 2
+        while index > 0 and self._median(self.names[index]) > self.budget:
+            index -= 1
+        return self.names[index]
+
+    def send(self, query, **options):
+        """Sends query to its tier, hedging to the fastest one. Returns (tier, chat, response).
+
+        options, such as the tools to offer, are passed on to every send.
+        """
+        tier = self.choose(query)
+        attempts = [self._start(tier, query, options)]
+        pending = {attempts[0].future: attempts[0]}
+
+        done, _ = wait(pending, timeout=self.budget)
+        fastest = self.names[0]
+        if not done and self.hedge and tier != fastest:
+            if self.can_hedge():
+                print(f"{tier} is over its {self.budget:g} s budget, hedging with {fastest}")
+                with self.lock:
+                    self.counts[tier]["hedged"] += 1
+                attempts.append(self._start(fastest, query, options))
+                pending[attempts[-1].future] = attempts[-1]
+            else:
+                with self.lock:
+                    self.counts[tier]["unhedged"] += 1
+
+        error = None
+        winner = None
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    attempt = pending.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                        continue
+                    winner = attempt
+                    with self.lock:
+                        self.counts[attempt.name]["answers"] += 1
+                    return attempt.name, self.chats[attempt.name], future.result()
+                tried = {attempt.name for attempt in attempts}
+                if not pending and self.hedge and fastest not in tried and not isinstance(error, CancelledError):
+                    print(f"{tier} failed ({error}), falling back to {fastest}")
+                    attempts.append(self._start(fastest, query, options))
+                    pending[attempts[-1].future] = attempts[-1]
+            raise error
+        finally:
+            for attempt in attempts:
+                if attempt is not winner:
+                    self._discard(attempt)
+
+    def stats(self):
+        """Per tier: requests, answers used, win rate, times hedged, hedges skipped for quota, errors,
+        p50/p95 latency in ms."""
+        with self.lock:
+            report = {}
+            for name in self.names:
+                counts = self.counts[name]
+                latencies = sorted(self.latencies[name])
+                report[name] = {
+                    **counts,
+                    "win_rate": round(counts["answers"] / counts["requests"], 2) if counts["requests"] else None,
+                    "p50_ms": _percentile_ms(latencies, 0.5),
+                    "p95_ms": _percentile_ms(latencies, 0.95),
+                }
+            return report
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+    def _start(self, name, content, options):
+        attempt = _Attempt(name)
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=4 * len(self.names), thread_name_prefix="router")
+            self.counts[name]["requests"] += 1
+        attempt.future = self.executor.submit(self._timed, attempt, content, options)
+        return attempt
+
+    def _timed(self, attempt, content, options):
+        name, chat = attempt.name, self.chats[attempt.name]
+        with self.chat_locks[name]:
+            started = time.perf_counter()
+            history_at = len(getattr(chat, "history", ()))
+            try:
+                response = self.send_message(chat, content, cancel=attempt.cancel, **options)
+            except Exception:
+                if not attempt.cancel.is_set():
+                    with self.lock:
+                        self.counts[name]["errors"] += 1
+                raise
+            with self.lock:
+                self.latencies[name].append(time.perf_counter() - started)
+                if not attempt.cancel.is_set():
+                    attempt.kept, attempt.history_at = True, history_at
+                    return response
+            # Another tier's answer was used while this one was on its way.
+            _forget(chat, history_at)
+        raise CancelledError()
+
+    def _discard(self, attempt):
+        """Cancels an attempt whose answer is not used and takes its turn out of the chat history."""
+        with self.lock:
+            attempt.cancel.set()
+            kept, attempt.kept = attempt.kept, False
+        attempt.future.cancel()
+        if kept:
+            with self.chat_locks[attempt.name]:
+                _forget(self.chats[attempt.name], attempt.history_at)
+
+    def _median(self, name):
+        with self.lock:
+            latencies = sorted(self.latencies[name])
+        return latencies[len(latencies) // 2] if latencies else 0.0
+
+
+def _percentile_ms(latencies, q):
+    if not latencies:
+        return None
+    return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1)
@@ -0,0 +1,265 @@
+"""Overlapped listen -> recognize -> think -> speak loop.
+
+Assistant.run_sequential() does one thing at a time: while Friday waits for
+speech recognition, Gemini or the text-to-speech engine, nobody is
+listening, and the microphone sits idle. Pipeline gives each stage its own
+thread, joined by small bounded queues:
+
+    capture -> recognize -> think -> speak
+
+so the next command is captured and recognized while the previous one is
+still being answered. Every stage has a single worker and the queues are
+FIFO, so commands are answered in the order they were spoken, and a
+command that depends on the one before it ("remember ..." then "what did
+I ask you to remember") sees its effects.
+
+Shutdown:
+
+- "sleep" (handle_sleep clears Assistant.running) drops everything heard
+  after it, speaks its goodbye and ends the run,
+- stop(drain=True) stops listening and answers what was already heard,
+- stop(drain=False), for closing the window, also drops pending commands
+  and replies; only the step in progress finishes.
+
+Since the microphone stays open while Friday talks, an utterance that is
+just the reply being picked up again (an echo) is dropped: the whole reply
+or at least ECHO_MIN_WORDS words of it in a row. Replies that ask the
+user to say something (Assistant.expects_reply) are not echo candidates,
+so "Say Friday cancel to stop" does not swallow "friday cancel".
+
+Barge-in: when the user starts talking while Friday speaks (listen() calls
+back once BARGE_IN_SECONDS of speech are heard, see EchoGuardRecognizer
+for how her own voice is kept out), the pipeline moves to a new
+generation. Speech stops, the Gemini call in progress is abandoned
+(Assistant.interrupt), and every command and reply from an older
+generation is dropped, so the next thing Friday does is answer what was
+just said. interrupt_latencies holds, per barge-in, the seconds from
+detecting the speech to Friday falling silent.
+"""
+import queue
+import re
+from concurrent.futures import CancelledError
+import threading
+import time
+
+import assistant
+
+# Commands waiting between two stages; capture blocks when recognition falls this far behind.
+QUEUE_SIZE = 2
+# Replies that were playing less than this long ago count as a possible echo.
+ECHO_SECONDS = 5.0
+# Fewer words than this are only an echo if they are the whole reply.
+ECHO_MIN_WORDS = 4
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+_STOP = object()
+
+
+class Pipeline:
+    """Runs an Assistant's commands through overlapping stage threads."""
+
+    def __init__(self, bot, queue_size=QUEUE_SIZE):
+        self.bot = bot
+        self.heard = queue.Queue(queue_size)
+        self.queries = queue.Queue(queue_size)
+        self.replies = queue.Queue(queue_size)
+        self.listening = threading.Event()
+        self.listening.set()
+        self.dropping = threading.Event()
+        self.silenced = threading.Event()
+        self.lock = threading.Lock()
+        self.busy = set()
+        self.state = None
+        self.recent_replies = []
+        self.generation = 0
+        self.barge_in_at = None
+        self.interrupt_latencies = []
+        self.stats = {"heard": 0, "recognized": 0, "answered": 0, "dropped": 0, "echoes": 0, "barge_ins": 0}
+
+    def run(self):
+        """Runs until sleep or stop(); returns once the last reply has been spoken.
+
+        The speak stage runs on the calling thread. When commands are being
+        dropped, the other stages are not waited for: capture may be blocked
+        in listen() and think in a Gemini call, and both threads end on their
+        own once that returns.
+        """
+        for name, target in (("capture", self._capture), ("recognize", self._recognize), ("think", self._think)):
+            threading.Thread(target=target, name=f"pipeline-{name}", daemon=True).start()
+        self._speak()
+
+    def stop(self, drain=True):
+        self.listening.clear()
+        if not drain:
+            self.silenced.set()
+            self.dropping.set()
+
+    def _forward(self, q, item):
+        """Puts item on the next stage's queue; gives up once commands are being dropped."""
+        while not self.dropping.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _capture(self):
+        while self.bot.running and self.listening.is_set() and not self.dropping.is_set():
+            self._set_busy("capture", True)
+            started = time.perf_counter()
+            try:
+                audio = self.bot.listen(self._on_speech if assistant.BARGE_IN else None)
+            except Exception as e:
+                print(f"Error while listening: {e}")
+                time.sleep(0.5)
+                continue
+            finally:
+                self._set_busy("capture", False)
+            # An utterance still being captured when stop() was called is not answered.
+            if audio is not None and self.listening.is_set():
+                self._count("heard")
+                listen_ms = round((time.perf_counter() - started) * 1000, 2)
+                self._forward(self.heard, (self.generation, time.monotonic(), audio, listen_ms))
+        self._forward(self.heard, _STOP)
+
+    def _recognize(self):
+        while True:
+            item = self.heard.get()
+            if item is _STOP or self.dropping.is_set():
+                self._forward(self.queries, _STOP)
+                return
+            generation, heard_at, audio, listen_ms = item
+            if self._stale(generation):
+                continue
+            started = time.perf_counter()
+            query = self.bot.recognize(audio).lower()
+            if query == "none":
+                continue
+            if self._is_echo(query, heard_at):
+                print(f"Ignored echo of my own reply: {query}")
+                self._count("echoes")
+                continue
+            self._count("recognized")
+            timings = {"listen_ms": listen_ms, "recognize_ms": round((time.perf_counter() - started) * 1000, 2)}
+            self._forward(self.queries, (generation, query, audio, timings))
+
+    def _think(self):
+        while True:
+            item = self.queries.get()
+            if item is _STOP or self.dropping.is_set():
+                self._forward(self.replies, _STOP)
+                return
+            generation, query, audio, timings = item
+            if self._stale(generation):
+                continue
+            self.bot.notify("transcript", query)
+            self._set_busy("think", True)
+            self.bot.interrupted.clear()
+            try:
+                result = self.bot.dispatch(query, audio, timings)
+            except CancelledError:
+                result = None
+            except Exception as e:
+                print(f"An error occurred in the main loop: {e}")
+                result = {"route": "error", "response": "Sorry, something went wrong. Please try again."}
+            finally:
+                self._set_busy("think", False)
+
+            if result is None or self._stale(generation):
+                print(f"Interrupted while answering: {query}")
+            elif result["route"] == "ignored":
+                print(f"Ignored query (no trigger): {query}")
+            else:
+                prompt = getattr(self.bot, "expects_reply", False)
+                self._forward(self.replies, (generation, result["response"], prompt))
+            if not self.bot.running:
+                # Asleep: the goodbye is queued, anything heard after it is not answered.
+                self._forward(self.replies, _STOP)
+                self._count("dropped", self.heard.qsize() + self.queries.qsize())
+                self.listening.clear()
+                self.dropping.set()
+                return
+
+    def _speak(self):
+        while True:
+            try:
+                item = self.replies.get(timeout=0.1)
+            except queue.Empty:
+                if self.dropping.is_set():
+                    return
+                continue
+            if item is _STOP:
+                return
+            generation, response, prompt = item
+            if self._stale(generation):
+                continue
+            self.bot.notify("response", response)
+            entry = [_WORD.findall(str(response).lower()), None]
+            if not prompt:
+                with self.lock:
+                    self.recent_replies.append(entry)
+            self._set_busy("speak", True)
+            try:
+                assistant.speak(response)
+            finally:
+                entry[1] = time.monotonic()
+                self._set_busy("speak", False)
+            if generation < self.generation:
+                self.interrupt_latencies.append(time.perf_counter() - self.barge_in_at)
+            else:
+                self._count("answered")
+
+    def _on_speech(self):
+        """Called from capture when speech starts; talking over Friday is a barge-in."""
+        if not assistant.is_speaking() or not self.listening.is_set():
+            return
+        print("Barge-in: stopping the current reply")
+        self.barge_in_at = time.perf_counter()
+        self.generation += 1
+        self._count("barge_ins")
+        self.bot.interrupt()
+
+    def _count(self, name, n=1):
+        """Adds n to stats[name]; every stage thread counts into the same dict."""
+        with self.lock:
+            self.stats[name] += n
+
+    def _stale(self, generation):
+        """True (and counted as dropped) for commands and replies from before the last barge-in, or after stop()."""
+        if generation < self.generation or self.silenced.is_set():
+            self._count("dropped")
+            return True
+        return False
+
+    def _is_echo(self, query, heard_at):
+        """True if query repeats a reply still playing, or finished less than ECHO_SECONDS before heard_at.
+
+        It must be the whole reply or at least ECHO_MIN_WORDS consecutive words of it.
+        """
+        words = _WORD.findall(query)
+        with self.lock:
+            self.recent_replies = [r for r in self.recent_replies if r[1] is None or heard_at - r[1] < ECHO_SECONDS]
+            return bool(words) and any(words == reply or (len(words) >= ECHO_MIN_WORDS and _contains(reply, words))
+                                       for reply, _ in self.recent_replies)
+
+    def _set_busy(self, stage, busy):
+        """Reports the most visible busy stage as the assistant state: speaking, thinking, listening."""
+        with self.lock:
+            (self.busy.add if busy else self.busy.discard)(stage)
+            if "speak" in self.busy:
+                state = assistant.SPEAKING
+            elif "think" in self.busy:
+                state = assistant.THINKING
+            else:
+                state = assistant.LISTENING
+            if state == self.state:
+                return
+            self.state = state
+        self.bot.notify("state", state)
+
+
+def _contains(words, part):
+    """True if part occurs in words as a run of consecutive words."""
+    n = len(part)
+    return any(words[i:i + n] == part for i in range(len(words) - n + 1))
@@ -0,0 +1,132 @@
+"""Checks, in the background, that the verified user is still in front of the camera."""
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from face_tracker import FaceTracker
+
+FPS = 2.0
+RECHECK_SECONDS = 30.0
+ABSENT_SECONDS = 15.0
+CPU_BUDGET = 0.02           # fraction of one core
+MOTION_SIZE = (80, 60)
+MOTION_DELTA = 25
+MOTION_PIXELS = 0.01
+
+
+class PresenceMonitor:
+    """Samples camera frames on a background thread and keeps `present` current.
+
+    open_camera() returns the camera to read (anything with the
+    cv2.VideoCapture read/release methods); it is called on the monitor
+    thread and released when the monitor stops. match(crops) is the
+    matcher from assistant.load_face_matcher.
+    """
+
+    def __init__(self, open_camera, match, cascade, fps=FPS, recheck=RECHECK_SECONDS, absent_after=ABSENT_SECONDS,
+                 cpu_budget=CPU_BUDGET, on_change=None, tracker_options=None):
+        self.open_camera = open_camera
+        self.match = match
+        self.cascade = cascade
+        self.fps = fps
+        self.recheck = recheck
+        self.absent_after = absent_after
+        self.cpu_budget = cpu_budget
+        self.on_change = on_change
+        self.tracker_options = tracker_options or {}
+        self.tracker = None
+        # Started right after the user was verified.
+        self.present = True
+        self.seen = True
+        self.last_seen = time.monotonic()
+        self.checked_at = self.last_seen
+        self.previous = None
+        # The last frame read: while the monitor holds the camera, nobody else can open it.
+        self.frame = None
+        self.stats = {"samples": 0, "moved": 0, "checks": 0, "read_errors": 0, "cpu_seconds": 0.0}
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="presence", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def latest_frame(self):
+        """The last frame read while the monitor holds the camera, else None."""
+        return self.frame if self.thread is not None and self.thread.is_alive() else None
+
+    def sample(self, frame, now=None):
+        """Takes one camera frame into account; returns whether the face check ran."""
+        now = time.monotonic() if now is None else now
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        small = cv2.resize(gray, MOTION_SIZE, interpolation=cv2.INTER_AREA)
+        moved = (self.previous is None
+                 or np.count_nonzero(cv2.absdiff(small, self.previous) > MOTION_DELTA) > MOTION_PIXELS * small.size)
+        self.previous = small
+        self.stats["samples"] += 1
+        self.stats["moved"] += moved
+
+        checked = moved or now - self.checked_at >= self.recheck
+        if checked:
+            self.checked_at = now
+            self.seen = self._verified_face(gray)
+        if self.seen:
+            # Nothing moved since the user was last verified: still there.
+            self.last_seen = now
+        self._update(now)
+        return checked
+
+    def _verified_face(self, gray):
+        if self.tracker is None:
+            height, width = gray.shape[:2]
+            self.tracker = FaceTracker(self.cascade, (int(0.1 * width), int(0.1 * height)), **self.tracker_options)
+        self.stats["checks"] += 1
+        crops = [gray[y:y + h, x:x + w] for (x, y, w, h) in self.tracker.detect(gray)]
+        if not crops:
+            return False
+        try:
+            return any(verified for verified, _, _ in self.match(crops))
+        except cv2.error as e:
+            print(f"Face prediction error: {e}")
+            return False
+
+    def _update(self, now):
+        present = now - self.last_seen < self.absent_after
+        if present != self.present:
+            self.present = present
+            if self.on_change is not None:
+                self.on_change(present)
+
+    def _run(self):
+        try:
+            camera = self.open_camera()
+        except Exception as e:
+            print(f"Presence monitor could not open the camera: {e}")
+            return
+        try:
+            while not self.stopping.is_set():
+                started, cpu = time.monotonic(), time.thread_time()
+                ok, frame = camera.read()
+                if ok:
+                    self.frame = frame
+                    self.sample(frame)
+                else:
+                    # A camera that stops delivering frames cannot vouch for the user.
+                    self.stats["read_errors"] += 1
+                    self.seen = False
+                    self._update(time.monotonic())
+                work = time.thread_time() - cpu
+                self.stats["cpu_seconds"] += work
+                period = 1.0 / self.fps
+                if self.cpu_budget:
+                    period = max(period, work / self.cpu_budget)
+                self.stopping.wait(max(0.0, started + period - time.monotonic()))
+        finally:
+            camera.release()
@@ -0,0 +1,200 @@
+"""Watches how Friday's process grows over a long session.
+
+Friday is meant to run all day, and a few things can pile up in that time:
+the Gemini chat history, camera handles and OpenCV windows, per-call
+objects such as unit registries. ResourceMonitor samples the process on
+its own thread every `interval` seconds and keeps the last `window`
+samples:
+
+    {"at": 1760870400.0, "rss": 183500800, "traced": 41200311,
+     "fds": 31, "threads": 9, "chat_messages": 48}
+
+- rss: resident memory of the process (psutil),
+- traced: bytes allocated by Python and still alive, while tracemalloc
+  traces allocations,
+- fds: open file descriptors, or handles on Windows,
+- threads: live Python threads,
+- anything registered with watch(name, fn), e.g. the chat history length.
+
+trend(name) fits a least-squares line through the window. A metric is
+flagged as growing once that line rises by more than its entry in
+`limits` over the window, and a warning is printed the first time.
+Watched values without a limit are reported, not flagged.
+
+Tracing allocations slows every one of them down (about 10% on a Gemini
+tool command in benchmarks/run_pipeline.py), so unless `trace` is set
+tracemalloc only starts the first time memory is flagged. From then on,
+report() and the warnings list the allocation sites that grew most since
+tracing started; snapshots are only taken for those, never on the timer.
+
+status() is the spoken summary behind "friday system status";
+benchmarks/soak_test.py uses the same trends to fail a long scripted
+session that keeps growing.
+"""
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import psutil
+
+INTERVAL = 60.0
+WINDOW = 60
+# Samples needed before a trend means anything.
+MIN_SAMPLES = 5
+TRACE_FRAMES = 1
+MB = 1024 * 1024
+# Growth over the window above which a metric is flagged.
+LIMITS = {"rss": 50 * MB, "traced": 20 * MB, "fds": 20, "threads": 10}
+LABELS = {"rss": "memory", "traced": "Python memory", "fds": "open files", "threads": "threads"}
+
+
+class ResourceMonitor:
+    """Samples the process every `interval` seconds and flags metrics that keep growing."""
+
+    def __init__(self, interval=INTERVAL, window=WINDOW, limits=None, trace=False, on_alert=None):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self.limits = dict(LIMITS if limits is None else limits)
+        self.trace = trace
+        self.on_alert = on_alert
+        self.gauges = {}
+        self.flagged = set()
+        self.baseline = None
+        self.process = psutil.Process()
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def watch(self, name, fn, limit=None):
+        """Samples fn() as name too; flagged when it grows by more than limit over the window."""
+        self.gauges[name] = fn
+        if limit is not None:
+            self.limits[name] = limit
+
+    def start(self):
+        if self.trace:
+            self.start_tracing()
+        self.thread = threading.Thread(target=self._run, name="resources", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def start_tracing(self):
+        """Traces allocations from now on; top_allocators() compares against this moment."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        self.baseline = _snapshot()
+
+    def sample(self):
+        """Takes one sample, adds it to the window and returns it."""
+        current = {"at": time.time(), "rss": self.process.memory_info().rss, "threads": threading.active_count()}
+        try:
+            current["fds"] = self.process.num_fds()
+        except AttributeError:
+            current["fds"] = self.process.num_handles()
+        if tracemalloc.is_tracing():
+            current["traced"] = tracemalloc.get_traced_memory()[0]
+        for name, fn in self.gauges.items():
+            try:
+                current[name] = fn()
+            except Exception as e:
+                print(f"Resource monitor could not read {name}: {e}")
+        with self.lock:
+            self.samples.append(current)
+        return current
+
+    def trend(self, name):
+        """(growth over the window, growth per hour) of a metric's fitted line, or None with too few samples."""
+        with self.lock:
+            points = [(s["at"], s[name]) for s in self.samples if name in s]
+        if len(points) < MIN_SAMPLES:
+            return None
+        mean_t = sum(t for t, _ in points) / len(points)
+        mean_v = sum(v for _, v in points) / len(points)
+        spread = sum((t - mean_t) ** 2 for t, _ in points)
+        if not spread:
+            return None
+        slope = sum((t - mean_t) * (v - mean_v) for t, v in points) / spread
+        return slope * (points[-1][0] - points[0][0]), slope * 3600
+
+    def growing(self):
+        """{metric: (growth over the window, per hour)} for the metrics over their limit."""
+        result = {}
+        for name, limit in self.limits.items():
+            trend = self.trend(name)
+            if trend is not None and trend[0] > limit:
+                result[name] = trend
+        return result
+
+    def top_allocators(self, count=10):
+        """The count allocation sites that grew most since tracing started: [(file:line, bytes, blocks)]."""
+        if self.baseline is None or not tracemalloc.is_tracing():
+            return []
+        stats = _snapshot().compare_to(self.baseline, 'lineno')
+        stats = [stat for stat in stats if stat.size_diff > 0][:count]
+        return [(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff, stat.count_diff)
+                for stat in stats]
+
+    def report(self, count=10):
+        """A multi-line description of the latest sample, the trends and the top allocators, for the console."""
+        with self.lock:
+            latest = dict(self.samples[-1]) if self.samples else {}
+        lines = []
+        for name, value in latest.items():
+            if name == "at":
+                continue
+            trend = self.trend(name)
+            change = "" if trend is None else f", {amount(name, trend[1])} an hour"
+            lines.append(f"{name}: {amount(name, value)}{change}")
+        for where, size, blocks in self.top_allocators(count):
+            lines.append(f"  +{size / MB:.2f} MB in {blocks:+} blocks at {where}")
+        return "\n".join(lines)
+
+    def status(self):
+        """What Friday says when asked for her system status."""
+        current = self.sample()
+        text = (f"I'm using {current['rss'] / MB:.0f} megabytes of memory, {current['threads']} threads "
+                f"and {current['fds']} open files.")
+        growing = self.growing()
+        for name, (_, per_hour) in growing.items():
+            label = LABELS.get(name, name.replace("_", " "))
+            text += f" {label[0].upper()}{label[1:]} keeps growing, by {amount(name, per_hour)} an hour."
+        if not growing:
+            text += " Nothing is growing out of bounds."
+        print(self.report())
+        return text
+
+    def _run(self):
+        while not self.stopping.wait(self.interval):
+            self.sample()
+            growing = self.growing()
+            new = growing.keys() - self.flagged
+            for name in new:
+                growth, per_hour = growing[name]
+                print(f"Resource monitor: {name} grew by {amount(name, growth)} over the last "
+                      f"{len(self.samples)} samples ({amount(name, per_hour)} an hour)")
+                if self.on_alert is not None:
+                    self.on_alert(name, growing[name])
+            if new and "rss" in new and self.baseline is None:
+                print("Resource monitor: tracing allocations to find where the memory goes")
+                self.start_tracing()
+            elif new:
+                print(self.report())
+            self.flagged = set(growing)
+
+
+def _snapshot():
+    """The traced allocations, leaving out the monitor's and tracemalloc's own."""
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                                      tracemalloc.Filter(False, __file__)])
+
+
+def amount(name, value):
+    """A metric's value in words: megabytes for memory, a plain number otherwise."""
+    if name in ("rss", "traced"):
+        return f"{value / MB:.1f} megabytes"
+    return f"{value:.0f}"
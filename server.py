@@ -0,0 +1,236 @@
+"""Multi-session Friday server.
+
+Serves many users or devices from one process over asyncio. Each session
+has its own Assistant, so its own Gemini chat history and its own memory
+file; the Gemini model, the HTTP connection pool and the weather/news cache
+in assistant.py are shared by all of them.
+
+The wire protocol is daemon.py's JSON lines plus a "session" field:
+
+    {"session": "kitchen", "id": 1, "text": "what's the time"}
+
+Requests without a session use one session per connection. Handlers block,
+so commands run on a thread pool of --workers threads. Three limits keep
+the server responsive under load:
+
+- each session runs one command at a time and queues at most
+  SESSION_QUEUE_LIMIT more; beyond that the request is refused with
+  "busy" straight away instead of piling up,
+- a connection is not read from while it has SESSION_QUEUE_LIMIT + 1
+  requests in flight, so a flooding client is pushed back by TCP,
+- at most MAX_SESSIONS sessions are kept; the least recently used idle
+  one is dropped to make room, and a new session is refused with "full"
+  while every one of them has a command in flight.
+
+Creating a session's Assistant takes a while, so it runs on the thread
+pool too.
+
+    python server.py                       # 127.0.0.1:8765
+    python server.py --unix /tmp/friday-server.sock
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+import assistant
+from daemon import CommandRunner, SilentSpeaker, parse_request
+
+HOST = getattr(config, 'SERVER_HOST', '127.0.0.1')
+PORT = getattr(config, 'SERVER_PORT', 8765)
+SESSION_DIR = getattr(config, 'SESSION_DIR', 'sessions')
+MAX_SESSIONS = getattr(config, 'MAX_SESSIONS', 1000)
+SESSION_QUEUE_LIMIT = getattr(config, 'SESSION_QUEUE_LIMIT', 4)
+
+
+def memory_file(session_id):
+    """The memory file name of a session: a readable prefix of the id plus a hash of all of it."""
+    readable = re.sub(r'[^A-Za-z0-9_.-]', '_', session_id)[:32]
+    digest = hashlib.sha256(session_id.encode('utf-8')).hexdigest()[:16]
+    return f"{readable}-{digest}.txt"
+
+
+def default_bot_factory(session_id):
+    """A headless Assistant whose memory lives in SESSION_DIR/memory_file(session)."""
+    os.makedirs(SESSION_DIR, exist_ok=True)
+    return assistant.Assistant(verify=False, connect_llm=False,
+                               memory_path=os.path.join(SESSION_DIR, memory_file(session_id)))
+
+
+class Session:
+    """One user's assistant plus the bookkeeping for its concurrency limit."""
+
+    def __init__(self, session_id, bot):
+        self.id = session_id
+        self.runner = CommandRunner(bot)
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+
+class SessionServer:
+    """Routes requests to per-session assistants and runs them on a shared thread pool."""
+
+    def __init__(self, bot_factory=default_bot_factory, workers=None, max_sessions=MAX_SESSIONS,
+                 queue_limit=SESSION_QUEUE_LIMIT):
+        self.bot_factory = bot_factory
+        self.executor = ThreadPoolExecutor(max_workers=workers or (os.cpu_count() or 1) * 4)
+        self.max_sessions = max_sessions
+        self.queue_limit = queue_limit
+        self.sessions = OrderedDict()
+        # Sessions whose Assistant is being created, by id: requests for them wait on the same task.
+        self.creating = {}
+        self.connection_ids = itertools.count(1)
+        self.stats = {"requests": 0, "rejected": 0, "evicted": 0, "full": 0}
+
+    async def session(self, session_id):
+        """Returns the session for session_id, creating it (and evicting an idle one) if needed.
+
+        Returns None when MAX_SESSIONS are open and all of them are busy.
+        """
+        session = self.sessions.get(session_id)
+        if session is not None:
+            self.sessions.move_to_end(session_id)
+            return session
+        creating = self.creating.get(session_id)
+        if creating is None:
+            if not self._make_room():
+                return None
+            creating = self.creating[session_id] = asyncio.ensure_future(self._create(session_id))
+        return await creating
+
+    def _make_room(self):
+        """Evicts the least recently used idle session if the limit is reached; False if none is idle."""
+        if len(self.sessions) + len(self.creating) < self.max_sessions:
+            return True
+        for old_id, old in self.sessions.items():
+            if not old.pending:
+                del self.sessions[old_id]
+                self.stats["evicted"] += 1
+                return True
+        return False
+
+    async def _create(self, session_id):
+        try:
+            loop = asyncio.get_running_loop()
+            bot = await loop.run_in_executor(self.executor, self.bot_factory, session_id)
+            session = self.sessions[session_id] = Session(session_id, bot)
+            return session
+        finally:
+            del self.creating[session_id]
+
+    async def handle(self, request, default_session):
+        """Runs one request within its session's limits and returns the reply dict."""
+        self.stats["requests"] += 1
+        session_id = str(request.get("session") or default_session)
+        session = await self.session(session_id)
+        if session is None:
+            self.stats["full"] += 1
+            return {"id": request.get("id"), "session": session_id, "error": "full"}
+
+        # One command running plus queue_limit waiting.
+        if session.pending > self.queue_limit:
+            self.stats["rejected"] += 1
+            return {"id": request.get("id"), "session": session.id, "error": "busy"}
+
+        session.pending += 1
+        try:
+            async with session.lock:
+                loop = asyncio.get_running_loop()
+                reply = await loop.run_in_executor(self.executor, session.runner.handle, request)
+        finally:
+            session.pending -= 1
+
+        # "friday sleep" ends the session; the next request starts a fresh one.
+        if not session.runner.bot.running and self.sessions.get(session.id) is session:
+            del self.sessions[session.id]
+
+        reply["session"] = session.id
+        return reply
+
+    async def serve_client(self, reader, writer):
+        default_session = f"connection-{next(self.connection_ids)}"
+        pending = set()
+        write_lock = asyncio.Lock()
+        # Stop reading from a connection that already has this many requests
+        # in flight, so a flood from one client backs up into its own socket.
+        inflight = asyncio.Semaphore(self.queue_limit + 1)
+
+        async def answer(request):
+            try:
+                try:
+                    reply = await self.handle(request, default_session)
+                except Exception as e:
+                    # The client is waiting for this id: an error is still a reply.
+                    print(f"Error handling request {request.get('id')}: {e}", file=sys.stderr)
+                    reply = {"id": request.get("id"), "session": str(request.get("session") or default_session),
+                             "error": str(e)}
+                async with write_lock:
+                    writer.write((json.dumps(reply) + "\n").encode())
+                    # drain() pauses us while the client is slow to read.
+                    await writer.drain()
+            finally:
+                inflight.release()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = parse_request(line.decode())
+                except ValueError as e:
+                    writer.write((json.dumps({"id": None, "error": f"Bad request: {e}"}) + "\n").encode())
+                    continue
+                await inflight.acquire()
+                task = asyncio.ensure_future(answer(request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=HOST, port=PORT, unix_path=None):
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            return await asyncio.start_unix_server(self.serve_client, path=unix_path)
+        return await asyncio.start_server(self.serve_client, host, port)
+
+
+async def serve(args):
+    assistant.set_speaker(SilentSpeaker())
+    server = SessionServer(workers=args.workers)
+    async with await server.start(args.host, args.port, args.unix) as listener:
+        where = args.unix or f"{args.host}:{args.port}"
+        print(f"Friday server listening on {where}", file=sys.stderr)
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve many Friday sessions from one process.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--unix', help="listen on this Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, help="handler threads (default: 4 per core)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
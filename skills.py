@@ -0,0 +1,121 @@
+"""Friday's skills, declared once next to their handlers with @skill and @command.
+
+SkillRegistry builds the local router, the dispatch map and the Gemini tool
+declarations from them, and ranks skills by relevance to a query.
+"""
+import inspect
+import threading
+from collections import namedtuple
+
+Skill = namedtuple("Skill", "name description triggers parameters")
+
+# Relevance indexes by (class, examples): they only depend on the declarations.
+_indexes = {}
+_index_lock = threading.Lock()
+
+
+def skill(description, *triggers, **parameters):
+    """Declares a method as a tool Gemini can call, with optional local triggers.
+
+    Each keyword is a STRING parameter and its description. A trigger is a
+    prefix that runs the method without Gemini: a string passes the whole
+    query, a (prefix, kwargs) pair passes those arguments instead.
+    """
+    def decorate(method):
+        method.skill = Skill(method.__name__, description, triggers, parameters)
+        return method
+    return decorate
+
+
+def command(*triggers):
+    """Declares a method(query) as a local command only."""
+    def decorate(method):
+        method.skill = Skill(method.__name__, None, triggers, {})
+        return method
+    return decorate
+
+
+class SkillRegistry:
+    """The skills declared on owner's class, bound to owner."""
+
+    def __init__(self, owner, examples=None):
+        self.owner_class = type(owner)
+        self.skills = {}
+        for cls in reversed(type(owner).__mro__):
+            for name, value in vars(cls).items():
+                declared = getattr(value, "skill", None)
+                if isinstance(declared, Skill):
+                    self.skills[name] = (declared, getattr(owner, name))
+        # Example phrases per tool name, for relevant(); intents.CORPUS by default.
+        self.examples = examples
+
+    def local_commands(self):
+        """Trigger prefix -> callable(query), in declaration order."""
+        commands = {}
+        for declared, method in self.skills.values():
+            for trigger in declared.triggers:
+                if isinstance(trigger, tuple):
+                    trigger, kwargs = trigger
+                    commands[trigger] = lambda query, method=method, kwargs=kwargs: method(**kwargs)
+                else:
+                    commands[trigger] = method
+        return commands
+
+    def function_map(self):
+        """Tool name -> bound method, for the function calls Gemini makes."""
+        return {name: method for name, (declared, method) in self.skills.items() if declared.description}
+
+    def declarations(self, names=None):
+        """Gemini function declarations for the tools in names (default: all), in declaration order."""
+        result = []
+        for name, (declared, method) in self.skills.items():
+            if declared.description is None or (names is not None and name not in names):
+                continue
+            parameters = {}
+            if declared.parameters:
+                signature = inspect.signature(method).parameters
+                parameters = {
+                    "type": "OBJECT",
+                    "properties": {p: {"type": "STRING", "description": d} for p, d in declared.parameters.items()},
+                    "required": [p for p in declared.parameters if signature[p].default is inspect.Parameter.empty],
+                }
+            result.append({"name": name, "description": declared.description, "parameters": parameters})
+        return result
+
+    def tools(self, names=None):
+        """The tools argument for the Gemini model or a single request."""
+        return [{"function_declarations": self.declarations(names)}]
+
+    def relevant(self, query, k):
+        """The names of the k tools most relevant to query, best first."""
+        import numpy as np
+        from intents import normalize, vectorize
+
+        names, bounds, matrix = self.index()
+        similarity = matrix @ vectorize([normalize(query)])[0]
+        scores = np.maximum.reduceat(similarity, bounds)
+        return [names[i] for i in np.argsort(-scores, kind="stable")[:k]]
+
+    def index(self):
+        """(tool names, start row of each tool, one normalized row per text describing a tool).
+
+        Built on first use, once per class; call it at startup to keep that off the first query.
+        """
+        key = (self.owner_class, id(self.examples))
+        with _index_lock:
+            if key not in _indexes:
+                from intents import CORPUS, vectorize
+
+                examples = CORPUS if self.examples is None else self.examples
+                names, bounds, texts = [], [], []
+                for name, (declared, _) in self.skills.items():
+                    if declared.description is None:
+                        continue
+                    names.append(name)
+                    bounds.append(len(texts))
+                    texts.append(declared.description.lower())
+                    texts.extend(t[0] if isinstance(t, tuple) else t for t in declared.triggers)
+                    texts.extend(d.lower() for d in declared.parameters.values())
+                    texts.extend(p[0] if isinstance(p, tuple) else p for p in examples.get(name, []))
+                _indexes[key] = names, bounds, vectorize(texts)
+            return _indexes[key]
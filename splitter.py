@@ -0,0 +1,77 @@
+"""Splits one spoken command ("what's the time and my battery") into the local commands it holds."""
+import re
+from collections import namedtuple
+
+# What Assistant.plan() makes of a command it can run without Gemini: the
+# route and trigger it reports, action(), which returns the reply, how well
+# the text fits the command (score, 1 for local commands) and whether the
+# command takes the rest of the text as free text ("remember that ...").
+Plan = namedtuple("Plan", "route trigger action message score free_text")
+
+MAX_PARTS = 4
+# Intents whose last argument is free text running to the end of the
+# command; a split right after one would cut it short. translate's text is
+# closed by "to <language>", so it cannot be cut without the part failing.
+FREE_TEXT = {"handle_remember", "handle_wikihow", "handle_google", "handle_youtube", "handle_wikipedia"}
+# Pieces longer than this are not searched for word boundaries.
+MAX_WORDS = 16
+CONJUNCTION = re.compile(r"\s*(?:,|;|\band then\b|\band also\b|\bas well as\b|\band\b|\bthen\b|\balso\b)\s*")
+# Words a command can start with, where a run-on transcript may be split.
+# Not "the", "my" or "take": they start too many words of a note or a question.
+STARTERS = {
+    "what", "what's", "whats", "how", "how's", "tell", "give", "check", "is", "open", "play",
+    "turn", "set", "show", "read", "search", "translate", "convert", "volume", "remember", "any",
+}
+
+
+def split(text, resolve, max_parts=MAX_PARTS):
+    """The plans of the commands in text, in order; [] unless all of them can run locally.
+
+    A split stands only if no part but the last takes free text and its
+    weakest part scores at least as well as text as one command.
+    """
+    pieces = [piece for piece in CONJUNCTION.split(text) if piece] or [text]
+    cache = {}
+
+    def cached(piece):
+        if piece not in cache:
+            cache[piece] = resolve(piece)
+        return cache[piece]
+
+    plans = []
+    for piece in pieces:
+        found = _split_words(piece.split(), cached, max_parts - len(plans))
+        if not found:
+            return []
+        plans.extend(found)
+    if len(plans) > 1:
+        if any(plan.free_text for plan in plans[:-1]):
+            return []
+        # A whole that takes free text ("system status and the time") has only swallowed the other parts.
+        whole = cached(text)
+        if whole is not None and not whole.free_text and min(plan.score for plan in plans) < whole.score:
+            return [whole]
+    return plans
+
+
+def _split_words(words, resolve, max_parts):
+    """Plans for words as one command or, failing that, as consecutive commands split at starter words."""
+    if max_parts < 1 or not words:
+        return None
+    whole = resolve(" ".join(words))
+    if whole is not None:
+        return [whole]
+    if max_parts < 2 or len(words) > MAX_WORDS:
+        return None
+    for i in range(1, len(words)):
+        if words[i] not in STARTERS:
+            continue
+        first = resolve(" ".join(words[:i]))
+        # Cutting a free-text argument short ("remember to | take the battery") is never a split.
+        if first is None or first.free_text:
+            continue
+        rest = _split_words(words[i:], resolve, max_parts - 1)
+        # A run-on that asks for the same thing twice is more likely one command misheard.
+        if rest and rest[0].trigger != first.trigger:
+            return [first] + rest
+    return None
@@ -0,0 +1,138 @@
+"""Speaker verification from the utterance that woke Friday up: MFCC embeddings against enrolled voiceprints.
+
+Tune the threshold with benchmarks/voiceprint_bench.py on recordings from your own microphone.
+"""
+import os
+
+import numpy as np
+
+RATE = 16000
+FRAME = 400                 # 25 ms
+HOP = 160                   # 10 ms
+FFT = 512
+MELS = 40
+COEFFICIENTS = 20           # c1..c20
+PREEMPHASIS = 0.97
+LIFTER = 22
+VOICED_DB = 30.0
+WAKE_FRAMES = 70            # about the voiced part of "Friday"
+MIN_VOICED_SECONDS = 0.3
+SPREAD_FLOOR = 0.5
+DIMENSIONS = 4 * COEFFICIENTS
+
+
+def _mel(hz):
+    return 2595 * np.log10(1 + hz / 700)
+
+
+def _mel_filters():
+    """MELS triangular filters over the FFT // 2 + 1 bins, 0 Hz to the Nyquist frequency."""
+    edges = 700 * (10 ** (np.linspace(0, _mel(RATE / 2), MELS + 2) / 2595) - 1)
+    bins = np.fft.rfftfreq(FFT, 1 / RATE)
+    lower, centre, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (centre - lower)
+    falling = (upper - bins) / (upper - centre)
+    return np.maximum(0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def _dct():
+    """DCT-II rows 1..COEFFICIENTS with the usual sinusoidal liftering folded in."""
+    n = np.arange(MELS)
+    k = np.arange(1, COEFFICIENTS + 1)[:, None]
+    lifter = 1 + LIFTER / 2 * np.sin(np.pi * k / LIFTER)
+    return (lifter * np.cos(np.pi * k * (2 * n + 1) / (2 * MELS)) * np.sqrt(2 / MELS)).astype(np.float32)
+
+
+MEL_FILTERS = _mel_filters()
+DCT = _dct()
+WINDOW = np.hamming(FRAME).astype(np.float32)
+
+
+def samples_from_audio(audio):
+    """Mono float32 samples at RATE from an sr.AudioData."""
+    raw = audio.get_raw_data(convert_rate=RATE, convert_width=2)
+    return np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768
+
+
+def mfcc(samples):
+    """The coefficients of every voiced frame of float samples at RATE, one row per frame."""
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) < FRAME:
+        return np.zeros((0, COEFFICIENTS), dtype=np.float32)
+    emphasized = np.append(samples[:1], samples[1:] - PREEMPHASIS * samples[:-1])
+    frames = np.lib.stride_tricks.sliding_window_view(emphasized, FRAME)[::HOP] * WINDOW
+    power = np.abs(np.fft.rfft(frames, FFT)) ** 2
+    energy = np.log(power.sum(axis=1) + 1e-10)
+    voiced = energy >= energy.max() - VOICED_DB * np.log(10) / 10
+    return np.log(power[voiced] @ MEL_FILTERS.T + 1e-10) @ DCT.T
+
+
+def embed(samples):
+    """The DIMENSIONS-long embedding of one utterance, or None if it holds less than MIN_VOICED_SECONDS of voice."""
+    coefficients = mfcc(samples)
+    if len(coefficients) * HOP < MIN_VOICED_SECONDS * RATE:
+        return None
+    wake = coefficients[:WAKE_FRAMES]
+    return np.concatenate([wake.mean(axis=0), wake.std(axis=0), coefficients.mean(axis=0), coefficients.std(axis=0)])
+
+
+class VoiceprintStore:
+    """One voiceprint per enrolled speaker: the mean and the spread of their enrollment embeddings."""
+
+    def __init__(self, names=None, means=None, spreads=None):
+        self.names = list(names or [])
+        empty = np.zeros((0, DIMENSIONS), dtype=np.float32)
+        self.means = empty if means is None else np.asarray(means, dtype=np.float32).reshape(-1, DIMENSIONS)
+        self.spreads = empty if spreads is None else np.asarray(spreads, dtype=np.float32).reshape(-1, DIMENSIONS)
+
+    def __len__(self):
+        return len(self.names)
+
+    def enroll(self, name, embeddings):
+        """Sets name's voiceprint from two or more embed() results, replacing any earlier one."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(embeddings) < 2:
+            raise ValueError("a voiceprint needs at least two utterances")
+        mean = embeddings.mean(axis=0)
+        spread = embeddings.std(axis=0, ddof=1)
+        spread = np.maximum(spread, SPREAD_FLOOR * np.median(spread))
+        if name in self.names:
+            index = self.names.index(name)
+            self.means[index], self.spreads[index] = mean, spread
+        else:
+            self.names.append(name)
+            self.means = np.vstack([self.means, mean])
+            self.spreads = np.vstack([self.spreads, spread])
+
+    def distances(self, embedding):
+        """How far embedding is from every voiceprint, in the order of names.
+
+        The distance is in units of each speaker's spread: about 1 for their own voice.
+        """
+        return np.sqrt(np.mean(((np.asarray(embedding, dtype=np.float32) - self.means) / self.spreads) ** 2, axis=1))
+
+    def distance(self, name, embeddings):
+        """The median distance of embeddings from name's voiceprint."""
+        index = self.names.index(name)
+        return float(np.median([self.distances(embedding)[index] for embedding in embeddings]))
+
+    def verify(self, embedding, threshold):
+        """(name, distance) of the closest voiceprint; name is None when it is further than threshold."""
+        if embedding is None or not len(self):
+            return None, float("inf")
+        distances = self.distances(embedding)
+        best = int(np.argmin(distances))
+        distance = float(distances[best])
+        return (self.names[best] if distance <= threshold else None), distance
+
+    def save(self, path):
+        """Writes the store, replacing path only once the new file is complete."""
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            np.savez(f, names=np.array(self.names, dtype=str), means=self.means, spreads=self.spreads)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['names'].tolist(), data['means'], data['spreads'])